@@ -1,26 +1,56 @@
 import streamlit as st
-from datetime import date
 from src.settings import Settings
-from src.ui.components import header, journal_sidebar, data_section, journal_section
-from src.journal.storage import list_entries, list_entries_by_status, close_entry, delete_entry
-from src.journal.storage import init_db
-from src.journal.models import JournalEntry
+from src.instrumentation import profiled, span, tracing
+from src.ui.components import (
+    DATA_STATE_KEYS, DIAG_HISTORY, JOURNAL_STATE_KEYS, header, journal_sidebar, data_section, diagnostics_section,
+    journal_section, keep_widget_state,
+)
 
-init_db()  # safe; it’s guarded
+# Nothing heavy at import: each tab imports its dependencies (and the journal opens
+# its database, once per process) the first time it is selected.
+
+
+def _render(settings, diagnostics=False):
+    header()
+    journal_sidebar()
+
+    # on_change="rerun": only the selected tab runs; the others keep their widget values
+    labels = ["Data", "Journal"] + (["Diagnostics"] if diagnostics else [])
+    tabs = st.tabs(labels, key="main_tab", on_change="rerun")
+    if tabs[0].open:
+        with tabs[0], span("ui.data_section"):
+            data_section(settings=settings)
+    else:
+        keep_widget_state(DATA_STATE_KEYS)
+    if tabs[1].open:
+        with tabs[1], span("ui.journal_section"):
+            journal_section()
+    else:
+        keep_widget_state(JOURNAL_STATE_KEYS)
+    return tabs
 
 
 def main():
     st.set_page_config(page_title='AI Trader / Journal', layout='wide')
-    header()
 
     settings = Settings.from_env()
-    journal_sidebar()
+    if not st.sidebar.toggle("Diagnostics", value=settings.diagnostics, key="diagnostics",
+                             help="Trace every rerun (timings, queries, retries) in a Diagnostics tab."):
+        _render(settings)
+        return
 
-    tab1, tab2 = st.tabs(["Data", "Journal"])
-    with tab1:
-        data_section(settings=settings)
-    with tab2:
-        journal_section()
+    tab = st.session_state.get("main_tab") or "Data"
+    profile = tab != "Diagnostics" and st.session_state.pop("diag_profile_next", False)
+    with tracing(tab) as trace, profiled(profile) as prof:
+        tabs = _render(settings, diagnostics=True)
+    if profile:
+        st.session_state["diag_profile"] = prof["stats"]
+    history = st.session_state.setdefault("diag_traces", [])
+    history.append(trace.to_dict())
+    del history[:-DIAG_HISTORY]
+    if tabs[2].open:
+        with tabs[2]:
+            diagnostics_section(history)
 
 if __name__ == "__main__":
     main()
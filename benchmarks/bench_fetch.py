@@ -0,0 +1,55 @@
+# benchmarks/bench_fetch.py
+"""
+``fetch_history`` / ``fetch_many`` against a local replay of ``symbols``
+symbols (two years of daily bars), cold and warm cache. The shared rate
+limiter is lifted while timing so the numbers measure our fetch/cache path,
+not the 2 req/s throttle.
+"""
+from __future__ import annotations
+
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import Result, measure
+from src.data import fetchers, providers
+from src.data.cache import PriceCache
+from src.data.fetchers import PriceRequest, fetch_history, fetch_many
+from src.data.ratelimit import TokenBucket
+
+
+def daily_bars(n: int = 504, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    idx = pd.date_range("2023-01-03", periods=n, freq="B", tz="America/New_York", name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                         "Volume": 1e6}, index=idx)
+
+
+def run(workdir: str, symbols: int = 500, latency: float = 0.01) -> List[Result]:
+    path = os.path.join(workdir, "replay")
+    names = [f"S{i:04d}" for i in range(symbols)]
+    providers.write_replay(path, {(s, "1d"): daily_bars(seed=i) for i, s in enumerate(names)})
+
+    previous = providers.set_provider(providers.ReplayProvider(path))
+    limiter, fetchers.rate_limiter = fetchers.rate_limiter, TokenBucket(rate=1e9, capacity=10**9)
+    try:
+        req = PriceRequest(names[0], period="1y", interval="1d")
+        warm = PriceCache(":memory:", ttl=3600)
+        fetch_history(req, cache=warm)
+        results = [
+            measure("fetch.fetch_history[cold]", 1, lambda: fetch_history(req, cache=PriceCache(":memory:"))),
+            measure("fetch.fetch_history[warm]", 1, lambda: fetch_history(req, cache=warm)),
+        ]
+        many = [PriceRequest(s, period="1y", interval="1d") for s in names]
+        results.append(measure("fetch.fetch_many[cold]", symbols,
+                               lambda: fetch_many(many, cache=PriceCache(":memory:")), max_runs=3))
+        providers.set_provider(providers.ReplayProvider(path, latency=latency))
+        results.append(measure(f"fetch.fetch_many[cold, {latency * 1000:.0f}ms latency]", symbols,
+                               lambda: fetch_many(many, cache=PriceCache(":memory:")), max_runs=3))
+    finally:
+        fetchers.rate_limiter = limiter
+        providers.set_provider(previous)
+    return results
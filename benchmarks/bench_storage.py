@@ -0,0 +1,107 @@
+# benchmarks/bench_storage.py
+"""
+Journal storage at scale: a synthetic journal of ``size`` entries (half
+closed, one in ten tagged ``#bench``) is bulk-seeded into a fresh SQLite file,
+then the read and write paths the UI uses are timed against it.
+"""
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+from typing import List
+
+import numpy as np
+
+from benchmarks.harness import Result, measure
+from src.journal import storage
+from src.journal.analytics import JournalFrame
+from src.settings import Settings
+
+SYMBOLS = ["SPY", "QQQ", "IWM", "AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+STRATEGIES = ["CSP", "Covered call", "Iron condor", "Long call", "Debit spread"]
+SEED_BATCH = 10_000
+CREATE_OPS = 50
+CLOSE_OPS = 50
+
+
+def _rows(start: int, count: int, rng: np.random.Generator) -> List[dict]:
+    i = np.arange(start, start + count)
+    entry_price = np.round(rng.uniform(0.5, 10.0, count), 2)
+    exit_price = np.round(entry_price * rng.uniform(0.2, 1.8, count), 2)
+    base = date(2015, 1, 1)
+    rows = []
+    for k, n in enumerate(i.tolist()):
+        closed = n % 2 == 0
+        entry_date = base + timedelta(days=n % 3650)
+        rows.append({
+            "symbol": SYMBOLS[n % len(SYMBOLS)],
+            "strategy": STRATEGIES[n % len(STRATEGIES)],
+            "direction": "neutral",
+            "entry_action": "BTO" if n % 3 == 0 else "STO",
+            "entry_date": entry_date,
+            "entry_price": float(entry_price[k]),
+            "size": 1 + n % 5,
+            "notes": f"bench trade {n}" + (" ahead of earnings" if n % 20 == 0 else ""),
+            "tags_csv": "#bench" if n % 10 == 0 else "",
+            "status": "closed" if closed else "open",
+            "exit_date": entry_date + timedelta(days=1 + n % 30) if closed else None,
+            "exit_price": float(exit_price[k]) if closed else None,
+        })
+    return rows
+
+
+def seed(size: int, workdir: str) -> Result:
+    """Fresh database at ``workdir/journal_<size>.sqlite`` holding ``size`` entries; times the bulk load."""
+    path = os.path.join(workdir, f"journal_{size}.sqlite")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    storage.dispose_db()
+    storage.init_db(Settings(db_url=f"sqlite:///{path}"))
+    rng = np.random.default_rng(size)
+
+    def load():
+        for start in range(0, size, SEED_BATCH):
+            with storage.write_batch() as s:
+                storage.insert_entries(s, _rows(start, min(SEED_BATCH, size - start), rng))
+        storage.rebuild_trade_stats()
+
+    return measure("storage.seed", size, load, ops=size, max_runs=1)
+
+
+def run(size: int, workdir: str) -> List[Result]:
+    results = [seed(size, workdir)]
+    n = iter(range(10**9))
+
+    def create_many():
+        for _ in range(CREATE_OPS):
+            storage.create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.0,
+                                 notes=f"bench create {next(n)}", tags_csv="#bench")
+
+    results.append(measure("storage.create_entry", size, create_many, ops=CREATE_OPS))
+
+    heavy = dict(max_runs=3 if size >= 100_000 else 20)
+    results.append(measure("storage.list_entries", size, storage.list_entries, **heavy))
+    results.append(measure("storage.list_entries[tag]", size, lambda: storage.list_entries(tag="#bench"), **heavy))
+    results.append(measure("storage.list_entries_by_status", size,
+                           lambda: storage.list_entries_by_status("open"), **heavy))
+    results.append(measure("storage.query_entries[page]", size,
+                           lambda: storage.query_entries(columns=storage.SUMMARY_COLUMNS, limit=50)))
+    results.append(measure("storage.search_entries", size, lambda: storage.search_entries("earnings", limit=50)))
+
+    open_ids: List[int] = []
+
+    def pick_open():
+        open_ids[:] = [r.id for r in storage.query_entries(status="open", columns=["id"], limit=CLOSE_OPS).rows]
+
+    def close_many():
+        for entry_id in open_ids:
+            storage.close_entry(entry_id, exit_price=0.5)
+
+    results.append(measure("storage.close_entry", size, close_many, ops=CLOSE_OPS, setup=pick_open))
+    results.append(measure("stats.overall_stats", size, storage.overall_stats))
+    results.append(measure("stats.get_trade_stats[strategy]", size, lambda: storage.get_trade_stats("strategy")))
+    results.append(measure("analytics.summary[strategy]", size,
+                           lambda: JournalFrame.load().summary(by="strategy"), **heavy))
+    storage.dispose_db()
+    return results
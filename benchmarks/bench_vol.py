@@ -0,0 +1,50 @@
+# benchmarks/bench_vol.py
+"""Realized-vol paths over long intraday series (``years`` of 1-minute bars)."""
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import Result, measure
+from src.data.vol import RollingVolEstimator, ohlc_vol, realized_vol, realized_vol_panel
+
+BARS_PER_DAY = 390
+MINUTES_PER_YEAR = 252 * BARS_PER_DAY
+
+
+def minute_bars(years: int = 5, seed: int = 0) -> pd.DataFrame:
+    n = years * MINUTES_PER_YEAR
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0006, n)))
+    spread = np.abs(rng.normal(0, 0.0004, n))
+    return pd.DataFrame({
+        "Datetime": pd.date_range("2020-01-02 09:30", periods=n, freq="min", tz="America/New_York"),
+        "Open": np.concatenate([[close[0]], close[:-1]]),
+        "High": close * (1 + spread),
+        "Low": close * (1 - spread),
+        "Close": close,
+    })
+
+
+def run(years: int = 5) -> List[Result]:
+    df = minute_bars(years)
+    n = len(df)
+    close = df["Close"]
+    month = 21 * BARS_PER_DAY
+    results = [
+        measure("vol.realized_vol[w=20]", n, lambda: realized_vol(close, 20)),
+        measure("vol.realized_vol[w=1mo]", n, lambda: realized_vol(close, month)),
+        measure("vol.ohlc_vol[3 windows]", n,
+                lambda: ohlc_vol(df, windows=[30, BARS_PER_DAY, month], periods_per_year=MINUTES_PER_YEAR)),
+    ]
+    wide = pd.DataFrame({f"S{i}": close.to_numpy() * (1 + i / 100) for i in range(20)}, index=df["Datetime"])
+    results.append(measure("vol.realized_vol_panel[20 symbols]", n,
+                           lambda: realized_vol_panel(wide, windows=[30, BARS_PER_DAY, month])))
+
+    def stream():
+        RollingVolEstimator(window=BARS_PER_DAY, periods_per_year=MINUTES_PER_YEAR).feed(df)
+
+    results.append(measure("vol.RollingVolEstimator.feed", n, stream, ops=n, max_runs=3))
+    return results
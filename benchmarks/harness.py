@@ -0,0 +1,129 @@
+# benchmarks/harness.py
+"""
+Timing, JSON results and baseline comparison shared by the benchmark modules.
+
+Each benchmark reports seconds per operation (median over its runs). Results
+are keyed ``name@size``; ``compare`` flags any key whose median grew by more
+than ``tolerance`` over the baseline.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# a benchmark repeats until it has run this long (or max_runs), at least once
+MIN_TIME = 0.5
+MAX_RUNS = 20
+TOLERANCE = 0.25
+
+
+@dataclass
+class Result:
+    name: str
+    size: int            # journal rows / bars / symbols the benchmark ran against
+    runs: int
+    ops: int             # operations per run; times below are per operation
+    median: float
+    best: float
+    mean: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+
+def measure(
+    name: str,
+    size: int,
+    fn: Callable[[], object],
+    ops: int = 1,
+    setup: Optional[Callable[[], object]] = None,
+    min_time: float = MIN_TIME,
+    max_runs: int = MAX_RUNS,
+) -> Result:
+    """Time ``fn`` (``ops`` operations per call); ``setup`` runs untimed before each call."""
+    times: List[float] = []
+    while not times or (sum(times) < min_time and len(times) < max_runs):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    per_op = [t / ops for t in times]
+    result = Result(name, size, len(times), ops, statistics.median(per_op), min(per_op), statistics.fmean(per_op))
+    print(f"  {result.key:<48} {_fmt(result.median):>10} /op  ({result.runs} runs x {ops})", file=sys.stderr)
+    return result
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def write_results(path: str, results: List[Result], **meta) -> dict:
+    doc = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+    return doc
+
+
+def load_results(path: str) -> Dict[str, Result]:
+    with open(path) as f:
+        doc = json.load(f)
+    return {r.key: r for r in (Result(**row) for row in doc["results"])}
+
+
+@dataclass
+class Comparison:
+    key: str
+    baseline: Optional[float]
+    current: float
+    ratio: Optional[float]
+    status: str          # "regression" | "faster" | "ok" | "new"
+
+
+def compare(current: List[Result], baseline: Dict[str, Result], tolerance: float = TOLERANCE) -> List[Comparison]:
+    out = []
+    for r in current:
+        base = baseline.get(r.key)
+        if base is None or base.median <= 0:
+            out.append(Comparison(r.key, None, r.median, None, "new"))
+            continue
+        ratio = r.median / base.median
+        status = "regression" if ratio > 1 + tolerance else "faster" if ratio < 1 / (1 + tolerance) else "ok"
+        out.append(Comparison(r.key, base.median, r.median, round(ratio, 3), status))
+    return out
+
+
+def print_comparison(rows: List[Comparison]) -> None:
+    print(f"{'benchmark':<48} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for c in rows:
+        base = _fmt(c.baseline) if c.baseline is not None else "-"
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        print(f"{c.key:<48} {base:>10} {_fmt(c.current):>10} {ratio:>7}  {c.status}")
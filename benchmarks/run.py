@@ -0,0 +1,84 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the storage, volatility and fetch hot paths.
+
+    python -m benchmarks.run                                # 1k / 100k / 1M journals, all suites
+    python -m benchmarks.run --sizes 1000 --suites storage  # quick storage pass
+    python -m benchmarks.run --output bench.json --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline                # record benchmarks/baseline.json
+
+Results are written as JSON (seconds per operation, median of runs). With a
+baseline, every benchmark is compared against it and the exit status is 1 if
+any got slower than ``--tolerance`` allows. Every size is seeded into a
+fresh SQLite file under ``--workdir`` (default: the system temp directory).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import List, Optional
+
+from benchmarks import bench_fetch, bench_storage, bench_vol
+from benchmarks.harness import TOLERANCE, Result, compare, load_results, print_comparison, write_results
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+SUITES = ("storage", "vol", "fetch")
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def run_suites(sizes: List[int], suites=SUITES, workdir: Optional[str] = None, vol_years: int = 5,
+               fetch_symbols: int = 500) -> List[Result]:
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        if "storage" in suites:
+            for size in sizes:
+                print(f"storage, {size:,} entries", file=sys.stderr)
+                results += bench_storage.run(size, tmp)
+        if "vol" in suites:
+            print(f"vol, {vol_years}y of 1-minute bars", file=sys.stderr)
+            results += bench_vol.run(vol_years)
+        if "fetch" in suites:
+            print(f"fetch, {fetch_symbols} replayed symbols", file=sys.stderr)
+            results += bench_fetch.run(tmp, symbols=fetch_symbols)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="journal sizes to seed")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write this run's JSON")
+    parser.add_argument("--baseline", default=None, help=f"compare against this JSON (default: {BASELINE} if present)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown before a benchmark counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    parser.add_argument("--vol-years", type=int, default=5)
+    parser.add_argument("--fetch-symbols", type=int, default=500)
+    parser.add_argument("--workdir", default=None, help="directory for the temporary databases")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.sizes, args.suites, args.workdir, args.vol_years, args.fetch_symbols)
+    meta = dict(sizes=args.sizes, suites=args.suites)
+    write_results(args.output, results, **meta)
+    print(f"wrote {args.output}", file=sys.stderr)
+    if args.save_baseline:
+        write_results(BASELINE, results, **meta)
+        print(f"wrote {BASELINE}", file=sys.stderr)
+        return 0
+
+    baseline_path = args.baseline or (BASELINE if os.path.exists(BASELINE) else None)
+    if baseline_path is None:
+        return 0
+    rows = compare(results, load_results(baseline_path), args.tolerance)
+    print_comparison(rows)
+    regressions = [c.key for c in rows if c.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: " + ", ".join(regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# src/data/cache.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.settings import Settings
+
+# yfinance column -> cache column
+_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+    "Dividends": "dividends",
+    "Stock Splits": "splits",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,            -- UTC epoch nanoseconds
+    open REAL, high REAL, low REAL, close REAL,
+    volume REAL, dividends REAL, splits REAL,
+    PRIMARY KEY (symbol, interval, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series_meta (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    covered_from INTEGER NOT NULL,  -- earliest start (epoch ns) a full fetch covered
+    fetched_at REAL NOT NULL,       -- wall clock of the last download
+    tz TEXT NOT NULL,
+    index_name TEXT NOT NULL,
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+
+@dataclass
+class SeriesMeta:
+    covered_from: int
+    fetched_at: float
+    tz: str
+    index_name: str
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """
+    Calendar start (UTC) that a yfinance ``period`` string reaches back to.
+    ``None`` means unbounded ("max"). Day periods count trading sessions, so the
+    calendar window is padded to cover weekends/holidays.
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    p = period.strip().lower()
+    if p == "max":
+        return None
+    if p == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    unit = "mo" if p.endswith("mo") else p[-1:]
+    num = int(p[: -len(unit)])
+    if unit == "d":
+        return (now - pd.Timedelta(days=num * 7 // 5 + 4)).normalize()
+    if unit == "mo":
+        return (now - pd.DateOffset(months=num)).normalize()
+    if unit == "y":
+        return (now - pd.DateOffset(years=num)).normalize()
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def trim_to_period(df: pd.DataFrame, period: str, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Slice a cached frame (DatetimeIndex) down to what ``period`` would have returned."""
+    p = period.strip().lower()
+    if p.endswith("d") and p[:-1].isdigit():
+        sessions = df.index.normalize().unique()
+        if len(sessions) > int(p[:-1]):
+            return df[df.index.normalize() >= sessions[-int(p[:-1])]]
+        return df
+    start = period_start(period, now)
+    if start is None:
+        return df
+    return df[df.index >= start]
+
+
+class PriceCache:
+    """
+    Local OHLCV store keyed by (symbol, interval).
+
+    Bars live in a SQLite file so they survive restarts; the ``max_frames`` most
+    recently used series are also kept in memory so repeat lookups never touch
+    disk. Older ones are evicted and reloaded from SQLite on demand.
+    """
+
+    def __init__(self, path: str = ":memory:", ttl: int = 60, max_frames: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_frames = max_frames
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._frames: OrderedDict[Tuple[str, str], pd.DataFrame] = OrderedDict()
+        self._meta: Dict[Tuple[str, str], SeriesMeta] = {}
+
+    # ---------------------------------------------------------------- reads
+    def meta(self, symbol: str, interval: str) -> Optional[SeriesMeta]:
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._meta:
+                row = self._conn.execute(
+                    "SELECT covered_from, fetched_at, tz, index_name FROM series_meta "
+                    "WHERE symbol = ? AND interval = ?",
+                    key,
+                ).fetchone()
+                if row is None:
+                    return None
+                self._meta[key] = SeriesMeta(*row)
+            return self._meta[key]
+
+    def frame(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Full cached series with a tz-aware DatetimeIndex, or None."""
+        key = (symbol, interval)
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key]
+            meta = self.meta(symbol, interval)
+            if meta is None:
+                return None
+            cols = ", ".join(_COLUMNS.values())
+            rows = self._conn.execute(
+                f"SELECT ts, {cols} FROM bars WHERE symbol = ? AND interval = ? ORDER BY ts",
+                key,
+            ).fetchall()
+            if not rows:
+                return None
+            arr = np.asarray(rows, dtype="float64")
+            index = pd.to_datetime(arr[:, 0].astype("int64"), utc=True).tz_convert(meta.tz)
+            index.name = meta.index_name
+            df = pd.DataFrame(arr[:, 1:], index=index, columns=list(_COLUMNS))
+            self._remember(key, df)
+            return df
+
+    def _remember(self, key: Tuple[str, str], df: pd.DataFrame) -> None:
+        self._frames[key] = df
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+
+    def is_fresh(self, symbol: str, interval: str, now: Optional[float] = None) -> bool:
+        meta = self.meta(symbol, interval)
+        now = time.time() if now is None else now
+        return meta is not None and (now - meta.fetched_at) < self.ttl
+
+    def covers(self, symbol: str, interval: str, start: Optional[pd.Timestamp]) -> bool:
+        meta = self.meta(symbol, interval)
+        if meta is None:
+            return False
+        if start is None:
+            return meta.covered_from == 0
+        return meta.covered_from <= start.value
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        df = self.frame(symbol, interval)
+        return None if df is None or df.empty else df.index[-1]
+
+    # ---------------------------------------------------------------- writes
+    def store(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        covered_from: Optional[pd.Timestamp] = None,
+        full: bool = False,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Upsert bars from a yfinance-shaped frame (DatetimeIndex, OHLCV columns).
+        Bars at or after the first incoming timestamp replace what was cached,
+        which is how the still-forming last bar gets refreshed. ``full`` marks a
+        full-window download that covers everything from ``covered_from``
+        (``None`` = unbounded).
+        """
+        key = (symbol, interval)
+        now = time.time() if now is None else now
+        with self._lock:
+            prev = self.meta(symbol, interval)
+            cached = self.frame(symbol, interval)
+            if df is not None and not df.empty:
+                index = df.index if df.index.tz is not None else df.index.tz_localize("UTC")
+                tz, index_name = str(index.tz), df.index.name or "Date"
+                data = df.reindex(columns=list(_COLUMNS)).astype("float64")
+                ts = index.tz_convert("UTC").as_unit("ns").asi8
+                values = data.to_numpy()
+                records = [
+                    (symbol, interval, int(t), *(None if np.isnan(v) else float(v) for v in row))
+                    for t, row in zip(ts, values)
+                ]
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM bars WHERE symbol = ? AND interval = ? AND ts >= ?",
+                        (symbol, interval, int(ts[0])),
+                    )
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO bars VALUES (?, ?, ?, {', '.join('?' * len(_COLUMNS))})",
+                        records,
+                    )
+                incoming = pd.DataFrame(values, index=index.tz_convert(tz), columns=list(_COLUMNS))
+                incoming.index.name = index_name
+                if cached is not None:
+                    incoming = pd.concat([cached[cached.index < incoming.index[0]], incoming])
+                self._remember(key, incoming)
+            elif prev is None:
+                return
+            else:
+                tz, index_name = prev.tz, prev.index_name
+
+            covered = 0 if covered_from is None else covered_from.value
+            if prev is not None:
+                covered = min(covered, prev.covered_from) if full else prev.covered_from
+            meta = SeriesMeta(covered, now, tz, index_name)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO series_meta VALUES (?, ?, ?, ?, ?, ?)",
+                    (symbol, interval, meta.covered_from, meta.fetched_at, meta.tz, meta.index_name),
+                )
+            self._meta[key] = meta
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM bars")
+            self._conn.execute("DELETE FROM series_meta")
+            self._frames.clear()
+            self._meta.clear()
+
+
+_cache: Optional[PriceCache] = None
+
+
+def init_price_cache(settings: Optional[Settings] = None) -> PriceCache:
+    """Create the process-wide price cache (once) from settings."""
+    global _cache
+    if _cache is None:
+        settings = settings or Settings.from_env()
+        _cache = PriceCache(settings.price_cache_path, ttl=settings.data_cache_ttl)
+    return _cache
+
+
+def get_price_cache() -> PriceCache:
+    return _cache if _cache is not None else init_price_cache()
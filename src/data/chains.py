@@ -0,0 +1,248 @@
+# src/data/chains.py
+"""
+Option chains: concurrent fetch, snapshot cache and liquidity scoring.
+
+``fetch_chain`` pulls every expiration of a symbol on a bounded thread pool
+(through the shared rate limiter and retry used for price history) and
+returns one long frame: one row per contract, calls and puts together. Each
+download is kept as a timestamped snapshot (Parquet blob in SQLite); a
+snapshot younger than ``data_cache_ttl`` is served without touching the
+network. ``liquidity_scores`` rates every contract of a chain with column
+arithmetic only.
+"""
+from __future__ import annotations
+
+import io
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.fetchers import rate_limiter
+from src.data.providers import get_provider
+from src.data.ratelimit import retrying
+from src.instrumentation import bind, count, timed
+from src.settings import Settings
+
+# yfinance option_chain column -> chain column
+_COLUMNS = {
+    "contractSymbol": "contract",
+    "strike": "strike",
+    "bid": "bid",
+    "ask": "ask",
+    "lastPrice": "last",
+    "volume": "volume",
+    "openInterest": "open_interest",
+    "impliedVolatility": "iv",
+    "inTheMoney": "itm",
+}
+CHAIN_COLUMNS = ["expiration", "type", *_COLUMNS.values()]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chain_snapshots (
+    symbol TEXT NOT NULL,
+    fetched_at REAL NOT NULL,       -- wall clock of the download
+    data BLOB NOT NULL,             -- Parquet-encoded chain
+    PRIMARY KEY (symbol, fetched_at)
+);
+"""
+
+# liquidity defaults (per contract)
+MAX_SPREAD_PCT = 0.10   # (ask - bid) / mid
+MIN_OPEN_INTEREST = 100
+MIN_VOLUME = 10
+SCORE_WEIGHTS = {"spread": 0.5, "open_interest": 0.3, "volume": 0.2}
+
+
+@dataclass
+class ChainSnapshot:
+    symbol: str
+    fetched_at: float
+    chain: pd.DataFrame
+
+    @property
+    def expirations(self) -> List[str]:
+        return sorted(self.chain["expiration"].unique().tolist())
+
+
+class ChainCache:
+    """Timestamped chain snapshots per symbol; ``keep`` most recent are retained."""
+
+    def __init__(self, path: str = ":memory:", ttl: int = 60, keep: int = 20):
+        self.path = path
+        self.ttl = ttl
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def latest(self, symbol: str, max_age: Optional[float] = None, now: Optional[float] = None) -> Optional[ChainSnapshot]:
+        """Newest snapshot, or None if there is none younger than ``max_age`` (default: ttl)."""
+        now = time.time() if now is None else now
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, data FROM chain_snapshots WHERE symbol = ? ORDER BY fetched_at DESC LIMIT 1",
+                (symbol,),
+            ).fetchone()
+        if row is None or now - row[0] >= max_age:
+            return None
+        return ChainSnapshot(symbol, row[0], pd.read_parquet(io.BytesIO(row[1])))
+
+    def history(self, symbol: str) -> List[float]:
+        """Timestamps of the stored snapshots, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fetched_at FROM chain_snapshots WHERE symbol = ? ORDER BY fetched_at", (symbol,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def store(self, snapshot: ChainSnapshot) -> None:
+        buf = io.BytesIO()
+        snapshot.chain.to_parquet(buf, index=False, compression="zstd")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chain_snapshots VALUES (?, ?, ?)",
+                (snapshot.symbol, snapshot.fetched_at, buf.getvalue()),
+            )
+            self._conn.execute(
+                "DELETE FROM chain_snapshots WHERE symbol = ? AND fetched_at NOT IN ("
+                "SELECT fetched_at FROM chain_snapshots WHERE symbol = ? ORDER BY fetched_at DESC LIMIT ?)",
+                (snapshot.symbol, snapshot.symbol, self.keep),
+            )
+
+
+_cache: Optional[ChainCache] = None
+
+
+def init_chain_cache(settings: Optional[Settings] = None) -> ChainCache:
+    """Create the process-wide chain cache (once), next to the price cache."""
+    global _cache
+    if _cache is None:
+        settings = settings or Settings.from_env()
+        _cache = ChainCache(settings.price_cache_path, ttl=settings.data_cache_ttl)
+    return _cache
+
+
+def get_chain_cache() -> ChainCache:
+    return _cache if _cache is not None else init_chain_cache()
+
+
+_retry = retrying(rate_limiter)
+
+
+@timed("fetch.expirations", rows=True)
+@_retry
+def _download_expirations(symbol: str) -> List[str]:
+    count("fetch.rate_limit_wait_s", rate_limiter.acquire())
+    return list(get_provider().expirations(symbol))
+
+
+@timed("fetch.chain")
+@_retry
+def _download_chain(symbol: str, expiration: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(calls, puts) for one expiration."""
+    count("fetch.rate_limit_wait_s", rate_limiter.acquire())
+    return get_provider().option_chain(symbol, expiration)
+
+
+def _frame(calls: pd.DataFrame, puts: pd.DataFrame, expiration: str) -> pd.DataFrame:
+    parts = []
+    for kind, df in (("call", calls), ("put", puts)):
+        part = df.reindex(columns=list(_COLUMNS)).rename(columns=_COLUMNS)
+        part.insert(0, "type", kind)
+        part.insert(0, "expiration", expiration)
+        parts.append(part)
+    out = pd.concat(parts, ignore_index=True)
+    return out.astype({
+        "strike": "float64", "bid": "float64", "ask": "float64", "last": "float64",
+        "volume": "float64", "open_interest": "float64", "iv": "float64",
+    })
+
+
+def fetch_chain(
+    symbol: str,
+    expirations: Optional[Iterable[str]] = None,
+    max_workers: int = 8,
+    cache: Optional[ChainCache] = None,
+    refresh: bool = False,
+    limit: Optional[int] = None,
+) -> ChainSnapshot:
+    """
+    Every expiration (or just ``expirations``, or the nearest ``limit``) of
+    ``symbol`` as one snapshot. A cached snapshot younger than the TTL is
+    returned unless ``refresh``.
+    """
+    cache = cache or get_chain_cache()
+    symbol = symbol.strip().upper()
+    wanted = None if expirations is None else list(expirations)
+    if not refresh:
+        snap = cache.latest(symbol)
+        if snap is not None and (wanted is None or set(wanted) <= set(snap.expirations)):
+            if wanted is None and limit is not None:
+                wanted = snap.expirations[:limit]
+            if wanted is not None:
+                snap.chain = snap.chain[snap.chain["expiration"].isin(wanted)].reset_index(drop=True)
+            return snap
+
+    exps = wanted if wanted is not None else list(_download_expirations(symbol))
+    if limit is not None:
+        exps = sorted(exps)[:limit]
+    if not exps:
+        raise RuntimeError(f"No option expirations for {symbol}")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(bind(lambda exp: _frame(*_download_chain(symbol, exp), exp)), exps))
+    snap = ChainSnapshot(symbol, time.time(), pd.concat(frames, ignore_index=True))
+    if wanted is None and limit is None:
+        cache.store(snap)  # only complete chains serve later lookups
+    return snap
+
+
+def liquidity_scores(
+    chain: pd.DataFrame,
+    max_spread_pct: float = MAX_SPREAD_PCT,
+    min_open_interest: float = MIN_OPEN_INTEREST,
+    min_volume: float = MIN_VOLUME,
+) -> pd.DataFrame:
+    """
+    Add ``mid``, ``spread``, ``spread_pct``, per-factor scores (0..1), a
+    weighted ``liquidity`` score and a ``liquid`` flag to every contract.
+
+    Spread scores fall linearly to 0 at ``max_spread_pct``; OI and volume
+    scores grow with log size and reach 1 at 10x their minimums. Contracts
+    without a two-sided quote score 0 on spread.
+    """
+    bid = chain["bid"].to_numpy(dtype="float64")
+    ask = chain["ask"].to_numpy(dtype="float64")
+    oi = np.nan_to_num(chain["open_interest"].to_numpy(dtype="float64"), nan=0.0)
+    vol = np.nan_to_num(chain["volume"].to_numpy(dtype="float64"), nan=0.0)
+
+    quoted = (bid > 0) & (ask >= bid)
+    mid = np.where(quoted, (bid + ask) / 2, np.nan)
+    spread = np.where(quoted, ask - bid, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = spread / mid
+    spread_score = np.where(quoted, np.clip(1 - spread_pct / max_spread_pct, 0, 1), 0.0)
+    oi_score = np.clip(np.log1p(oi) / np.log1p(10 * min_open_interest), 0, 1)
+    vol_score = np.clip(np.log1p(vol) / np.log1p(10 * min_volume), 0, 1)
+
+    out = chain.copy()
+    out["mid"] = mid
+    out["spread"] = spread
+    out["spread_pct"] = spread_pct
+    out["spread_score"] = spread_score
+    out["oi_score"] = oi_score
+    out["volume_score"] = vol_score
+    out["liquidity"] = np.round(
+        SCORE_WEIGHTS["spread"] * spread_score
+        + SCORE_WEIGHTS["open_interest"] * oi_score
+        + SCORE_WEIGHTS["volume"] * vol_score,
+        4,
+    )
+    out["liquid"] = quoted & (spread_pct <= max_spread_pct) & (oi >= min_open_interest) & (vol >= min_volume)
+    return out
@@ -1,19 +1,153 @@
-from dataclasses import dataclass
-from tenacity import retry, stop_after_attempt, wait_exponential
-import yfinance as yf
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 
+from src.data.cache import PriceCache, get_price_cache, period_start, trim_to_period
+from src.data.providers import get_provider
+from src.data.ratelimit import TokenBucket, retrying
+from src.instrumentation import bind, count, timed
+
+logger = logging.getLogger(__name__)
+
+# Shared by every download in the process (single and batch).
+rate_limiter = TokenBucket(rate=2.0, capacity=4)
+
+# yf.download accepts many tickers per call; keep URLs/responses reasonable.
+BATCH_SIZE = 50
+
 @dataclass
 class PriceRequest:
     symbol: str
     period: str = "1mo"
     interval: str = "1d"
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
-def fetch_history(req: PriceRequest) -> pd.DataFrame:
-    """Fetch OHLCV with simple retry/backoff for transient errors (e.g., 429)."""
-    ticker = yf.Ticker(req.symbol)
-    df = ticker.history(period=req.period, interval=req.interval)
+@dataclass
+class BatchResult:
+    frames: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+# One failing worker pauses the shared limiter for its whole backoff window.
+_retry = retrying(rate_limiter)
+
+@timed("fetch.download", rows=True)
+@_retry
+def _download(symbol: str, interval: str, period: Optional[str] = None, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """One provider round trip, either a full ``period`` or everything since ``start``."""
+    count("fetch.rate_limit_wait_s", rate_limiter.acquire())
+    return get_provider().history(symbol, interval, period=period, start=start)
+
+@timed("fetch.download_many", rows=True)
+@_retry
+def _download_many(symbols: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+    """One batched provider round trip for several tickers sharing period/interval."""
+    count("fetch.rate_limit_wait_s", rate_limiter.acquire())
+    return get_provider().history_many(symbols, interval, period)
+
+@timed("fetch.fetch_history", rows=True)
+def fetch_history(req: PriceRequest, cache: Optional[PriceCache] = None) -> pd.DataFrame:
+    """
+    Fetch OHLCV, reading the local price cache first.
+
+    - cached and fetched within ``data_cache_ttl``: served locally, no network
+    - cached but stale: only bars since the last cached timestamp are downloaded
+      (that last bar is re-fetched, since it may still have been forming); if
+      that download fails (e.g. retries exhausted on 429s) the cached bars are
+      served as they are and a warning is logged
+    - not cached, or cache does not reach back far enough: full ``period`` download
+    Network calls keep the retry/backoff for transient errors (e.g., 429).
+    """
+    cache = cache or get_price_cache()
+    symbol = req.symbol.strip().upper()
+    start = period_start(req.period)
+
+    if not cache.covers(symbol, req.interval, start):
+        count("fetch.cache_miss")
+        df = _download(symbol, req.interval, period=req.period)
+        if df is None or df.empty:
+            raise RuntimeError(f"No data for {req.symbol}")
+        cache.store(symbol, req.interval, df, covered_from=start, full=True)
+    elif not cache.is_fresh(symbol, req.interval):
+        count("fetch.cache_stale")
+        try:
+            delta = _download(symbol, req.interval, start=cache.last_timestamp(symbol, req.interval))
+        except Exception as e:
+            count("fetch.stale_served")
+            logger.warning("Serving stale cached %s %s bars; update failed: %s", symbol, req.interval, e)
+        else:
+            cache.store(symbol, req.interval, delta)
+
+    df = cache.frame(symbol, req.interval)
     if df is None or df.empty:
         raise RuntimeError(f"No data for {req.symbol}")
-    return df.reset_index()
+    return trim_to_period(df, req.period).reset_index()
+
+@timed("fetch.fetch_many", rows=True)
+def fetch_many(
+    requests: Iterable[PriceRequest],
+    max_workers: int = 8,
+    cache: Optional[PriceCache] = None,
+) -> BatchResult:
+    """
+    Fetch many symbols concurrently; results and errors are keyed by upper-case symbol.
+
+    Symbols missing from the cache are first pulled with batched multi-ticker
+    downloads (grouped by period/interval); every request is then resolved
+    through ``fetch_history`` on a bounded thread pool, so warm symbols are
+    local reads and stale ones only fetch their delta. All network calls share
+    ``rate_limiter`` and its backoff.
+    """
+    cache = cache or get_price_cache()
+    reqs = [PriceRequest(r.symbol.strip().upper(), r.period, r.interval) for r in requests]
+    result = BatchResult()
+
+    cold: Dict[tuple, List[str]] = {}
+    for r in reqs:
+        if not cache.covers(r.symbol, r.interval, period_start(r.period)):
+            cold.setdefault((r.period, r.interval), []).append(r.symbol)
+    batches = [
+        (period, interval, syms[i : i + BATCH_SIZE])
+        for (period, interval), syms in cold.items()
+        for i in range(0, len(syms), BATCH_SIZE)
+    ]
+
+    def _warm(period: str, interval: str, symbols: List[str]) -> None:
+        try:
+            frames = _download_many(symbols, interval, period)
+        except Exception:
+            return  # fall back to per-symbol downloads below
+        for sym, df in frames.items():
+            if not df.empty:
+                cache.store(sym, interval, df, covered_from=period_start(period), full=True)
+
+    def _one(r: PriceRequest) -> None:
+        try:
+            result.frames[r.symbol] = fetch_history(r, cache=cache)
+        except Exception as e:
+            result.errors[r.symbol] = e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(bind(lambda b: _warm(*b)), batches))
+        list(pool.map(bind(_one), reqs))
+    return result
+
+def latest_quotes(
+    symbols: Iterable[str],
+    period: str = "5d",
+    cache: Optional[PriceCache] = None,
+) -> Tuple[Dict[str, float], Dict[str, Exception]]:
+    """
+    Last close per symbol (upper-cased) from one batched, cached ``fetch_many``
+    of daily bars; symbols that could not be priced are returned in the errors.
+    """
+    unique = dict.fromkeys(s.strip().upper() for s in symbols)
+    res = fetch_many([PriceRequest(s, period=period, interval="1d") for s in unique], cache=cache)
+    quotes, errors = {}, dict(res.errors)
+    for sym, df in res.frames.items():
+        close = df["Close"].dropna()
+        if close.empty:
+            errors[sym] = RuntimeError(f"No close for {sym}")
+        else:
+            quotes[sym] = float(close.iloc[-1])
+    return quotes, errors
@@ -0,0 +1,337 @@
+# src/data/providers.py
+"""
+Market-data providers behind ``fetch_history`` / ``fetch_many`` / ``fetch_chain``.
+
+- ``YFinanceProvider``: live Yahoo Finance (the default)
+- ``ReplayProvider``: recorded OHLCV and option chains from Arrow IPC files,
+  memory-mapped and sliced per symbol without copying, with optional
+  simulated latency and 429s for deterministic load tests
+
+The fetchers only see the provider interface; rate limiting, retries and the
+price cache stay in front of whichever provider is active. ``write_replay``
+(or ``record`` from a live provider) creates a replay directory.
+"""
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.settings import Settings
+
+# yfinance option_chain columns, as both providers return them
+CHAIN_FIELDS = [
+    "contractSymbol", "strike", "bid", "ask", "lastPrice", "volume", "openInterest", "impliedVolatility",
+    "inTheMoney",
+]
+_OFFSETS_KEY = b"symbol_offsets"
+
+
+class RateLimited(RuntimeError):
+    """A provider refused the call (HTTP 429 or a simulated one)."""
+
+
+class MarketDataProvider(ABC):
+    """Interface every provider implements; frames look like yfinance's."""
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """OHLCV bars of one symbol: a full ``period`` or everything since ``start``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def history_many(self, symbols: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        """Bars for several symbols in one round trip; symbols without data are left out."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def expirations(self, symbol: str) -> List[str]:
+        """Listed option expiration dates (YYYY-MM-DD), nearest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def option_chain(self, symbol: str, expiration: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """(calls, puts) for one expiration, with ``CHAIN_FIELDS`` columns."""
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def history(self, symbol, interval, period=None, start=None):
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+    def history_many(self, symbols, interval, period):
+        import yfinance as yf
+
+        df = yf.download(
+            tickers=symbols,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            actions=True,
+            threads=False,
+            progress=False,
+        )
+        if df is None or df.empty:
+            return {}
+        out = {}
+        for sym in symbols:
+            if sym in df.columns.get_level_values(0):
+                part = df[sym].dropna(how="all")
+                part.columns.name = None
+                out[sym] = part
+        return out
+
+    def expirations(self, symbol):
+        import yfinance as yf
+
+        return list(yf.Ticker(symbol).options)
+
+    def option_chain(self, symbol, expiration):
+        import yfinance as yf
+
+        chain = yf.Ticker(symbol).option_chain(expiration)
+        return chain.calls, chain.puts
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.ipc as ipc
+    except ImportError as e:  # pragma: no cover - pyarrow ships with streamlit
+        raise RuntimeError("Replay data needs pyarrow (pip install pyarrow)") from e
+    return pa, pc, ipc
+
+
+def _write_table(pa, ipc, path: str, frames: Dict[str, pd.DataFrame]) -> None:
+    """One Arrow IPC file, rows grouped by symbol; offsets go in the schema metadata."""
+    parts, offsets, row = [], {}, 0
+    for sym in sorted(frames):
+        df = frames[sym]
+        offsets[sym] = [row, len(df)]
+        row += len(df)
+        parts.append(df.assign(symbol=sym))
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame({"symbol": []})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _OFFSETS_KEY: json.dumps(offsets)})
+    with ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def write_replay(
+    path: str,
+    bars: Dict[Tuple[str, str], pd.DataFrame],
+    chains: Optional[Dict[str, Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]]] = None,
+) -> None:
+    """
+    Create a replay directory: ``bars`` maps (symbol, interval) to yfinance-style
+    frames (DatetimeIndex), ``chains`` maps symbol -> expiration -> (calls, puts).
+    """
+    pa, _, ipc = _pyarrow()
+    os.makedirs(path, exist_ok=True)
+    by_interval: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for (symbol, interval), df in bars.items():
+        by_interval.setdefault(interval, {})[symbol.upper()] = df.reset_index()
+    for interval, frames in by_interval.items():
+        _write_table(pa, ipc, os.path.join(path, f"bars_{interval}.arrow"), frames)
+    if chains:
+        frames = {}
+        for symbol, by_exp in chains.items():
+            rows = []
+            for exp, (calls, puts) in sorted(by_exp.items()):
+                for kind, df in (("call", calls), ("put", puts)):
+                    rows.append(df.reindex(columns=CHAIN_FIELDS).assign(expiration=exp, type=kind))
+            frames[symbol.upper()] = pd.concat(rows, ignore_index=True)
+        _write_table(pa, ipc, os.path.join(path, "chains.arrow"), frames)
+
+
+def record(
+    source: MarketDataProvider,
+    path: str,
+    symbols: List[str],
+    intervals: Tuple[str, ...] = ("1d",),
+    period: str = "1y",
+    chains: bool = False,
+) -> None:
+    """Snapshot ``symbols`` from a (live) provider into a replay directory."""
+    bars = {}
+    for interval in intervals:
+        for sym, df in source.history_many(list(symbols), interval, period).items():
+            bars[(sym, interval)] = df
+    recorded_chains = {}
+    if chains:
+        for sym in symbols:
+            recorded_chains[sym] = {exp: source.option_chain(sym, exp) for exp in source.expirations(sym)}
+    write_replay(path, bars, recorded_chains)
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves a replay directory written by ``write_replay``.
+
+    Files are memory-mapped and each request is a zero-copy slice of the
+    mapped table (only the rows asked for are converted to pandas).
+    ``shift_to_today`` moves every bar by whole days so the last recorded
+    session is today, which keeps period/TTL logic meaningful for old
+    recordings. ``latency`` (seconds, +/- ``jitter``) is slept per call and a
+    fraction ``error_rate`` of calls raise ``RateLimited``; both draw from one
+    seeded RNG so a run can be repeated exactly.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        path: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        shift_to_today: bool = True,
+    ):
+        self._pa, self._pc, self._ipc = _pyarrow()
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.shift_to_today = shift_to_today
+        self.calls = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tables: Dict[str, tuple] = {}  # file -> (table, offsets, day shift)
+        if not os.path.isdir(path):
+            raise ValueError(f"Replay directory not found: {path}")
+
+    # ------------------------------------------------------------------ store
+    def _table(self, name: str):
+        with self._lock:
+            if name not in self._tables:
+                file = os.path.join(self.path, name)
+                if not os.path.exists(file):
+                    self._tables[name] = (None, {}, pd.Timedelta(0))
+                else:
+                    table = self._ipc.open_file(self._pa.memory_map(file, "r")).read_all()
+                    offsets = json.loads(table.schema.metadata[_OFFSETS_KEY])
+                    self._tables[name] = (table, offsets, self._shift(table) if name.startswith("bars_") else None)
+            return self._tables[name]
+
+    def _shift(self, table) -> pd.Timedelta:
+        if not self.shift_to_today or table.num_rows == 0:
+            return pd.Timedelta(0)
+        last = pd.Timestamp(self._pc.max(table.column(0)).as_py())
+        today = pd.Timestamp.now(tz=last.tz).normalize()
+        return today - last.normalize()
+
+    def _slice(self, name: str, symbol: str):
+        table, offsets, shift = self._table(name)
+        if table is None or symbol not in offsets:
+            return None, shift
+        offset, length = offsets[symbol]
+        return table.slice(offset, length), shift
+
+    # -------------------------------------------------------------- simulation
+    def _call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            refused = self._rng.random() < self.error_rate
+            if refused:
+                self.rate_limited += 1
+        if delay:
+            time.sleep(delay)
+        if refused:
+            raise RateLimited("429 Too Many Requests (simulated)")
+
+    # --------------------------------------------------------------- interface
+    def _bars(self, symbol: str, interval: str, period: Optional[str], start: Optional[pd.Timestamp]) -> pd.DataFrame:
+        from src.data.cache import period_start
+
+        part, shift = self._slice(f"bars_{interval}.arrow", symbol.upper())
+        if part is None:
+            return pd.DataFrame()
+        df = part.drop_columns(["symbol"]).to_pandas()
+        df = df.set_index(df.columns[0])
+        df.index = df.index + shift
+        if start is None and period is not None:
+            start = period_start(period)
+        if start is not None:
+            start = pd.Timestamp(start)
+            if start.tz is None and df.index.tz is not None:
+                start = start.tz_localize(df.index.tz)
+            df = df[df.index >= start]
+        return df
+
+    def history(self, symbol, interval, period=None, start=None):
+        self._call()
+        return self._bars(symbol, interval, period, start)
+
+    def history_many(self, symbols, interval, period):
+        self._call()
+        out = {}
+        for sym in symbols:
+            df = self._bars(sym, interval, period, None)
+            if not df.empty:
+                out[sym] = df
+        return out
+
+    def expirations(self, symbol):
+        self._call()
+        part, _ = self._slice("chains.arrow", symbol.upper())
+        if part is None:
+            return []
+        return sorted(self._pc.unique(part.column("expiration")).to_pylist())
+
+    def option_chain(self, symbol, expiration):
+        self._call()
+        part, _ = self._slice("chains.arrow", symbol.upper())
+        if part is None:
+            raise RuntimeError(f"No recorded chain for {symbol}")
+        rows = part.filter(self._pc.equal(part.column("expiration"), expiration))
+        if rows.num_rows == 0:
+            raise RuntimeError(f"No recorded chain for {symbol} {expiration}")
+        df = rows.to_pandas()
+        calls, puts = (df[df["type"] == kind][CHAIN_FIELDS].reset_index(drop=True) for kind in ("call", "put"))
+        return calls, puts
+
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def init_provider(settings: Optional[Settings] = None) -> MarketDataProvider:
+    """Create the process-wide provider (once): replay when ``market_data_replay`` is set, else yfinance."""
+    global _provider
+    if _provider is None:
+        settings = settings or Settings.from_env()
+        if settings.market_data_replay:
+            _provider = ReplayProvider(settings.market_data_replay)
+        else:
+            _provider = YFinanceProvider()
+    return _provider
+
+
+def get_provider() -> MarketDataProvider:
+    return _provider if _provider is not None else init_provider()
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> Optional[MarketDataProvider]:
+    """Swap the active provider (None: back to the settings default); returns the previous one."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
@@ -0,0 +1,84 @@
+# src/data/ratelimit.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from src.instrumentation import count
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every market-data call in the process.
+
+    ``acquire`` blocks until a token is available. ``backoff`` pauses the whole
+    bucket, so when one worker gets rate limited (429) every other worker waits
+    out the same window instead of retrying into it.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, blocking as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._resume_at:
+                    delay = self._resume_at - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def backoff(self, seconds: float) -> None:
+        """Pause all callers for at least ``seconds`` and drain the burst allowance."""
+        with self._lock:
+            now = self._clock()
+            self._resume_at = max(self._resume_at, now + seconds)
+            self._tokens = 0.0
+            self._updated = max(self._updated, self._resume_at)
+
+
+def retrying(limiter: TokenBucket, attempts: int = 3, min_wait: float = 1, max_wait: float = 8):
+    """
+    tenacity ``retry`` decorator with exponential backoff whose every wait is
+    also pushed onto ``limiter``: one failing worker pauses all of them.
+    """
+    def _coordinate_backoff(retry_state) -> None:
+        count("fetch.retries")
+        count("fetch.retry_wait_s", retry_state.next_action.sleep)
+        limiter.backoff(retry_state.next_action.sleep)
+
+    return retry(
+        stop=stop_after_attempt(attempts),
+        wait=wait_exponential(multiplier=1, min=min_wait, max=max_wait),
+        before_sleep=_coordinate_backoff,
+    )
@@ -1,32 +1,288 @@
 # src/data/vol.py
 from __future__ import annotations
 
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence
+
 import numpy as np
 import pandas as pd
 
+from src.instrumentation import timed
+
+TRADING_DAYS = 252
+
+# Bars per year for the Data tab intervals (6.5h regular session).
+PERIODS_PER_YEAR = {
+    "1d": TRADING_DAYS,
+    "1h": int(TRADING_DAYS * 6.5),
+    "30m": TRADING_DAYS * 13,
+    "15m": TRADING_DAYS * 26,
+}
+
+@timed("vol.realized_vol")
 def realized_vol(prices: pd.Series, window: int = 20) -> float:
     """
     Annualized realized volatility (decimal) using close-to-close log returns.
     Example return 0.25 => 25%.
     """
-    s = pd.Series(prices, dtype="float64").dropna()
-    log_ret = np.log(s / s.shift(1)).dropna()
-    if len(log_ret) < window:
+    s = pd.Series(prices, dtype="float64").dropna().to_numpy()
+    if len(s) - 1 < window:
         return float("nan")
-    daily_std = log_ret.rolling(window).std().iloc[-1]
-    return float(daily_std * np.sqrt(252)) if daily_std is not None else float("nan")
+    # only the last window matters; no need to roll over the whole history
+    log_ret = np.diff(np.log(s[-(window + 1):]))
+    return float(log_ret.std(ddof=1) * np.sqrt(TRADING_DAYS))
+
+@dataclass
+class VolPanel:
+    latest: pd.DataFrame   # index=symbols (or estimators), columns=windows
+    history: pd.DataFrame  # index=timestamps, columns=(window, symbol|estimator)
+
+def _rolling_sums(x: np.ndarray, windows: Sequence[int]) -> Dict[int, tuple]:
+    """
+    Trailing-window (sum, sum of squares, valid count) of a 2-D array (time x series)
+    for each window, from one set of cumulative sums. NaNs are excluded and counted.
+    Rows before the first full window are NaN.
+    """
+    valid = np.isfinite(x)
+    x0 = np.where(valid, x, 0.0)
+    zero = np.zeros((1, x.shape[1]))
+    c1 = np.concatenate([zero, np.cumsum(x0, axis=0)])
+    c2 = np.concatenate([zero, np.cumsum(x0 * x0, axis=0)])
+    cn = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    out = {}
+    for w in windows:
+        pad = np.full((min(w - 1, x.shape[0]), x.shape[1]), np.nan)
+        out[w] = tuple(
+            np.concatenate([pad, c[w:] - c[:-w]]) for c in (c1, c2, cn)
+        )
+    return out
+
+@timed("vol.realized_vol_panel")
+def realized_vol_panel(
+    prices_df: pd.DataFrame,
+    windows: Sequence[int] = (10, 20, 30),
+    periods_per_year: int = TRADING_DAYS,
+) -> VolPanel:
+    """
+    Annualized close-to-close realized vol for every symbol and window at once.
+
+    ``prices_df`` is a wide close matrix (index=timestamps, columns=symbols).
+    Log returns are summed once with cumulative sums; each window is then a
+    difference of two slices, so cost does not grow with the number of windows
+    beyond one subtraction each. A window only yields a value when all of its
+    returns are present (same as ``realized_vol`` on that symbol's series).
+    """
+    windows = sorted({int(w) for w in windows})
+    if not windows or windows[0] < 2:
+        raise ValueError("windows must be >= 2")
+    px = prices_df.to_numpy(dtype="float64")
+    log_ret = np.full_like(px, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ret[1:] = np.diff(np.log(px), axis=0)
+
+    hist = {}
+    for w, (s1, s2, n) in _rolling_sums(log_ret, windows).items():
+        with np.errstate(invalid="ignore"):
+            var = (s2 - s1 * s1 / w) / (w - 1)
+        var = np.where(n == w, np.maximum(var, 0.0), np.nan)
+        hist[w] = np.sqrt(var * periods_per_year)
+
+    history = pd.DataFrame(
+        np.concatenate([hist[w] for w in windows], axis=1),
+        index=prices_df.index,
+        columns=pd.MultiIndex.from_product([windows, prices_df.columns], names=["window", "symbol"]),
+    )
+    latest = pd.DataFrame(
+        {w: _last_valid(hist[w]) for w in windows}, index=prices_df.columns
+    )
+    latest.columns.name = "window"
+    return VolPanel(latest=latest, history=history)
+
+def _last_valid(a: np.ndarray) -> np.ndarray:
+    """Last non-NaN value per column (NaN if none); symbols may end on different bars."""
+    ok = np.isfinite(a)
+    idx = a.shape[0] - 1 - np.argmax(ok[::-1], axis=0)
+    vals = a[idx, np.arange(a.shape[1])]
+    return np.where(ok.any(axis=0), vals, np.nan)
+
+class RollingVolEstimator:
+    """
+    Streaming close-to-close HV over the last ``window`` returns.
+
+    Each ``update`` is O(1): the return entering the ring buffer is added and the
+    one leaving is removed with Welford's updates, so the current annualized HV
+    is always available without re-reading history. ``to_dict``/``from_dict``
+    round-trip the compact state (window, last close/timestamp, buffered returns).
+    """
+
+    # Re-derive mean/M2 from the buffer this often to cancel floating-point drift.
+    _REFRESH_EVERY = 10_000
+
+    def __init__(self, window: int = 20, periods_per_year: int = TRADING_DAYS):
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.last_close: Optional[float] = None
+        self.last_ts: Optional[str] = None
+        self._returns: deque = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_refresh = 0
+
+    def update(self, close: float, ts: Optional[Any] = None) -> float:
+        """Feed the next bar's close (and optionally its timestamp); returns current HV."""
+        close = float(close)
+        if self.last_close is not None and close > 0 and self.last_close > 0:
+            r = math.log(close / self.last_close)
+            if len(self._returns) == self.window:
+                old = self._returns[0]
+                n = len(self._returns) - 1
+                delta = old - self._mean
+                self._mean -= delta / n
+                self._m2 -= delta * (old - self._mean)
+            self._returns.append(r)
+            n = len(self._returns)
+            delta = r - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (r - self._mean)
+            self._since_refresh += 1
+            if self._since_refresh >= self._REFRESH_EVERY:
+                self._refresh()
+        self.last_close = close
+        if ts is not None:
+            self.last_ts = str(ts)
+        return self.value
+
+    def update_many(self, closes: Iterable[float]) -> float:
+        for c in closes:
+            self.update(c)
+        return self.value
+
+    def feed(self, df: pd.DataFrame, close_col: str = "Close") -> float:
+        """
+        Feed a ``fetch_history`` frame (timestamp in the first column), skipping bars
+        already seen and the last bar, which may still be forming.
+        """
+        ts = pd.to_datetime(df.iloc[:-1, 0])
+        closes = df[close_col].iloc[:-1]
+        if self.last_ts is not None:
+            newer = (ts > pd.Timestamp(self.last_ts)).to_numpy()
+            ts, closes = ts[newer], closes[newer]
+        for t, c in zip(ts, closes.to_numpy()):
+            self.update(c, ts=t)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return len(self._returns) == self.window
+
+    @property
+    def value(self) -> float:
+        """Annualized HV (decimal), NaN until ``window`` returns have been seen."""
+        if not self.ready:
+            return float("nan")
+        var = max(self._m2, 0.0) / (self.window - 1)
+        return math.sqrt(var * self.periods_per_year)
+
+    def _refresh(self) -> None:
+        n = len(self._returns)
+        self._mean = sum(self._returns) / n if n else 0.0
+        self._m2 = sum((x - self._mean) ** 2 for x in self._returns)
+        self._since_refresh = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "periods_per_year": self.periods_per_year,
+            "last_close": self.last_close,
+            "last_ts": self.last_ts,
+            "returns": list(self._returns),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "RollingVolEstimator":
+        est = cls(window=int(state["window"]), periods_per_year=int(state["periods_per_year"]))
+        est.last_close = state.get("last_close")
+        est.last_ts = state.get("last_ts")
+        est._returns.extend(float(x) for x in state.get("returns", []))
+        est._refresh()
+        return est
+
+ESTIMATORS = ("close", "parkinson", "garman_klass", "rogers_satchell", "yang_zhang")
+
+@timed("vol.ohlc_vol")
+def ohlc_vol(
+    df: pd.DataFrame,
+    windows: Sequence[int] = (20,),
+    periods_per_year: int = TRADING_DAYS,
+) -> VolPanel:
+    """
+    Close-to-close and range-based realized vol (Parkinson, Garman-Klass,
+    Rogers-Satchell, Yang-Zhang) from one OHLC frame, annualized decimals.
+
+    The per-bar log terms of every estimator are stacked into one array and
+    rolled with a single set of cumulative sums; the frame itself is read once.
+    Yang-Zhang uses the overnight (open vs prior close) and open-to-close
+    variances plus Rogers-Satchell with the usual k weighting.
+    """
+    windows = sorted({int(w) for w in windows})
+    if not windows or windows[0] < 2:
+        raise ValueError("windows must be >= 2")
+    o, h, lo, c = np.log(df[["Open", "High", "Low", "Close"]].to_numpy(dtype="float64")).T
+    prev_c = np.concatenate([[np.nan], c[:-1]])
+    hl = h - lo
+    oc = c - o
+    terms = np.column_stack([
+        c - prev_c,                                       # close-to-close return
+        hl * hl,                                          # Parkinson
+        0.5 * hl * hl - (2 * np.log(2) - 1) * oc * oc,    # Garman-Klass
+        (h - o) * (h - c) + (lo - o) * (lo - c),          # Rogers-Satchell
+        o - prev_c,                                       # overnight return
+        oc,                                               # open-to-close return
+    ])
+
+    hist = {}
+    k_yz = {w: 0.34 / (1.34 + (w + 1) / (w - 1)) for w in windows}
+    for w, (s1, s2, n) in _rolling_sums(terms, windows).items():
+        full = n == w
+        with np.errstate(invalid="ignore"):
+            sample_var = (s2 - s1 * s1 / w) / (w - 1)
+            mean = s1 / w
+        rs = mean[:, 3]
+        var = np.column_stack([
+            sample_var[:, 0],
+            mean[:, 1] / (4 * np.log(2)),
+            mean[:, 2],
+            rs,
+            sample_var[:, 4] + k_yz[w] * sample_var[:, 5] + (1 - k_yz[w]) * rs,
+        ])
+        ok = np.column_stack([full[:, 0], full[:, 1], full[:, 2], full[:, 3], full[:, 3:].all(axis=1)])
+        hist[w] = np.sqrt(np.where(ok, np.maximum(var, 0.0), np.nan) * periods_per_year)
+
+    history = pd.DataFrame(
+        np.concatenate([hist[w] for w in windows], axis=1),
+        index=df.index,
+        columns=pd.MultiIndex.from_product([windows, ESTIMATORS], names=["window", "estimator"]),
+    )
+    latest = pd.DataFrame({w: _last_valid(hist[w]) for w in windows}, index=list(ESTIMATORS))
+    latest.columns.name = "window"
+    return VolPanel(latest=latest, history=history)
 
-def compare_iv_hv(iv_decimal: float, hv_decimal: float) -> str:
+def compare_iv_hv(iv_decimal: float, hv_decimal: float, label: str = "HV") -> str:
+    """Interpret IV against a realized-vol figure; ``label`` names the estimator used."""
     if pd.isna(hv_decimal):
         return "Not enough data to compute realized volatility."
 
     if hv_decimal <= 0:
-        return f"IV ({iv_decimal:.2%}) vs HV (non-positive)."
+        return f"IV ({iv_decimal:.2%}) vs {label} (non-positive)."
 
     diff_pct = (iv_decimal - hv_decimal) / hv_decimal * 100.0
     if diff_pct > 20:
-        return f"IV ({iv_decimal:.2%}) is {diff_pct:.1f}% higher than HV ({hv_decimal:.2%}). Options look expensive."
+        return f"IV ({iv_decimal:.2%}) is {diff_pct:.1f}% higher than {label} ({hv_decimal:.2%}). Options look expensive."
     elif diff_pct < -20:
-        return f"IV ({iv_decimal:.2%}) is {abs(diff_pct):.1f}% lower than HV ({hv_decimal:.2%}). Options look cheap."
+        return f"IV ({iv_decimal:.2%}) is {abs(diff_pct):.1f}% lower than {label} ({hv_decimal:.2%}). Options look cheap."
     else:
-        return f"IV ({iv_decimal:.2%}) is close to HV ({hv_decimal:.2%}). Options appear fairly priced."
+        return f"IV ({iv_decimal:.2%}) is close to {label} ({hv_decimal:.2%}). Options appear fairly priced."
@@ -0,0 +1,226 @@
+# src/instrumentation.py
+"""
+Timing and counters for the hot paths (fetchers, storage, vol, UI sections).
+
+Nothing is recorded unless a ``Trace`` is active in the current context:
+``with tracing("rerun") as t: ...`` collects every ``span`` / ``timed`` call
+and ``count`` increment made inside it, and only costs a context-variable
+lookup per instrumented call otherwise. Worker threads join the caller's
+trace through ``bind``. ``Trace.to_dict`` is the structured record (also
+logged on the ``ai_trader.trace`` logger at DEBUG when a trace finishes).
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("ai_trader.trace")
+
+PROFILE_LINES = 40  # functions kept from a cProfile capture (by cumulative time)
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("ai_trader_trace", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    start: float          # seconds since the trace started
+    duration: float
+    thread: str
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    label: str
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    spans: List[Span] = field(default_factory=list)
+    counters: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per span name: calls, total/max ms, rows and queries summed; slowest total first."""
+        agg: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans:
+            a = agg.setdefault(s.name, {"name": s.name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                        "rows": 0, "queries": 0})
+            a["calls"] += 1
+            a["total_ms"] += s.duration * 1000
+            a["max_ms"] = max(a["max_ms"], s.duration * 1000)
+            a["rows"] += s.attrs.get("rows", 0) or 0
+            a["queries"] += s.attrs.get("queries", 0) or 0
+        for a in agg.values():
+            a["total_ms"] = round(a["total_ms"], 3)
+            a["max_ms"] = round(a["max_ms"], 3)
+        return sorted(agg.values(), key=lambda a: -a["total_ms"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "counters": {k: round(v, 6) for k, v in self.counters.items()},
+            "summary": self.summary(),
+            "spans": [
+                {"name": s.name, "start_ms": round(s.start * 1000, 3), "duration_ms": round(s.duration * 1000, 3),
+                 "thread": s.thread, **{k: v for k, v in s.attrs.items() if _jsonable(v)}}
+                for s in self.spans
+            ],
+        }
+
+
+def _jsonable(v: Any) -> bool:
+    return v is None or isinstance(v, (str, int, float, bool))
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def tracing(label: str) -> Iterator[Trace]:
+    """Collect everything instrumented in this context (and bound threads) into a new ``Trace``."""
+    trace = Trace(label)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.duration = time.perf_counter() - trace._t0
+        _current.reset(token)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(trace.to_dict()))
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as one span; yields its attribute dict so the block can add
+    e.g. ``rows``. DB queries issued meanwhile are recorded as ``queries``.
+    """
+    trace = _current.get()
+    if trace is None:
+        yield attrs
+        return
+    queries = trace.counters.get("db.queries", 0)
+    t0 = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        end = time.perf_counter()
+        attrs.setdefault("queries", int(trace.counters.get("db.queries", 0) - queries))
+        trace.add(Span(name, t0 - trace._t0, end - t0, threading.current_thread().name, attrs))
+
+
+@contextmanager
+def profiled(enabled: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    cProfile the block (calling thread only); the yielded dict gets ``stats``,
+    the top ``PROFILE_LINES`` functions by cumulative time as text, on exit.
+    """
+    out: Dict[str, Any] = {}
+    if not enabled:
+        yield out
+        return
+    import cProfile
+    import io
+    import pstats
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield out
+    finally:
+        prof.disable()
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        out["stats"] = buf.getvalue()
+
+
+def _rows(result: Any) -> Optional[int]:
+    """Rows a call handed back: list/frame/dict length, ``Page.rows``, ``BatchResult.frames``, else 1."""
+    if result is None:
+        return None
+    for attr in ("rows", "frames"):  # storage.Page, fetchers.BatchResult
+        inner = getattr(result, attr, None)
+        if isinstance(inner, (list, dict)):
+            return len(inner)
+    try:
+        return len(result)
+    except TypeError:
+        return 1
+
+
+def timed(name: str, rows: bool = False) -> Callable:
+    """Decorator: one span per call; with ``rows`` the result size is recorded as hydrated rows."""
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name) as attrs:
+                result = fn(*args, **kwargs)
+                if rows:
+                    attrs["rows"] = _rows(result)
+                return result
+        return inner
+    return wrap
+
+
+def count(name: str, n: float = 1) -> None:
+    """Add ``n`` to a counter of the active trace (no-op without one)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, n)
+
+
+def bind(fn: Callable) -> Callable:
+    """``fn`` wrapped to record into the caller's trace when run on another thread (thread pools)."""
+    trace = _current.get()
+    if trace is None:
+        return fn
+
+    @functools.wraps(fn)
+    def inner(*args, **kwargs):
+        token = _current.set(trace)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return inner
+
+
+def instrument_engine(engine) -> None:
+    """Count statements and their time (``db.queries`` / ``db.query_s``) on a SQLAlchemy engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("_trace_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        trace = _current.get()
+        starts = conn.info.get("_trace_t0")
+        if trace is not None and starts:
+            trace.count("db.queries")
+            trace.count("db.query_s", time.perf_counter() - starts.pop())
@@ -0,0 +1,149 @@
+# src/journal/analytics.py
+"""
+Columnar analytics over closed trades.
+
+``JournalFrame.load`` pulls the needed columns of every matching closed trade
+with one query; P&L, R-multiples, holding days, equity/drawdown and rolling
+stats are then array operations, with the same rules as the per-row
+``JournalEntry`` properties (100x multiplier, BTO/STO sign, stop-based risk).
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import JournalEntry
+from .storage import query_entries
+
+MULTIPLIER = 100
+
+_COLUMNS = [
+    "id", "symbol", "strategy", "direction", "entry_action", "entry_date", "exit_date",
+    "entry_price", "exit_price", "stop_price", "target_price", "size", "tags_csv",
+]
+
+# keys accepted by ``summary(by=...)`` besides plain columns
+DERIVED_KEYS = ("month", "tag")
+
+
+class JournalFrame:
+    def __init__(self, df: pd.DataFrame):
+        df = df.copy()
+        df["entry_date"] = pd.to_datetime(df["entry_date"])
+        df["exit_date"] = pd.to_datetime(df["exit_date"])
+        df = df.sort_values(["exit_date", "id"], kind="stable").reset_index(drop=True)
+
+        entry = df["entry_price"].to_numpy(dtype="float64")
+        exit_ = df["exit_price"].to_numpy(dtype="float64")
+        stop = df["stop_price"].to_numpy(dtype="float64")
+        size = df["size"].to_numpy(dtype="float64")
+        bto = (df["entry_action"] == "BTO").to_numpy()
+
+        pl = np.where(bto, exit_ - entry, entry - exit_) * size * MULTIPLIER
+        per_contract = np.where(np.isnan(stop), np.where(bto, entry, np.nan), np.abs(entry - stop))
+        risk = per_contract * size * MULTIPLIER
+        risk = np.where(risk > 0, risk, np.nan)
+
+        df["pl"] = np.round(pl, 2)
+        df["risk"] = risk
+        df["r_multiple"] = np.round(df["pl"].to_numpy() / risk, 2)
+        df["holding_days"] = (df["exit_date"] - df["entry_date"]).dt.days
+        df["win"] = df["pl"] > 0
+        df["month"] = df["exit_date"].dt.strftime("%Y-%m")
+        self.df = df
+
+    # ---------------------------------------------------------------- loading
+    @classmethod
+    def load(cls, **filters) -> "JournalFrame":
+        """Closed trades matching ``query_entries`` filters (symbol, strategy, dates, tags...)."""
+        filters.pop("status", None)
+        page = query_entries(status="closed", columns=_COLUMNS, limit=None, **filters)
+        cols = list(dict.fromkeys(["id", "created_at", *_COLUMNS]))
+        df = pd.DataFrame.from_records(page.rows, columns=cols).drop(columns="created_at")
+        return cls(df[df["exit_price"].notna()])
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[JournalEntry]) -> "JournalFrame":
+        records = [
+            {c: getattr(e, c) for c in _COLUMNS}
+            for e in entries
+            if e.status == "closed" and e.exit_price is not None
+        ]
+        return cls(pd.DataFrame.from_records(records, columns=_COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    # ---------------------------------------------------------------- series
+    def equity_curve(self, starting_equity: float = 0.0) -> pd.Series:
+        """Cumulative realized P&L in exit order."""
+        return pd.Series(
+            starting_equity + np.cumsum(self.df["pl"].to_numpy()),
+            index=self.df["exit_date"],
+            name="equity",
+        )
+
+    def drawdown(self, starting_equity: float = 0.0) -> pd.Series:
+        """Distance below the running equity peak (<= 0)."""
+        eq = self.equity_curve(starting_equity)
+        peak = np.maximum.accumulate(np.concatenate([[starting_equity], eq.to_numpy()]))[1:]
+        return pd.Series(eq.to_numpy() - peak, index=eq.index, name="drawdown")
+
+    def max_drawdown(self, starting_equity: float = 0.0) -> float:
+        """Largest peak-to-trough decline in dollars (positive number, 0.0 if none)."""
+        if self.df.empty:
+            return 0.0
+        return float(-self.drawdown(starting_equity).min())
+
+    def rolling_win_rate(self, window: int = 20) -> pd.Series:
+        return pd.Series(
+            self.df["win"].astype("float64").rolling(window).mean().to_numpy(),
+            index=self.df["exit_date"],
+            name="win_rate",
+        )
+
+    def rolling_expectancy(self, window: int = 20, in_r: bool = False) -> pd.Series:
+        """Average P&L (or R) per trade over the last ``window`` trades."""
+        col = "r_multiple" if in_r else "pl"
+        return pd.Series(
+            self.df[col].rolling(window, min_periods=window).mean().to_numpy(),
+            index=self.df["exit_date"],
+            name="expectancy_r" if in_r else "expectancy",
+        )
+
+    # ---------------------------------------------------------------- tables
+    def summary(self, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Per-group trades, wins, win rate, total/average P&L, average R, average
+        holding days and max drawdown. ``by`` is any column (strategy, symbol,
+        entry_action, direction, ...), "month" (exit month) or "tag".
+        """
+        df = self.df
+        if by == "tag":
+            # same normalization as split_tags / journal_entry_tags: strip, no empties, no repeats
+            tags = df["tags_csv"].fillna("").str.split(",").explode().str.strip()
+            tags = tags[tags != ""]
+            tags = tags[~pd.MultiIndex.from_arrays([tags.index, tags]).duplicated()]
+            df = df.loc[tags.index].assign(tag=tags.to_numpy()).reset_index(drop=True)
+        elif by is not None and by not in df.columns:
+            raise ValueError(f"Unknown grouping key: {by}")
+        if by is None:
+            df = df.assign(_all="all")
+            by = "_all"
+
+        g = df.groupby(by, sort=True)
+        out = pd.DataFrame({
+            "trades": g["pl"].size(),
+            "wins": g["win"].sum(),
+            "pl": g["pl"].sum().round(2),
+            "avg_pl": g["pl"].mean().round(2),
+            "avg_r": g["r_multiple"].mean().round(2),
+            "avg_days": g["holding_days"].mean().round(1),
+        })
+        out["win_rate"] = (out["wins"] / out["trades"]).round(3)
+        # drawdown within each group's own equity path (rows are already in exit order)
+        cum = g["pl"].cumsum()
+        out["max_drawdown"] = (cum.groupby(df[by]).cummax().clip(lower=0) - cum).groupby(df[by]).max().round(2)
+        return out.rename_axis(None if by == "_all" else by)
@@ -0,0 +1,322 @@
+# src/journal/importer.py
+"""
+Bulk broker-fill import and columnar export for the journal.
+
+Import streams a fill CSV in chunks, pairs opening fills with closing fills
+FIFO per symbol (BTO -> STC, STO -> BTC, as ``JournalEntry.expected_exit_action``),
+and writes each chunk's trades in one transaction. Every trade carries an
+``external_id`` derived from the fills it came from, so re-importing the same
+history skips what is already there. Lots still open at the end are stored as
+open trades; a later import that closes them closes those rows in place.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import IO, Deque, Dict, List, Optional, Union
+
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, TypeDecorator
+
+from .models import JournalEntry, split_tags
+from .storage import (
+    SUMMARY_COLUMNS,
+    ids_by_external_id,
+    insert_entries,
+    query_entries,
+    rebuild_trade_stats,
+    write_batch,
+)
+
+OPEN_ACTIONS = ("BTO", "STO")
+CLOSES = {"STC": "BTO", "BTC": "STO"}  # closing action -> opening action it closes
+
+# canonical column -> accepted header spellings (case-insensitive)
+DEFAULT_COLUMNS = {
+    "date": ("date", "trade date", "activity date", "filled time", "time"),
+    "symbol": ("symbol", "ticker", "instrument", "description"),
+    "action": ("action", "side", "trans code", "type"),
+    "quantity": ("quantity", "qty", "contracts", "filled qty"),
+    "price": ("price", "fill price", "avg price", "average price"),
+    "fill_id": ("fill_id", "order id", "execution id", "trade id", "id"),
+}
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    closed_trades: int = 0
+    open_trades: int = 0
+    reopened_closed: int = 0   # previously imported open lots closed by this import
+    duplicates: int = 0
+    skipped_rows: int = 0
+    unmatched_close_qty: int = 0
+    unmatched_symbols: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _Lot:
+    key: str
+    action: str
+    entry_date: date
+    price: float
+    qty: int
+    taken: int = 0  # contracts already closed from this lot
+
+
+def _resolve_columns(header: List[str], columns: Optional[Dict[str, str]]) -> Dict[str, str]:
+    lower = {h.strip().lower(): h for h in header}
+    out = {}
+    for canon, spellings in DEFAULT_COLUMNS.items():
+        if columns and canon in columns:
+            out[canon] = columns[canon]
+            continue
+        for sp in spellings:
+            if sp in lower:
+                out[canon] = lower[sp]
+                break
+    missing = [c for c in ("date", "symbol", "action", "quantity", "price") if c not in out]
+    if missing:
+        raise ValueError(f"Fill CSV is missing required columns: {', '.join(missing)}")
+    return out
+
+
+def _key(*parts) -> str:
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:24]
+
+
+class _Pairer:
+    def __init__(self, strategy: str, tags_csv: str):
+        self.strategy = strategy
+        self.tags_csv = ",".join(split_tags(tags_csv.split(",")))
+        self.lots: Dict[str, Deque[_Lot]] = defaultdict(deque)
+        # same-content fills seen on the current date; input is chronological, so
+        # counts from earlier dates are never needed again
+        self.seen: Dict[str, int] = defaultdict(int)
+        self.day: Optional[date] = None
+        self.report = ImportReport()
+
+    def _row(self, symbol, lot: _Lot, qty, ext_id, exit_date=None, exit_price=None) -> dict:
+        now = datetime.utcnow()
+        return {
+            "created_at": now,
+            "updated_at": now,
+            "symbol": symbol,
+            "direction": "neutral",
+            "strategy": self.strategy,
+            "entry_action": lot.action,
+            "entry_date": lot.entry_date,
+            "entry_price": lot.price,
+            "size": int(qty),
+            "notes": "",
+            "tags_csv": self.tags_csv,
+            "status": "open" if exit_price is None else "closed",
+            "exit_date": exit_date,
+            "exit_price": exit_price,
+            "external_id": ext_id,
+        }
+
+    def feed(self, chunk: pd.DataFrame) -> List[dict]:
+        """Pair one normalized chunk; returns closed-trade rows (external_id set)."""
+        trades = []
+        for d, sym, action, qty, price, fill_id in chunk.itertuples(index=False, name=None):
+            if self.day is None or d > self.day:
+                self.day = d
+                self.seen.clear()
+            content = (d, sym, action, qty, price)
+            self.seen[str(content)] += 1
+            fill_key = fill_id if isinstance(fill_id, str) and fill_id else _key(*content, self.seen[str(content)])
+            if action in OPEN_ACTIONS:
+                self.lots[sym].append(_Lot(fill_key, action, d, price, qty))
+                continue
+            want = CLOSES[action]
+            queue = self.lots[sym]
+            remaining = qty
+            for lot in queue:
+                if remaining == 0:
+                    break
+                if lot.action != want or lot.qty == 0:
+                    continue
+                take = min(remaining, lot.qty)
+                ext = f"{lot.key}>{fill_key}:{lot.taken}"
+                trades.append(self._row(sym, lot, take, ext, exit_date=d, exit_price=price) | {"_lot": lot.key, "_take": take})
+                lot.qty -= take
+                lot.taken += take
+                remaining -= take
+            while queue and queue[0].qty == 0:
+                queue.popleft()
+            if remaining:
+                self.report.unmatched_close_qty += remaining
+                if sym not in self.report.unmatched_symbols:
+                    self.report.unmatched_symbols.append(sym)
+        return trades
+
+    def open_rows(self) -> List[dict]:
+        return [
+            self._row(sym, lot, lot.qty, lot.key) | {"_lot": lot.key, "_take": 0}
+            for sym, queue in self.lots.items()
+            for lot in queue
+            if lot.qty > 0
+        ]
+
+
+def _normalize(chunk: pd.DataFrame, cols: Dict[str, str], report: ImportReport) -> pd.DataFrame:
+    out = pd.DataFrame({
+        "date": pd.to_datetime(chunk[cols["date"]], errors="coerce").dt.date,
+        "symbol": chunk[cols["symbol"]].astype(str).str.strip().str.upper(),
+        "action": chunk[cols["action"]].astype(str).str.strip().str.upper(),
+        "quantity": pd.to_numeric(chunk[cols["quantity"]], errors="coerce").abs(),
+        "price": pd.to_numeric(
+            chunk[cols["price"]].astype(str).str.replace(r"[$,]", "", regex=True), errors="coerce"
+        ),
+        "fill_id": chunk[cols["fill_id"]].fillna("").astype(str).str.strip() if "fill_id" in cols else "",
+    })
+    ok = (
+        out["date"].notna()
+        & out["quantity"].gt(0)
+        & out["price"].notna()
+        & out["action"].isin([*OPEN_ACTIONS, *CLOSES])
+    )
+    report.skipped_rows += int((~ok).sum())
+    out = out[ok].astype({"quantity": "int64", "price": "float64"})
+    return out.sort_values("date", kind="stable")
+
+
+def _write(trades: List[dict], report: ImportReport) -> None:
+    """Insert new trades (and their tags) in one transaction; skip known external_ids."""
+    if not trades:
+        return
+    known = ids_by_external_id([t["external_id"] for t in trades])
+    new = [t for t in trades if t["external_id"] not in known]
+    report.duplicates += len(trades) - len(new)
+
+    # Closes of lots an earlier import stored as open: shrink/close that row instead.
+    lot_rows = ids_by_external_id(list({t["_lot"] for t in new if t["status"] == "closed"}))
+    with write_batch() as s:
+        for t in new:
+            if t["status"] == "closed" and t["_lot"] in lot_rows:
+                open_entry = s.get(JournalEntry, lot_rows[t["_lot"]])
+                if open_entry is not None and open_entry.status == "open":
+                    open_entry.size -= t["_take"]
+                    if open_entry.size <= 0:
+                        open_entry.external_id = t["external_id"]
+                        open_entry.status, open_entry.exit_price, open_entry.exit_date = "closed", t["exit_price"], t["exit_date"]
+                        open_entry.size = t["_take"]
+                        t["_merged"] = True
+                        report.reopened_closed += 1
+                    s.add(open_entry)
+        s.flush()
+        rows = [{k: v for k, v in t.items() if not k.startswith("_")} for t in new if not t.get("_merged")]
+        insert_entries(s, rows)
+    for row in rows:
+        if row["status"] == "closed":
+            report.closed_trades += 1
+        else:
+            report.open_trades += 1
+
+
+def import_fills_csv(
+    source: Union[str, IO],
+    *,
+    chunksize: int = 100_000,
+    columns: Optional[Dict[str, str]] = None,
+    strategy: str = "imported",
+    tags_csv: str = "#import",
+) -> ImportReport:
+    """
+    Import a broker fill CSV (one row per fill, chronological) into the journal.
+
+    Required columns: date, symbol, action (BTO/STO/STC/BTC), quantity, price;
+    ``fill_id`` is used for dedupe keys when present. Common broker header
+    spellings are recognized, or pass ``columns={"date": "Exec Time", ...}``.
+    """
+    pairer: Optional[_Pairer] = None
+    cols: Optional[Dict[str, str]] = None
+    for raw in pd.read_csv(source, chunksize=chunksize, dtype=str):
+        if pairer is None:
+            cols = _resolve_columns(list(raw.columns), columns)
+            pairer = _Pairer(strategy, tags_csv)
+        pairer.report.rows_read += len(raw)
+        chunk = _normalize(raw, cols, pairer.report)
+        _write(pairer.feed(chunk[["date", "symbol", "action", "quantity", "price", "fill_id"]]), pairer.report)
+    if pairer is None:
+        return ImportReport()
+    _write(pairer.open_rows(), pairer.report)
+    rebuild_trade_stats()
+    return pairer.report
+
+
+def _arrow_schema(pa, cols: List[str]):
+    """Arrow schema from the table definition, so all-null columns in a batch keep their type."""
+    fields = []
+    for name in cols:
+        col_type = JournalEntry.__table__.c[name].type
+        if isinstance(col_type, TypeDecorator):
+            col_type = col_type.impl
+        if isinstance(col_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(col_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(col_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(col_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(col_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def export_journal(
+    destination: Union[str, IO],
+    *,
+    format: str = "parquet",
+    batch_size: int = 50_000,
+    include_notes: bool = True,
+    **filters,
+) -> int:
+    """
+    Stream the journal (newest first, ``query_entries`` filters) to Parquet or
+    Arrow IPC ("arrow") in ``batch_size`` record batches. Returns rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - pyarrow ships with streamlit
+        raise RuntimeError("Journal export needs pyarrow (pip install pyarrow)") from e
+    if format not in ("parquet", "arrow"):
+        raise ValueError(f"format must be 'parquet' or 'arrow', got {format!r}")
+
+    cols = list(dict.fromkeys(["id", "created_at", *SUMMARY_COLUMNS, *(["notes"] if include_notes else [])]))
+    schema = _arrow_schema(pa, cols)
+    writer = None
+    written = 0
+    cursor = None
+    try:
+        while True:
+            page = query_entries(cursor=cursor, limit=batch_size, columns=cols, **filters)
+            if not page.rows:
+                break
+            batch = pa.Table.from_pandas(
+                pd.DataFrame.from_records(page.rows, columns=cols), schema=schema, preserve_index=False
+            )
+            if writer is None:
+                writer = (
+                    pq.ParquetWriter(destination, schema)
+                    if format == "parquet"
+                    else ipc.new_file(destination, schema)
+                )
+            writer.write_table(batch)
+            written += len(page.rows)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
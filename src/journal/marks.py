@@ -0,0 +1,90 @@
+# src/journal/marks.py
+"""
+Mark-to-market of open positions.
+
+Open trades are loaded with one projected query, their distinct symbols are
+priced with one batched, cached quote lookup (``fetchers.latest_quotes``) and
+unrealized P&L is computed for every position at once with the same rules as
+``JournalEntry.realized_pl`` (100x multiplier; BTO gains when the mark rises,
+STO when it falls). The mark is the last price of the journal symbol, so an
+option trade is marked at its premium when it is journaled under its contract
+symbol (e.g. ``SPY250117P00580000``); pass ``quotes`` to supply marks directly.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .analytics import MULTIPLIER
+from .storage import query_entries
+
+_COLUMNS = ["id", "symbol", "strategy", "entry_action", "entry_date", "entry_price", "size"]
+
+
+@dataclass
+class MarkReport:
+    positions: pd.DataFrame        # one row per open trade, with mark and unrealized_pl
+    by_symbol: pd.DataFrame
+    by_strategy: pd.DataFrame
+    unpriced: Dict[str, str] = field(default_factory=dict)  # symbol -> reason
+
+    @property
+    def total(self) -> float:
+        return round(float(self.positions["unrealized_pl"].sum()), 2)
+
+
+def unrealized_pl(positions: pd.DataFrame, marks: Mapping[str, float]) -> pd.DataFrame:
+    """Add ``mark``, ``market_value`` and ``unrealized_pl`` columns (NaN where a symbol has no mark)."""
+    df = positions.copy()
+    df["mark"] = df["symbol"].map(marks).astype("float64")
+    entry = df["entry_price"].to_numpy(dtype="float64")
+    mark = df["mark"].to_numpy()
+    size = df["size"].to_numpy(dtype="float64")
+    sign = np.where((df["entry_action"] == "BTO").to_numpy(), 1.0, -1.0)
+    df["market_value"] = np.round(sign * mark * size * MULTIPLIER, 2)
+    df["unrealized_pl"] = np.round(sign * (mark - entry) * size * MULTIPLIER, 2)
+    return df
+
+
+def _totals(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    g = df.groupby(by, sort=True)
+    return pd.DataFrame({
+        "positions": g["id"].size(),
+        "contracts": g["size"].sum(),
+        "market_value": g["market_value"].sum(min_count=1).round(2),
+        "unrealized_pl": g["unrealized_pl"].sum(min_count=1).round(2),
+    })
+
+
+def mark_to_market(quotes: Optional[Mapping[str, float]] = None, **filters) -> MarkReport:
+    """
+    Unrealized P&L of open trades matching ``query_entries`` filters, with
+    totals by symbol and strategy. Without ``quotes``, marks are fetched for
+    the distinct symbols in one batched lookup.
+    """
+    filters.pop("status", None)
+    page = query_entries(status="open", columns=_COLUMNS, limit=None, **filters)
+    cols = list(dict.fromkeys(["id", "created_at", *_COLUMNS]))
+    positions = pd.DataFrame.from_records(page.rows, columns=cols).drop(columns="created_at")
+
+    unpriced: Dict[str, str] = {}
+    symbols = positions["symbol"].unique().tolist()
+    if quotes is None:
+        from src.data.fetchers import latest_quotes
+
+        marks, errors = latest_quotes(symbols) if symbols else ({}, {})
+        unpriced.update({sym: str(e) for sym, e in errors.items()})
+    else:
+        marks = {k.strip().upper(): float(v) for k, v in quotes.items()}
+    unpriced.update({sym: "no quote" for sym in symbols if sym not in marks and sym not in unpriced})
+
+    df = unrealized_pl(positions, marks)
+    return MarkReport(
+        positions=df,
+        by_symbol=_totals(df, "symbol"),
+        by_strategy=_totals(df, "strategy"),
+        unpriced=unpriced,
+    )
@@ -1,10 +1,27 @@
 from __future__ import annotations
 from datetime import date, datetime
-from typing import List, Optional
-from sqlmodel import SQLModel, Field
+from typing import Iterable, List, Optional
+from sqlmodel import SQLModel, Field, Index
+
+
+def split_tags(values: Iterable[str]) -> List[str]:
+    """Strip, drop empties and de-duplicate (first occurrence wins)."""
+    seen: List[str] = []
+    for v in values:
+        v = v.strip()
+        if v and v not in seen:
+            seen.append(v)
+    return seen
+
 
 class JournalEntry(SQLModel, table=True):
     __tablename__ = "journal_entries"
+    # (..., created_at, id) composites serve keyset pagination, alone or behind a filter
+    __table_args__ = (
+        Index("ix_journal_entries_created_id", "created_at", "id"),
+        Index("ix_journal_entries_status_created_id", "status", "created_at", "id"),
+        Index("ix_journal_entries_symbol_created_id", "symbol", "created_at", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)    
     
@@ -24,8 +41,8 @@ class JournalEntry(SQLModel, table=True):
     # core trade details
     symbol: str
     direction: str
-    strategy: str
-    entry_date: date = Field(default_factory=date.today)
+    strategy: str = Field(index=True)
+    entry_date: date = Field(default_factory=date.today, index=True)
     entry_price: float = 0.0
     size: int = 1
     notes: str = ""
@@ -35,13 +52,18 @@ class JournalEntry(SQLModel, table=True):
     # 'BTO' (debit) or 'STO' (credit)
     entry_action: str = "BTO"  # allowed: "BTO" | "STO"
 
+    # source key for bulk-imported trades (dedupe on re-import); None for manual entries
+    external_id: Optional[str] = Field(default=None, unique=True, index=True)
+    # one per form submission from the UI: re-submitting the same token returns the saved entry
+    client_token: Optional[str] = Field(default=None, unique=True, index=True)
+
     @property
     def tags(self) -> List[str]:
-        return [t for t in self.tags_csv.split(",") if t] if self.tags_csv else []
+        return split_tags(self.tags_csv.split(",")) if self.tags_csv else []
 
     @tags.setter
     def tags(self, values: List[str]) -> None:
-        self.tags_csv = ",".join(v.strip() for v in values if v.strip())
+        self.tags_csv = ",".join(split_tags(values))
 
     def expected_exit_action(self) -> str:
     
@@ -69,8 +91,80 @@ class JournalEntry(SQLModel, table=True):
             pnl = (self.entry_price - self.exit_price) * self.size * multiplier
         return round(pnl, 2)
     
+    @property
+    def initial_risk(self) -> Optional[float]:
+        """Dollars at risk at entry: distance to stop_price, or the premium paid
+        for a BTO without a stop (its max loss). None for an STO without a stop."""
+        multiplier = 100
+        if self.stop_price is not None:
+            per_contract = abs(self.entry_price - self.stop_price)
+        elif self.entry_action == "BTO":
+            per_contract = self.entry_price
+        else:
+            return None
+        risk = per_contract * self.size * multiplier
+        return risk if risk > 0 else None
+
     @property
     def r_multiple(self) -> Optional[float]:
-        # TODO: define actual implementation
-        return None
+        """Realized P&L in units of initial risk."""
+        pl, risk = self.realized_pl, self.initial_risk
+        if pl is None or risk is None:
+            return None
+        return round(pl / risk, 2)
+
+
+class JournalTag(SQLModel, table=True):
+    """One row per (entry, tag); the indexed side of ``JournalEntry.tags_csv``."""
+    __tablename__ = "journal_entry_tags"
+    __table_args__ = (Index("ix_journal_entry_tags_tag_entry", "tag", "entry_id"),)
+
+    entry_id: int = Field(foreign_key="journal_entries.id", primary_key=True)
+    tag: str = Field(primary_key=True)
+
+
+class TradeStat(SQLModel, table=True):
+    """
+    Running aggregate of closed trades for one (dimension, key), e.g.
+    ("strategy", "CSP") or ("month", "2025-01"); ("all", "") is the whole journal.
+    """
+    __tablename__ = "journal_trade_stats"
+
+    dimension: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    count: int = 0
+    wins: int = 0
+    pl_sum: float = 0.0
+    holding_days_sum: int = 0
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        return self.wins / self.count if self.count else None
+
+    @property
+    def avg_holding_days(self) -> Optional[float]:
+        return self.holding_days_sum / self.count if self.count else None
+
+
+class VolSnapshot(SQLModel, table=True):
+    """
+    Volatility context when an entry was opened (one row per entry), so trades
+    can be filtered by vol regime in SQL. ``hv`` is the window/estimator the
+    user compared against; ``iv_hv_ratio`` = iv / hv.
+    """
+    __tablename__ = "journal_vol_snapshots"
+    # range scans on the ratio return entry ids straight from the index
+    __table_args__ = (Index("ix_journal_vol_snapshots_ratio_entry", "iv_hv_ratio", "entry_id"),)
 
+    entry_id: Optional[int] = Field(default=None, foreign_key="journal_entries.id", primary_key=True)
+    symbol: str = ""
+    captured_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    underlying_price: Optional[float] = None
+    iv: Optional[float] = None          # decimal, 0.25 = 25%
+    hv: Optional[float] = None
+    hv_window: Optional[int] = None
+    hv_estimator: Optional[str] = None
+    hv10: Optional[float] = None
+    hv20: Optional[float] = None
+    hv30: Optional[float] = None
+    iv_hv_ratio: Optional[float] = None
@@ -0,0 +1,136 @@
+# src/journal/stats.py
+"""
+Closed-trade aggregates maintained alongside the journal.
+
+``apply_entry`` is called by the storage write functions inside their own
+session, so stats commit (or roll back) together with the trade. Deltas are
+applied as in-database increments (an upsert where the backend has one), so
+concurrent writers never overwrite each other's counts. ``rebuild``
+recomputes everything with one INSERT ... SELECT aggregate.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, case, cast, delete, func, insert, literal, tuple_, union_all, update
+from sqlmodel import Session, select
+
+from .models import JournalEntry, JournalTag, TradeStat
+
+DIMENSIONS = ("all", "strategy", "symbol", "tag", "entry_action", "month")
+
+
+def _keys(entry: JournalEntry) -> List[Tuple[str, str]]:
+    keys = [
+        ("all", ""),
+        ("strategy", entry.strategy or ""),
+        ("symbol", entry.symbol or ""),
+        ("entry_action", entry.entry_action or ""),
+        ("month", entry.exit_date.strftime("%Y-%m") if entry.exit_date else ""),
+    ]
+    return keys + [("tag", t) for t in entry.tags]
+
+
+def snapshot(entry: JournalEntry) -> JournalEntry:
+    """Detached copy of an entry's current values, taken before it is modified."""
+    return JournalEntry(**entry.model_dump())
+
+
+def _upsert(dialect: str):
+    """Dialect ``insert`` with ON CONFLICT support, or None to fall back to UPDATE/INSERT."""
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def apply_entry(s: Session, entry: Optional[JournalEntry], sign: int) -> None:
+    """Add (sign=+1) or remove (sign=-1) one entry's contribution; open trades contribute nothing."""
+    if entry is None:
+        return
+    pl = entry.realized_pl
+    if pl is None:
+        return
+    delta = {
+        "count": sign,
+        "wins": sign if pl > 0 else 0,
+        "pl_sum": sign * pl,
+        "holding_days_sum": sign * (entry.holding_days or 0),
+    }
+    keys = list(dict.fromkeys(_keys(entry)))
+    t = TradeStat.__table__
+    bumped = {
+        "count": t.c["count"] + delta["count"],
+        "wins": t.c["wins"] + delta["wins"],
+        "pl_sum": func.round(t.c["pl_sum"] + delta["pl_sum"], 2),
+        "holding_days_sum": t.c["holding_days_sum"] + delta["holding_days_sum"],
+    }
+    dialect_insert = _upsert(s.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(t).values([{"dimension": d, "key": k, **delta} for d, k in keys])
+        s.exec(stmt.on_conflict_do_update(index_elements=["dimension", "key"], set_=bumped))
+    else:
+        for d, k in keys:
+            res = s.exec(update(t).where(t.c["dimension"] == d, t.c["key"] == k).values(bumped))
+            if res.rowcount == 0:
+                s.exec(insert(t).values(dimension=d, key=k, **delta))
+    s.exec(
+        delete(t).where(tuple_(t.c["dimension"], t.c["key"]).in_(keys), t.c["count"] <= 0)
+    )
+
+
+def _aggregate(dialect: str):
+    """SELECT (dimension, key, count, wins, pl_sum, holding_days_sum) over every dimension."""
+    E = JournalEntry
+    pl = func.round(
+        case((E.entry_action == "BTO", E.exit_price - E.entry_price), else_=E.entry_price - E.exit_price)
+        * E.size * 100,
+        2,
+    )
+    if dialect == "sqlite":
+        days = cast(func.julianday(E.exit_date) - func.julianday(E.entry_date), Integer)
+        month = func.strftime("%Y-%m", E.exit_date)
+    else:
+        days = E.exit_date - E.entry_date
+        month = func.to_char(E.exit_date, "YYYY-MM")
+    measures = [
+        func.count(),
+        func.sum(case((pl > 0, 1), else_=0)),
+        func.sum(pl),
+        func.sum(days),
+    ]
+    closed = (E.status == "closed") & E.exit_price.is_not(None)
+
+    def by(dimension: str, key, join_tags: bool = False):
+        q = select(literal(dimension), key, *measures).select_from(E)
+        if join_tags:
+            q = q.join(JournalTag, JournalTag.entry_id == E.id)
+        return q.where(closed).group_by(key)
+
+    return union_all(
+        select(literal("all"), literal(""), *measures).select_from(E).where(closed),
+        by("strategy", E.strategy),
+        by("symbol", E.symbol),
+        by("entry_action", E.entry_action),
+        by("month", month),
+        by("tag", JournalTag.tag, join_tags=True),
+    )
+
+
+def rebuild(s: Session) -> None:
+    """Replace all aggregates with a from-scratch recomputation (one SQL aggregate)."""
+    s.exec(delete(TradeStat))
+    cols = ["dimension", "key", "count", "wins", "pl_sum", "holding_days_sum"]
+    agg = _aggregate(s.get_bind().dialect.name).subquery()
+    agg_cols = list(agg.c)
+    s.exec(insert(TradeStat).from_select(cols, select(*agg_cols).where(agg_cols[2] > 0)))
+
+
+def read(s: Session, dimension: str = "all") -> List[TradeStat]:
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown stats dimension: {dimension}")
+    q = select(TradeStat).where(TradeStat.dimension == dimension).order_by(TradeStat.key)
+    return list(s.exec(q).all())
@@ -1,33 +1,263 @@
-from typing import List, Optional
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from datetime import date, datetime
+from sqlalchemy import and_, column, delete, event, func, insert, inspect, or_, table as sql_table, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, create_engine, Session, select
 
-from .models import JournalEntry
+from . import stats
+from .models import JournalEntry, JournalTag, TradeStat, VolSnapshot, split_tags
+from src.instrumentation import instrument_engine, timed
 from src.settings import Settings
 from src.journal.models import JournalEntry
 
-_engine = None
+_engine = None       # writes (and schema setup)
+_read_engine = None  # read-only queries; same engine unless the backend benefits from a split
+_engine_url = None
 _db_initialized = False
+_fts_enabled = False  # SQLite with FTS5: search_entries uses the full-text index
 
+# Bumped after every committed write in this process; readers cache on it.
+_write_generation = 0
+_generation_lock = threading.Lock()
+_init_lock = threading.Lock()  # one engine build / schema setup per process, however many sessions start at once
 
+# SQLite: one writer connection (SQLite serializes writers anyway) and a reader
+# pool; in WAL mode readers never wait on a write in progress.
+SQLITE_READ_POOL = 8
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+SERVER_POOL_SIZE = 5
+SERVER_MAX_OVERFLOW = 10
+
+
+def _sqlite_pragmas(read_only: bool):
+    def on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cur.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+        if read_only:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+    return on_connect
+
+
+def _build_engines(db_url: str) -> Tuple[Engine, Engine]:
+    """(write engine, read engine) for ``db_url``, with pooling sized per backend."""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite":
+        engine = create_engine(
+            db_url, pool_size=SERVER_POOL_SIZE, max_overflow=SERVER_MAX_OVERFLOW, pool_pre_ping=True
+        )
+        instrument_engine(engine)
+        return engine, engine
+
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if url.database in (None, "", ":memory:"):
+        # one shared in-memory database: a single connection serves everything
+        engine = create_engine(db_url, connect_args=connect_args, poolclass=StaticPool)
+        instrument_engine(engine)
+        return engine, engine
+
+    write = create_engine(db_url, connect_args=connect_args, pool_size=1, max_overflow=0)
+    read = create_engine(db_url, connect_args=connect_args, pool_size=SQLITE_READ_POOL, max_overflow=SQLITE_READ_POOL)
+    event.listen(write, "connect", _sqlite_pragmas(read_only=False))
+    event.listen(read, "connect", _sqlite_pragmas(read_only=True))
+    instrument_engine(write)
+    instrument_engine(read)
+    return write, read
+
+
+@timed("storage.init_db")
 def init_db(settings: Optional[Settings] = None) -> None:
-    """Initialize DB engine and create tables if they do not exist."""
-    global _engine, _db_initialized
-    if _engine is None:
-        # SQLite file in project root; adjust path as needed
-        _engine = create_engine("sqlite:///ai_trader.sqlite", echo=False)
+    """
+    Build the engines from ``settings.db_url`` (env when omitted) and create tables if they do not exist.
 
-    if not _db_initialized:
-        SQLModel.metadata.create_all(_engine)
-        _db_initialized = True
+    Runs once per process: later calls return without locking unless ``settings``
+    points at a different database.
+    """
+    global _engine, _read_engine, _engine_url, _db_initialized, _fts_enabled
+    if _db_initialized and (settings is None or settings.db_url == _engine_url):
+        return
+    with _init_lock:
+        if settings is not None and _engine is not None and settings.db_url != _engine_url:
+            dispose_db()
+        if _engine is None:
+            settings = settings or Settings.from_env()
+            _engine, _read_engine = _build_engines(settings.db_url)
+            _engine_url = settings.db_url
+            _db_initialized = False
+            _bump_generation()
+
+        if not _db_initialized:
+            SQLModel.metadata.create_all(_engine)
+            _migrate_columns()
+            _migrate_indexes()
+            _migrate_tags()
+            _migrate_stats()
+            _migrate_vol_notes()
+            _fts_enabled = _migrate_fts()
+            _db_initialized = True
+
+def dispose_db() -> None:
+    """Close every pooled connection and forget the engines (next use re-initializes)."""
+    global _engine, _read_engine, _engine_url, _db_initialized
+    for engine in {_engine, _read_engine} - {None}:
+        engine.dispose()
+    _engine = _read_engine = _engine_url = None
+    _db_initialized = False
+
+def write_generation() -> int:
+    """Changes after every committed journal write (or engine switch) in this process."""
+    return _write_generation
+
+def _bump_generation() -> None:
+    global _write_generation
+    with _generation_lock:
+        _write_generation += 1
+
+def _migrate_columns() -> None:
+    """Add nullable columns declared since a table was created (SQLite has no create_all for them)."""
+    with _engine.begin() as conn:
+        insp = inspect(conn)
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in existing and col.nullable:
+                    col_type = col.type.compile(dialect=_engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{col.name}" {col_type}'))
+
+def _migrate_indexes() -> None:
+    """create_all skips existing tables; add any index declared since the table was created."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=_engine, checkfirst=True)
+
+def _migrate_tags() -> None:
+    """Backfill journal_entry_tags from tags_csv for rows written before the tag table existed."""
+    with Session(_engine) as s:
+        tagged = select(JournalTag.entry_id)
+        q = select(JournalEntry.id, JournalEntry.tags_csv).where(
+            JournalEntry.tags_csv != "", JournalEntry.id.not_in(tagged)
+        )
+        rows = [
+            {"entry_id": entry_id, "tag": tag}
+            for entry_id, tags_csv in s.exec(q)
+            for tag in split_tags(tags_csv.split(","))
+        ]
+        if rows:
+            s.exec(insert(JournalTag), params=rows)
+            s.commit()
+
+def _migrate_stats() -> None:
+    """Build trade stats once for databases that have closed trades but no aggregates yet."""
+    with Session(_engine) as s:
+        if s.exec(select(TradeStat.key).limit(1)).first() is not None:
+            return
+        if s.exec(select(JournalEntry.id).where(JournalEntry.status == "closed").limit(1)).first() is None:
+            return
+        stats.rebuild(s)
+        s.commit()
+
+# the context line the Add entry form used to prepend to notes
+_VOL_LINE = re.compile(r"\[vol\] IV\(user\)=(?P<iv>[\d.]+)% \| HV(?P<window>\d+)=(?P<hv>[\d.]+)%")
+
+def _migrate_vol_notes() -> None:
+    """Backfill vol snapshots from ``[vol] IV(user)=...`` note lines; the notes are left as they are."""
+    with Session(_engine) as s:
+        snapped = select(VolSnapshot.entry_id)
+        q = select(JournalEntry.id, JournalEntry.symbol, JournalEntry.created_at, JournalEntry.notes).where(
+            JournalEntry.notes.like("%[vol] IV(user)=%"), JournalEntry.id.not_in(snapped)
+        )
+        rows = []
+        for entry_id, symbol, created_at, notes in s.exec(q):
+            m = _VOL_LINE.search(notes or "")
+            if m is None:
+                continue
+            window = int(m["window"])
+            snap = VolSnapshot(symbol=symbol, captured_at=created_at, iv=float(m["iv"]) / 100,
+                               hv=float(m["hv"]) / 100, hv_window=window)
+            if window in (10, 20, 30):
+                setattr(snap, f"hv{window}", snap.hv)
+            rows.append(_vol_row(entry_id, snap))
+        if rows:
+            s.exec(insert(VolSnapshot), params=rows)
+            s.commit()
+
+# External-content FTS5 index over the searchable text; triggers keep it in
+# step with every write path (ORM, bulk inserts, raw SQL).
+_FTS_TABLE = "journal_entries_fts"
+_FTS_COLUMNS = ("symbol", "strategy", "notes")
+_FTS_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE {_FTS_TABLE} USING fts5(
+        symbol, strategy, notes, content='journal_entries', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON journal_entries BEGIN
+        INSERT INTO {_FTS_TABLE}(rowid, symbol, strategy, notes) VALUES (new.id, new.symbol, new.strategy, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON journal_entries BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, symbol, strategy, notes)
+        VALUES ('delete', old.id, old.symbol, old.strategy, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF symbol, strategy, notes ON journal_entries BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, symbol, strategy, notes)
+        VALUES ('delete', old.id, old.symbol, old.strategy, old.notes);
+        INSERT INTO {_FTS_TABLE}(rowid, symbol, strategy, notes) VALUES (new.id, new.symbol, new.strategy, new.notes);
+    END""",
+]
+
+def _migrate_fts() -> bool:
+    """Create the FTS5 index and its triggers (indexing existing rows once); False where unavailable."""
+    if _engine.dialect.name != "sqlite":
+        return False
+    with _engine.begin() as conn:
+        if inspect(conn).has_table(_FTS_TABLE):
+            return True
+        try:
+            conn.execute(text(_FTS_SCHEMA[0]))
+        except OperationalError:
+            return False  # SQLite built without FTS5
+        for ddl in _FTS_SCHEMA[1:]:
+            conn.execute(text(ddl))
+        conn.execute(text(f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+def _vol_row(entry_id: int, vol: VolSnapshot) -> dict:
+    """Column values of a snapshot for ``entry_id``, with the IV/HV ratio filled in."""
+    row = vol.model_dump()
+    row["entry_id"] = entry_id
+    if row["iv_hv_ratio"] is None and row["iv"] is not None and row["hv"]:
+        row["iv_hv_ratio"] = round(row["iv"] / row["hv"], 4)
+    return row
+
+def _sync_tags(s: Session, entry: JournalEntry) -> None:
+    """Rewrite the tag rows of one entry from its tags_csv (same transaction as the entry)."""
+    s.exec(delete(JournalTag).where(JournalTag.entry_id == entry.id))
+    tags = entry.tags
+    if tags:
+        s.exec(insert(JournalTag), params=[{"entry_id": entry.id, "tag": t} for t in tags])
 
 def _session() -> Session:
-    if _engine is None:
+    if not _db_initialized:
         init_db()
     return Session(_engine)
 
+def _read_session() -> Session:
+    """Session on the read-only pool; use for queries that never write."""
+    if not _db_initialized:
+        init_db()
+    return Session(_read_engine)
+
 from datetime import date  # ensure this import exists
 
+@timed("storage.create_entry", rows=True)
 def create_entry(
     *,
     symbol: str,
@@ -39,10 +269,19 @@ def create_entry(
     direction: str = "neutral",   # metadata
     notes: Optional[str] = None,
     tags_csv: Optional[str] = None,
+    stop_price: Optional[float] = None,
+    target_price: Optional[float] = None,
+    client_token: Optional[str] = None,
+    vol: Optional[VolSnapshot] = None,
 ) -> JournalEntry:
+    """
+    Insert an open trade, with its entry-time ``vol`` snapshot if given. With
+    ``client_token`` (one per form submission) the call is idempotent: a token
+    that was already saved returns that entry.
+    """
     resolved_date = entry_date or date.today()
     normalized_symbol = (symbol or "").strip().upper()
-    normalized_tags = (tags_csv or "").strip()
+    normalized_tags = ",".join(split_tags((tags_csv or "").split(",")))
 
     entry = JournalEntry(
         symbol=normalized_symbol,
@@ -54,40 +293,105 @@ def create_entry(
         direction=direction,
         notes=notes,
         tags_csv=normalized_tags,
+        stop_price=stop_price,
+        target_price=target_price,
         status="open",
+        client_token=client_token,
     )
 
     with _session() as s:
-        s.add(entry)
+        if client_token:
+            saved = _by_client_token(s, client_token)
+            if saved is not None:
+                return saved
+        try:
+            s.add(entry)
+            s.flush()
+        except IntegrityError:
+            # the same token committed from another connection in the meantime
+            s.rollback()
+            saved = _by_client_token(s, client_token) if client_token else None
+            if saved is None:
+                raise
+            return saved
+        _sync_tags(s, entry)
+        if vol is not None:
+            s.exec(insert(VolSnapshot), params=[_vol_row(entry.id, vol)])
         s.commit()
         s.refresh(entry)
-        return entry
+    _bump_generation()
+    return entry
 
+def _by_client_token(s: Session, client_token: str) -> Optional[JournalEntry]:
+    return s.exec(select(JournalEntry).where(JournalEntry.client_token == client_token)).first()
 
-def list_entries(tag: Optional[str] = None) -> List[JournalEntry]:
-    with _session() as s:
+@timed("storage.get_vol_snapshot", rows=True)
+def get_vol_snapshot(entry_id: int) -> Optional[VolSnapshot]:
+    with _read_session() as s:
+        return s.get(VolSnapshot, entry_id)
+
+
+def _tag_filter(tags: List[str], match: str = "any"):
+    """WHERE clause on JournalEntry.id for entries carrying any/all of ``tags``."""
+    q = select(JournalTag.entry_id).where(JournalTag.tag.in_(tags))
+    if match == "all":
+        q = q.group_by(JournalTag.entry_id).having(func.count(JournalTag.tag) == len(tags))
+    elif match != "any":
+        raise ValueError(f"match must be 'any' or 'all', got {match!r}")
+    return JournalEntry.id.in_(q)
+
+
+def _vol_filter(iv_hv_min: Optional[float] = None, iv_hv_max: Optional[float] = None):
+    """WHERE clause on JournalEntry.id for entries opened with iv_hv_min < IV/HV < iv_hv_max."""
+    q = select(VolSnapshot.entry_id).where(VolSnapshot.iv_hv_ratio.is_not(None))
+    if iv_hv_min is not None:
+        q = q.where(VolSnapshot.iv_hv_ratio > iv_hv_min)
+    if iv_hv_max is not None:
+        q = q.where(VolSnapshot.iv_hv_ratio < iv_hv_max)
+    return JournalEntry.id.in_(q)
+
+
+@timed("storage.list_entries", rows=True)
+def list_entries(
+    tag: Optional[str] = None,
+    tags: Optional[Iterable[str]] = None,
+    match: str = "any",
+) -> List[JournalEntry]:
+    """All entries, newest first; ``tag``/``tags`` filter in SQL (``match`` = "any" | "all")."""
+    wanted = split_tags([*([tag] if tag else []), *(tags or [])])
+    with _read_session() as s:
         stmt = select(JournalEntry).order_by(JournalEntry.created_at.desc())
-        rows = list(s.exec(stmt))
-    if tag:
-        return [e for e in rows if tag in e.tags]
-    return rows
+        if wanted:
+            stmt = stmt.where(_tag_filter(wanted, match))
+        return list(s.exec(stmt))
 
+@timed("storage.update_entry", rows=True)
 def update_entry(entry_id: int, **patch) -> JournalEntry:
     with _session() as s:
         obj = s.get(JournalEntry, entry_id)
         if obj is None:
             raise ValueError(f"Journal entry {entry_id} not found")
+        before = stats.snapshot(obj)
+        if "tags_csv" in patch:
+            patch["tags_csv"] = ",".join(split_tags((patch["tags_csv"] or "").split(",")))
         for k, v in patch.items():
             setattr(obj, k, v)
         s.add(obj)
+        if "tags" in patch or "tags_csv" in patch:
+            _sync_tags(s, obj)
+        stats.apply_entry(s, before, -1)
+        stats.apply_entry(s, obj, +1)
         s.commit()
         s.refresh(obj)
-        return obj
+    _bump_generation()
+    return obj
 
+@timed("storage.get_entry", rows=True)
 def get_entry(entry_id: int) -> Optional[JournalEntry]:
-    with _session() as s:
+    with _read_session() as s:
         return s.get(JournalEntry, entry_id)
 
+@timed("storage.close_entry", rows=True)
 def close_entry(entry_id: int, exit_price: float, exit_date: Optional[date] = None) -> JournalEntry:
     if exit_date is None:
         exit_date = date.today()
@@ -95,23 +399,235 @@ def close_entry(entry_id: int, exit_price: float, exit_date: Optional[date] = No
         j = s.get(JournalEntry, entry_id)
         if not j:
             raise ValueError(f"Entry {entry_id} not found")
+        before = stats.snapshot(j)
         j.exit_price = float(exit_price)
         j.exit_date = exit_date
         j.status = "closed"
         s.add(j)
+        stats.apply_entry(s, before, -1)
+        stats.apply_entry(s, j, +1)
         s.commit()
         s.refresh(j)
-        return j
+    _bump_generation()
+    return j
 
+@timed("storage.delete_entry")
 def delete_entry(entry_id: int) -> None:
     # hard delete for now (simple dev DB). If you prefer soft delete, add a boolean column.
     with _session() as s:
         j = s.get(JournalEntry, entry_id)
         if j:
+            stats.apply_entry(s, j, -1)
+            s.exec(delete(JournalTag).where(JournalTag.entry_id == entry_id))
+            s.exec(delete(VolSnapshot).where(VolSnapshot.entry_id == entry_id))
             s.delete(j)
             s.commit()
+    _bump_generation()
 
+@timed("storage.list_entries_by_status", rows=True)
 def list_entries_by_status(status: str) -> List[JournalEntry]:
+    with _read_session() as s:
+        q = (
+            select(JournalEntry)
+            .where(JournalEntry.status == status)
+            .order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+        )
+        return list(s.exec(q).all())
+
+
+# Bulk writers (the importer) batch many rows per transaction.
+_SQL_BATCH = 500  # keep IN (...) lists under SQLite's variable limit
+
+
+@timed("storage.ids_by_external_id", rows=True)
+def ids_by_external_id(external_ids: Sequence[str]) -> Dict[str, int]:
+    """external_id -> id for the given keys already in the journal."""
+    found: Dict[str, int] = {}
+    with _read_session() as s:
+        for i in range(0, len(external_ids), _SQL_BATCH):
+            chunk = external_ids[i : i + _SQL_BATCH]
+            q = select(JournalEntry.external_id, JournalEntry.id).where(JournalEntry.external_id.in_(chunk))
+            found.update({ext: entry_id for ext, entry_id in s.exec(q)})
+    return found
+
+@contextmanager
+def write_batch() -> Iterator[Session]:
+    """Write session for a multi-statement batch; commits on success, rolls back on error."""
+    with _session() as s:
+        yield s
+        s.commit()
+    _bump_generation()
+
+@timed("storage.insert_entries", rows=True)
+def insert_entries(s: Session, rows: List[dict]) -> List[int]:
+    """Insert entry rows (column -> value dicts) and their tag rows in ``s``; returns the new ids in order."""
+    if not rows:
+        return []
+    # Core insert on the session's connection: the ORM bulk path with ordered RETURNING
+    # falls back to one statement per row and re-splices the results (quadratic)
+    entries = JournalEntry.__table__
+    stmt = insert(entries).returning(entries.c.id, sort_by_parameter_order=True)
+    ids = list(s.connection().execute(stmt, rows).scalars())
+    tag_rows = [
+        {"entry_id": entry_id, "tag": tag}
+        for entry_id, row in zip(ids, rows)
+        for tag in split_tags((row.get("tags_csv") or "").split(","))
+    ]
+    if tag_rows:
+        s.exec(insert(JournalTag), params=tag_rows)
+    return ids
+
+
+@timed("storage.get_trade_stats", rows=True)
+def get_trade_stats(dimension: str = "all") -> List[TradeStat]:
+    """Closed-trade aggregates for one dimension (see ``stats.DIMENSIONS``), by key."""
+    with _read_session() as s:
+        return stats.read(s, dimension)
+
+@timed("storage.overall_stats", rows=True)
+def overall_stats() -> TradeStat:
+    """Whole-journal KPIs: a single primary-key lookup."""
+    with _read_session() as s:
+        return s.get(TradeStat, ("all", "")) or TradeStat(dimension="all", key="")
+
+@timed("storage.rebuild_trade_stats")
+def rebuild_trade_stats() -> None:
     with _session() as s:
-        q = select(JournalEntry).where(JournalEntry.status == status)
-        return list(s.exec(q).all())
\ No newline at end of file
+        stats.rebuild(s)
+        s.commit()
+    _bump_generation()
+
+
+# Everything but the free-text notes: what list/table views need.
+SUMMARY_COLUMNS = tuple(c for c in JournalEntry.__table__.columns.keys() if c != "notes")
+
+Cursor = Tuple[datetime, int]  # (created_at, id) of the last row on a page
+
+
+@dataclass
+class Page:
+    rows: List[Any]
+    next_cursor: Optional[Cursor] = None
+
+
+@timed("storage.query_entries", rows=True)
+def query_entries(
+    *,
+    status: Optional[str] = None,
+    symbol: Optional[str] = None,
+    strategy: Optional[str] = None,
+    entry_action: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tags: Optional[Iterable[str]] = None,
+    match: str = "any",
+    iv_hv_min: Optional[float] = None,
+    iv_hv_max: Optional[float] = None,
+    cursor: Optional[Cursor] = None,
+    limit: Optional[int] = 50,
+    columns: Optional[Sequence[str]] = None,
+) -> Page:
+    """
+    One page of entries, newest first, keyset-paginated on (created_at, id).
+
+    Filters are pushed into SQL (``date_from``/``date_to`` bound ``entry_date``,
+    inclusive; ``iv_hv_min``/``iv_hv_max`` bound the entry-time IV/HV ratio,
+    exclusive, and drop entries without a vol snapshot). Pass the returned ``next_cursor`` to get the following page; it is
+    None on the last one. With ``columns`` (e.g. ``SUMMARY_COLUMNS``) rows are
+    lightweight result rows with just those attributes instead of full
+    ``JournalEntry`` objects; ``id`` and ``created_at`` are always included.
+    ``limit=None`` returns every matching row.
+    """
+    if columns:
+        cols = list(dict.fromkeys(["id", "created_at", *columns]))
+        stmt = select(*[getattr(JournalEntry, c) for c in cols])
+    else:
+        stmt = select(JournalEntry)
+
+    if status:
+        stmt = stmt.where(JournalEntry.status == status)
+    if symbol:
+        stmt = stmt.where(JournalEntry.symbol == symbol.strip().upper())
+    if strategy:
+        stmt = stmt.where(JournalEntry.strategy == strategy)
+    if entry_action:
+        stmt = stmt.where(JournalEntry.entry_action == entry_action)
+    if date_from:
+        stmt = stmt.where(JournalEntry.entry_date >= date_from)
+    if date_to:
+        stmt = stmt.where(JournalEntry.entry_date <= date_to)
+    wanted = split_tags(tags or [])
+    if wanted:
+        stmt = stmt.where(_tag_filter(wanted, match))
+    if iv_hv_min is not None or iv_hv_max is not None:
+        stmt = stmt.where(_vol_filter(iv_hv_min, iv_hv_max))
+    if cursor is not None:
+        created_at, entry_id = cursor
+        stmt = stmt.where(
+            or_(
+                JournalEntry.created_at < created_at,
+                and_(JournalEntry.created_at == created_at, JournalEntry.id < entry_id),
+            )
+        )
+    stmt = stmt.order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    with _read_session() as s:
+        rows = list(s.exec(stmt).all())
+    if limit is None or len(rows) <= limit:
+        return Page(rows=rows)
+    rows = rows[:limit]
+    return Page(rows=rows, next_cursor=(rows[-1].created_at, rows[-1].id))
+
+
+def _fts_query(q: str) -> str:
+    """User text as an FTS5 query: every word must match, as a prefix; quotes neutralize operators."""
+    words = re.findall(r"\w+", q)
+    return " ".join('"' + w + '"*' for w in words)
+
+
+@timed("storage.search_entries", rows=True)
+def search_entries(
+    q: str,
+    *,
+    status: Optional[str] = None,
+    limit: Optional[int] = 50,
+    columns: Optional[Sequence[str]] = None,
+) -> List[Any]:
+    """
+    Entries whose symbol, strategy or notes contain every word of ``q`` (as a
+    prefix, so "earn" finds "earnings"), best match first.
+
+    On SQLite this is an FTS5 index lookup ranked by bm25; other backends fall
+    back to case-insensitive LIKE on each column, newest first. ``columns``
+    works as in ``query_entries``.
+    """
+    if not _db_initialized:
+        init_db()
+    words = re.findall(r"\w+", q or "")
+    if not words:
+        return []
+    if columns:
+        cols = list(dict.fromkeys(["id", "created_at", *columns]))
+        stmt = select(*[getattr(JournalEntry, c) for c in cols])
+    else:
+        stmt = select(JournalEntry)
+
+    if _fts_enabled:
+        fts = sql_table(_FTS_TABLE, column("rowid"), column("rank"))
+        stmt = (
+            stmt.join(fts, fts.c.rowid == JournalEntry.id)
+            .where(text(f"{_FTS_TABLE} MATCH :match").bindparams(match=_fts_query(q)))
+            .order_by(fts.c.rank, JournalEntry.id.desc())
+        )
+    else:
+        for w in words:
+            stmt = stmt.where(or_(*[getattr(JournalEntry, c).ilike(f"%{w}%") for c in _FTS_COLUMNS]))
+        stmt = stmt.order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+    if status:
+        stmt = stmt.where(JournalEntry.status == status)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    with _read_session() as s:
+        return list(s.exec(stmt).all())
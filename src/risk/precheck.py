@@ -0,0 +1,244 @@
+# src/risk/precheck.py
+"""
+Go/No-Go precheck over a watchlist.
+
+``scan`` runs the three stages for every symbol and yields one ``Verdict``
+per symbol as soon as it is ready:
+
+- loading: daily bars in ``BATCH_SIZE`` chunks through ``fetch_many`` on a
+  thread pool (batched, cached, rate limited); optional nearest-expiry chain
+  summaries on the same pool
+- numerics: HV and rule evaluation (``evaluate_many``), a pure function of
+  plain arrays, on a process pool once the list is ``PROCESS_THRESHOLD``
+  names or more, inline otherwise
+- verdicts stream out in completion order, not watchlist order
+
+Rules flag low liquidity (dollar volume, chain open interest), extreme IV
+(absolute and against HV), unusual option spreads and unstable realized vol.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.cache import PriceCache
+from src.data.fetchers import BATCH_SIZE, PriceRequest, fetch_many
+from src.data.vol import realized_vol
+
+GO, CAUTION, NO_GO, ERROR = "GO", "CAUTION", "NO-GO", "ERROR"
+# lists this long pay for process start-up; shorter ones evaluate inline
+PROCESS_THRESHOLD = 100
+
+_BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+@dataclass
+class PrecheckRules:
+    hv_window: int = 20
+    min_bars: int = 40                 # fewer daily bars: NO-GO
+    min_dollar_volume: float = 20e6    # median close x volume over hv_window
+    max_iv: float = 1.0                # IV above this: NO-GO
+    iv_hv_high: float = 1.5            # IV / HV above this: CAUTION (rich)
+    iv_hv_low: float = 0.67            # IV / HV below this: CAUTION (cheap)
+    max_hv: float = 0.8
+    hv_spike: float = 1.5              # HV10 / HV60 above this: CAUTION
+    max_gap: float = 0.08              # largest |open / prev close - 1| in hv_window
+    # chain checks (nearest expiration, strikes within ``moneyness`` of spot)
+    moneyness: float = 0.05
+    max_spread_pct: float = 0.15       # median near-the-money (ask - bid) / mid
+    min_open_interest: float = 500     # summed near-the-money open interest
+
+
+@dataclass
+class Verdict:
+    symbol: str
+    status: str                        # GO / CAUTION / NO-GO / ERROR
+    reasons: List[str] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    def row(self) -> dict:
+        """Flat record for tables: symbol, status, reasons text, then metrics."""
+        return {"symbol": self.symbol, "status": self.status, "reasons": "; ".join(self.reasons), **self.metrics}
+
+
+def _bars(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Plain float arrays (cheap to pickle) from a fetched OHLCV frame."""
+    return {c.lower(): df[c].to_numpy(dtype="float64") for c in _BAR_COLUMNS if c in df.columns}
+
+
+def evaluate(
+    symbol: str,
+    bars: Dict[str, np.ndarray],
+    iv: Optional[float] = None,
+    chain: Optional[Dict[str, float]] = None,
+    rules: Optional[PrecheckRules] = None,
+) -> Verdict:
+    """Rules for one symbol from its daily bars, an optional IV and chain summary."""
+    rules = rules or PrecheckRules()
+    close = bars.get("close", np.empty(0))
+    close = close[np.isfinite(close)]
+    if len(close) < rules.min_bars:
+        return Verdict(symbol, NO_GO, [f"only {len(close)} daily bars (need {rules.min_bars})"])
+
+    no_go, caution = [], []
+    w = rules.hv_window
+    hv = realized_vol(close, w)
+    hv_short, hv_long = realized_vol(close, 10), realized_vol(close, 60)
+    volume = bars.get("volume", np.full(len(bars["close"]), np.nan))
+    dollar_volume = float(np.nanmedian((bars["close"] * volume)[-w:]))
+    opens = bars.get("open")
+    gap = float("nan")
+    if opens is not None and len(opens) > w:
+        gap = float(np.nanmax(np.abs(opens[-w:] / bars["close"][-w - 1:-1] - 1)))
+
+    if chain and iv is None:
+        iv = chain.get("atm_iv")
+    metrics = {
+        "last": round(float(close[-1]), 4),
+        f"hv{w}": round(hv, 4),
+        "hv10_hv60": round(hv_short / hv_long, 3) if hv_long > 0 else float("nan"),
+        "dollar_volume": round(dollar_volume, 0),
+        "max_gap": round(gap, 4),
+        "iv": float("nan") if iv is None else round(float(iv), 4),
+        "iv_hv": round(float(iv) / hv, 3) if iv is not None and hv > 0 else float("nan"),
+    }
+
+    if not dollar_volume >= rules.min_dollar_volume:
+        no_go.append(f"low liquidity: median ${dollar_volume:,.0f}/day traded")
+    if iv is not None and iv > rules.max_iv:
+        no_go.append(f"extreme IV {iv:.0%}")
+    if metrics["iv_hv"] > rules.iv_hv_high:
+        caution.append(f"IV rich: {metrics['iv_hv']:.2f}x HV{w}")
+    elif metrics["iv_hv"] < rules.iv_hv_low:
+        caution.append(f"IV cheap: {metrics['iv_hv']:.2f}x HV{w}")
+    if hv > rules.max_hv:
+        caution.append(f"HV{w} {hv:.0%}")
+    if metrics["hv10_hv60"] > rules.hv_spike:
+        caution.append(f"vol spike: HV10 {metrics['hv10_hv60']:.2f}x HV60")
+    if gap > rules.max_gap:
+        caution.append(f"gap {gap:.1%} in last {w} sessions")
+
+    if chain is not None:
+        if "error" in chain:
+            caution.append(f"no chain: {chain['error']}")
+        else:
+            metrics["spread_pct"] = round(chain["spread_pct"], 4)
+            metrics["open_interest"] = chain["open_interest"]
+            if not chain["spread_pct"] <= rules.max_spread_pct:
+                caution.append(f"unusual spreads: median {chain['spread_pct']:.0%} near the money")
+            if chain["open_interest"] < rules.min_open_interest:
+                no_go.append(f"low liquidity: {chain['open_interest']:,.0f} near-the-money open interest")
+
+    status = NO_GO if no_go else CAUTION if caution else GO
+    return Verdict(symbol, status, no_go + caution, metrics)
+
+
+def evaluate_many(items: List[tuple], rules: PrecheckRules) -> List[Verdict]:
+    """``evaluate`` over (symbol, bars, iv, chain) tuples; one process-pool task per loaded chunk."""
+    return [evaluate(sym, bars, iv, chain, rules) for sym, bars, iv, chain in items]
+
+
+def chain_summary(symbol: str, spot: float, rules: PrecheckRules) -> Dict[str, float]:
+    """Median spread, open interest and IV of the nearest expiration's near-the-money strikes."""
+    from src.data.chains import fetch_chain, liquidity_scores
+
+    try:
+        snap = fetch_chain(symbol, limit=1)
+    except Exception as e:
+        return {"error": str(e)}
+    scored = liquidity_scores(snap.chain)
+    near = scored[(scored["strike"] / spot - 1).abs() <= rules.moneyness]
+    if near.empty:
+        return {"error": "no strikes near the money"}
+    return {
+        "spread_pct": float(near["spread_pct"].median()),
+        "open_interest": float(near["open_interest"].fillna(0).sum()),
+        "atm_iv": float(near["iv"].median()),
+    }
+
+
+def scan(
+    watchlist: Iterable[str],
+    iv: Optional[Dict[str, float]] = None,
+    rules: Optional[PrecheckRules] = None,
+    period: str = "6mo",
+    chains: bool = False,
+    processes: Optional[bool] = None,
+    max_workers: int = 8,
+    cache: Optional[PriceCache] = None,
+) -> Iterator[Verdict]:
+    """
+    Yield one ``Verdict`` per (upper-cased, de-duplicated) symbol as it completes.
+
+    ``iv`` maps symbols to a known IV (decimal); with ``chains`` the nearest
+    expiration is also fetched per symbol for spread/open-interest checks and,
+    where no IV was given, its near-the-money IV. ``processes`` forces the
+    process pool on or off (default: on from ``PROCESS_THRESHOLD`` names).
+    """
+    rules = rules or PrecheckRules()
+    symbols = list(dict.fromkeys(s.strip().upper() for s in watchlist if s.strip()))
+    ivs = {k.strip().upper(): v for k, v in (iv or {}).items()}
+    use_processes = len(symbols) >= PROCESS_THRESHOLD if processes is None else processes
+
+    io_pool = ThreadPoolExecutor(max_workers=max_workers)
+    cpu_pool = None
+    if use_processes:
+        # spawn: forking a process that already runs threads (Streamlit, the io pool) is unsafe
+        cpu_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                       mp_context=multiprocessing.get_context("spawn"))
+        cpu_pool.submit(evaluate_many, [], rules)  # start workers while the first chunks download
+
+    def _load(chunk: List[str]):
+        return fetch_many([PriceRequest(s, period=period, interval="1d") for s in chunk],
+                          max_workers=4, cache=cache)
+
+    pending: Dict[Future, Tuple] = {}
+    for i in range(0, len(symbols), BATCH_SIZE):
+        pending[io_pool.submit(_load, symbols[i : i + BATCH_SIZE])] = ("load",)
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            ready = []
+            for fut in done:
+                kind, *ctx = pending.pop(fut)
+                if kind == "load":
+                    res = fut.result()
+                    for sym, err in res.errors.items():
+                        yield Verdict(sym, ERROR, [f"no data: {err}"])
+                    for sym, df in res.frames.items():
+                        bars = _bars(df)
+                        if chains and len(bars.get("close", ())):
+                            spot = float(bars["close"][-1])
+                            pending[io_pool.submit(chain_summary, sym, spot, rules)] = ("chain", sym, bars)
+                        else:
+                            ready.append((sym, bars, ivs.get(sym), None))
+                elif kind == "chain":
+                    sym, bars = ctx
+                    ready.append((sym, bars, ivs.get(sym), fut.result()))
+                else:
+                    yield from fut.result()
+            if ready:
+                if cpu_pool is not None:
+                    pending[cpu_pool.submit(evaluate_many, ready, rules)] = ("evaluate",)
+                else:
+                    yield from evaluate_many(ready, rules)
+    finally:
+        io_pool.shutdown(wait=False, cancel_futures=True)
+        if cpu_pool is not None:
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def verdict_frame(verdicts: Iterable[Verdict]) -> pd.DataFrame:
+    """Verdicts as a table, NO-GO first."""
+    order = {NO_GO: 0, ERROR: 1, CAUTION: 2, GO: 3}
+    df = pd.DataFrame([v.row() for v in verdicts])
+    if df.empty:
+        return df
+    return df.sort_values(["status", "symbol"], key=lambda c: c.map(order) if c.name == "status" else c,
+                          kind="stable").reset_index(drop=True)
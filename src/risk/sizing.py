@@ -0,0 +1,176 @@
+# src/risk/sizing.py
+"""
+Contract sizing by risk %.
+
+Every function works on whole columns: risk per contract and the maximum
+contract count are computed for all candidates at once. Risk per contract
+follows ``JournalEntry.initial_risk`` (100x multiplier):
+
+- with a stop: distance from entry premium to the stop premium
+- BTO without a stop: the premium paid (its max loss)
+- STO without a stop: spread width minus credit for a credit spread, strike
+  minus credit for a cash-secured put, otherwise undefined (sized 0)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+MULTIPLIER = 100
+
+
+@dataclass
+class SizingResult:
+    risk_per_contract: Optional[float]  # dollars; None when risk is undefined
+    max_contracts: int
+    risk_budget: float
+
+
+def _col(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype="float64")
+
+
+def risk_per_contract(
+    entry_price,
+    entry_action,
+    stop_price=None,
+    width=None,
+    strike=None,
+) -> np.ndarray:
+    """Dollar risk of one contract for array-likes of candidates (NaN = undefined)."""
+    entry = np.asarray(entry_price, dtype="float64")
+    n = entry.shape
+    bto = np.broadcast_to(np.asarray(entry_action) == "BTO", n)
+    stop = np.broadcast_to(np.asarray(np.nan if stop_price is None else stop_price, dtype="float64"), n)
+    width = np.broadcast_to(np.asarray(np.nan if width is None else width, dtype="float64"), n)
+    strike = np.broadcast_to(np.asarray(np.nan if strike is None else strike, dtype="float64"), n)
+
+    short_risk = np.where(~np.isnan(width), width - entry, strike - entry)
+    per_contract = np.where(
+        ~np.isnan(stop),
+        np.abs(entry - stop),
+        np.where(bto, entry, short_risk),
+    ) * MULTIPLIER
+    return np.where(per_contract > 0, per_contract, np.nan)
+
+
+def max_contracts(equity: float, risk_pct: float, per_contract) -> np.ndarray:
+    """floor(equity * risk_pct / risk per contract); 0 where risk is undefined."""
+    if equity < 0 or not 0 <= risk_pct <= 1:
+        raise ValueError("equity must be >= 0 and risk_pct a fraction in [0, 1]")
+    per_contract = np.asarray(per_contract, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.floor(equity * risk_pct / per_contract)
+    return np.where(np.isfinite(n), n, 0).astype("int64")
+
+
+def screen(candidates: pd.DataFrame, equity: float, risk_pct: float) -> pd.DataFrame:
+    """
+    Size a batch of candidates. Columns: ``entry_price`` and ``entry_action``
+    (BTO/STO), optional ``stop_price``, ``width`` (spreads) and ``strike``.
+    Adds ``risk_per_contract``, ``max_contracts`` and ``capital_at_risk``.
+    """
+    out = candidates.copy()
+    rpc = risk_per_contract(
+        _col(out, "entry_price"),
+        out["entry_action"].to_numpy(),
+        stop_price=_col(out, "stop_price"),
+        width=_col(out, "width"),
+        strike=_col(out, "strike"),
+    )
+    out["risk_per_contract"] = np.round(rpc, 2)
+    out["max_contracts"] = max_contracts(equity, risk_pct, rpc)
+    out["capital_at_risk"] = np.round(np.nan_to_num(rpc) * out["max_contracts"].to_numpy(), 2)
+    return out
+
+
+def size_entry(
+    equity: float,
+    risk_pct: float,
+    entry_price: float,
+    entry_action: str,
+    stop_price: Optional[float] = None,
+    width: Optional[float] = None,
+    strike: Optional[float] = None,
+) -> SizingResult:
+    """Single-trade wrapper around the vectorized path (used by the Add entry form)."""
+    rpc = risk_per_contract([entry_price], [entry_action], [stop_price if stop_price is not None else np.nan],
+                            [width if width is not None else np.nan], [strike if strike is not None else np.nan])
+    n = int(max_contracts(equity, risk_pct, rpc)[0])
+    return SizingResult(None if np.isnan(rpc[0]) else round(float(rpc[0]), 2), n, round(equity * risk_pct, 2))
+
+
+def _mid(chain: pd.DataFrame) -> np.ndarray:
+    if "mid" in chain.columns:
+        return chain["mid"].to_numpy(dtype="float64")
+    bid, ask = _col(chain, "bid"), _col(chain, "ask")
+    return np.where((bid > 0) & (ask >= bid), (bid + ask) / 2, np.nan)
+
+
+def size_chain(
+    chain: pd.DataFrame,
+    equity: float,
+    risk_pct: float,
+    entry_action: str = "BTO",
+    stop_pct: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Max contracts for every single-leg contract of a chain, entered at mid.
+    ``stop_pct`` places the stop that fraction away from entry (below for BTO,
+    above for STO); STO without a stop is sized as cash-secured (puts only).
+    """
+    mid = _mid(chain)
+    stop = None
+    if stop_pct is not None:
+        stop = mid * (1 - stop_pct) if entry_action == "BTO" else mid * (1 + stop_pct)
+    strike = None
+    if entry_action == "STO" and stop is None:
+        strike = np.where(chain["type"].to_numpy() == "put", _col(chain, "strike"), np.nan)
+    rpc = risk_per_contract(mid, entry_action, stop_price=stop, strike=strike)
+    out = chain.copy()
+    out["entry_price"] = mid
+    out["risk_per_contract"] = np.round(rpc, 2)
+    out["max_contracts"] = max_contracts(equity, risk_pct, rpc)
+    return out
+
+
+def size_spreads(
+    chain: pd.DataFrame,
+    widths: Iterable[float],
+    equity: float,
+    risk_pct: float,
+    entry_action: str = "STO",
+) -> pd.DataFrame:
+    """
+    Every vertical spread of the given strike ``widths`` in a chain, sized.
+
+    STO (credit): sell the nearer strike, buy the one ``width`` further out of
+    the money (lower for puts, higher for calls); risk = width - credit.
+    BTO (debit): buy the nearer strike, sell the further one; risk = debit.
+    Either way the near leg is the dearer one, so ``entry_price`` = near - far.
+    Legs are matched with one merge per width, priced at mid.
+    """
+    base = chain.assign(mid=_mid(chain), strike=chain["strike"].astype("float64").round(4))
+    base = base[["expiration", "type", "strike", "mid"]].dropna(subset=["mid"])
+    far_legs = base.rename(columns={"strike": "far_strike", "mid": "far_mid"})
+    # the far leg is further out of the money for both: lower strike for puts, higher for calls
+    direction = np.where(base["type"].to_numpy() == "put", -1.0, 1.0)
+    parts = []
+    for w in widths:
+        legs = base.assign(far_strike=np.round(base["strike"].to_numpy() + direction * w, 4))
+        pair = legs.merge(far_legs, on=["expiration", "type", "far_strike"])
+        pair["width"] = float(w)
+        parts.append(pair)
+    if not parts:
+        return pd.DataFrame()
+    spreads = pd.concat(parts, ignore_index=True)
+    near, far = spreads["mid"].to_numpy(), spreads["far_mid"].to_numpy()
+    spreads["entry_action"] = entry_action
+    spreads["entry_price"] = np.round(near - far, 4)  # credit (STO) or debit (BTO) per share
+    sized = screen(spreads[spreads["entry_price"] > 0], equity, risk_pct)
+    return sized.rename(columns={"strike": "near_strike"}).reset_index(drop=True)
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
@@ -6,6 +7,9 @@ class Settings(BaseModel):
     app_env: str = "development"
     db_url: str = "sqlite:///./ai_trader.sqlite"
     data_cache_ttl: int = 60
+    price_cache_path: str = "./price_cache.sqlite"
+    market_data_replay: Optional[str] = None  # replay directory; None = live yfinance
+    diagnostics: bool = False  # show the Diagnostics tab (per-rerun traces) by default
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -14,4 +18,7 @@ class Settings(BaseModel):
             app_env=os.getenv("APP_ENV", "development"),
             db_url=os.getenv("DB_URL", "sqlite:///./ai_trader.sqlite"),
             data_cache_ttl=int(os.getenv("DATA_CACHE_TTL", "60")),
+            price_cache_path=os.getenv("PRICE_CACHE_PATH", "./price_cache.sqlite"),
+            market_data_replay=os.getenv("MARKET_DATA_REPLAY") or None,
+            diagnostics=os.getenv("DIAGNOSTICS", "0").lower() in ("1", "true", "yes"),
         )
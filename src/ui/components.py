@@ -1,26 +1,72 @@
+from __future__ import annotations
+
+import io
+import json
+import time
 import streamlit as st
-import numpy as np
-from typing import List
-from datetime import date
+from typing import TYPE_CHECKING, List, Optional
+from datetime import date, datetime
+
+# Each tab imports what it needs when it first renders (see app.py); keep module-level imports light.
+if TYPE_CHECKING:
+    from src.journal.models import VolSnapshot
 
-from src.data.fetchers import fetch_history, PriceRequest
-from src.journal.storage import create_entry, list_entries, update_entry, init_db, close_entry, delete_entry, list_entries_by_status
-from src.data.vol import realized_vol, compare_iv_hv
-from src.journal.models import JournalEntry
+HV_WINDOWS = [10, 20, 30]
+DIAG_HISTORY = 20  # rerun traces kept in the session for the Diagnostics tab
+JOURNAL_PAGE_SIZES = [25, 50, 100]
+# Widget values carried across reruns where their tab is not rendered (see keep_widget_state)
+DATA_STATE_KEYS = (
+    "data_symbol", "data_period", "data_interval", "data_vol_symbol", "data_iv_decimal", "data_hv_window",
+    "data_hv_estimator", "data_chain_symbol", "data_chain_max_spread", "data_chain_type", "data_chain_liquid_only",
+    "data_size_action", "data_size_widths", "data_precheck_watchlist", "data_precheck_ivs", "data_precheck_chains",
+)
+JOURNAL_STATE_KEYS = (
+    "journal_symbol", "journal_add_action", "journal_strategy", "journal_add_date", "journal_add_price",
+    "journal_add_size", "journal_stop", "journal_target", "journal_width", "journal_notes", "journal_add_tags",
+    "journal_add_direction",
+    "journal_view", "journal_status", "journal_page_size", "journal_stats_action", "journal_stats_iv_hv",
+    "journal_analytics_by",
+)
+ESTIMATOR_LABELS = {
+    "close": "close-to-close",
+    "parkinson": "Parkinson",
+    "garman_klass": "Garman-Klass",
+    "rogers_satchell": "Rogers-Satchell",
+    "yang_zhang": "Yang-Zhang",
+}
 
 
+def keep_widget_state(keys):
+    """
+    Streamlit drops a widget's value on any run that does not render it; writing
+    the values back through session state keeps them while their tab is closed.
+    """
+    for key in keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
 def header():
     st.title("AI Trader / Journal App")
     st.caption("Structured like a real product: tests, retries, and change control.")
 
 def journal_sidebar():
     st.sidebar.header("Journal Filters")
+    st.sidebar.text_input("Search notes", key="journal_search", placeholder="earnings",
+                          help="Symbol, strategy and notes; every word must match, best matches first.")
     st.sidebar.text_input("Tag search", key="tag_search", placeholder="#theta, #earnings")
-    st.sidebar.date_input("Date range")  # (MVP placeholder)
+    st.sidebar.radio("Match tags", ["any", "all"], horizontal=True, key="tag_match")
+    st.sidebar.date_input("Date range", value=[], key="date_range", help="Filters on entry date.")
+    st.sidebar.header("Risk")
+    st.sidebar.number_input("Account equity ($)", min_value=0.0, value=25_000.0, step=1_000.0, key="risk_equity")
+    st.sidebar.number_input("Risk per trade (%)", min_value=0.1, max_value=100.0, value=1.0, step=0.1, key="risk_pct")
 
 def data_section(settings):
-    import streamlit as st
+    import numpy as np
+    from src.data.chains import fetch_chain, liquidity_scores
     from src.data.fetchers import fetch_history, PriceRequest
+    from src.data.vol import ESTIMATORS, PERIODS_PER_YEAR, RollingVolEstimator, ohlc_vol, compare_iv_hv
+    from src.risk.precheck import scan, verdict_frame
+    from src.risk.sizing import size_chain, size_spreads
 
     st.subheader("Market Data")
 
@@ -38,6 +84,20 @@ def data_section(settings):
             df = fetch_history(PriceRequest(symbol=sym, period=period, interval=interval))
             st.dataframe(df.tail(30))
             st.session_state["last_df"] = df  # optional cache
+
+            if interval in PERIODS_PER_YEAR and interval != "1d":
+                # Streaming HV: only bars newer than the last refresh are processed
+                state_key = f"hv_stream_{sym.strip().upper()}_{interval}"
+                hv_win = int(st.session_state.get("data_hv_window", 20))
+                state = st.session_state.get(state_key)
+                est = (
+                    RollingVolEstimator.from_dict(state)
+                    if state and state["window"] == hv_win
+                    else RollingVolEstimator(window=hv_win, periods_per_year=PERIODS_PER_YEAR[interval])
+                )
+                hv_now = est.feed(df)
+                st.session_state[state_key] = est.to_dict()
+                st.metric(f"HV{hv_win} ({interval} bars)", "n/a" if np.isnan(hv_now) else f"{hv_now:.1%}")
         except Exception as e:
             st.error(f"Failed to fetch data: {e}")
 
@@ -45,24 +105,33 @@ def data_section(settings):
 
     # ================== Volatility Context lives on DATA tab ==================
     st.markdown("### Volatility Context")
-    c0, c1, c2, c3 = st.columns([1, 1, 1, 1])
+    c0, c1, c2, c3, c4 = st.columns([1, 1, 1, 1, 1])
     with c0:
         vol_symbol = st.text_input("Symbol (for vol)", value=sym, key="data_vol_symbol")
     with c1:
         iv_decimal = st.number_input("Current IV (decimal, e.g., 0.55)", min_value=0.0, max_value=5.0, step=0.01, format="%.2f", key="data_iv_decimal")
     with c2:
-        hv_window = st.selectbox("HV window", [10, 20, 30], index=1, key="data_hv_window")
+        hv_window = st.selectbox("HV window", HV_WINDOWS, index=1, key="data_hv_window")
     with c3:
+        hv_estimator = st.selectbox(
+            "HV estimator",
+            list(ESTIMATORS),
+            format_func=ESTIMATOR_LABELS.get,
+            index=0,
+            key="data_hv_estimator",
+            help="Range-based estimators use the full OHLC bar and need fewer bars for the same precision.",
+        )
+    with c4:
         compute_now = st.button("Compute IV vs HV", key="data_compute_iv_hv")
 
     if compute_now and vol_symbol.strip():
         try:
             # Ensure we have daily data for HV calculation
             df = fetch_history(PriceRequest(symbol=vol_symbol.strip(), period="6mo", interval="1d"))
-            # realized_vol expects a price series (Close); use the helper in vol.py
-            # Convert returned %/decimal appropriately: we want HV as DECIMAL here (e.g., 0.42)
-            # Our realized_vol returns decimal (0.25 = 25%)
-            hv_dec = realized_vol(df["Close"], window=int(hv_window))
+            # All windows x estimators in one pass; values are DECIMAL (0.25 = 25%)
+            panel = ohlc_vol(df, windows=HV_WINDOWS)
+            hv_by_window = {w: float(panel.latest.loc[hv_estimator, w]) for w in HV_WINDOWS}
+            hv_dec = hv_by_window[int(hv_window)]
             iv_dec = float(iv_decimal)
 
             if np.isnan(hv_dec):
@@ -71,13 +140,13 @@ def data_section(settings):
                 # Display as percentages for humans
                 colA, colB, colC = st.columns(3)
                 colA.metric("IV (user)", f"{iv_dec:.1%}")
-                colB.metric(f"HV{hv_window}", f"{hv_dec:.1%}")
+                colB.metric(f"HV{hv_window} ({ESTIMATOR_LABELS[hv_estimator]})", f"{hv_dec:.1%}")
                 # difference in percentage points (IV% - HV%)
                 diff_pp = (iv_dec - hv_dec) * 100.0
                 colC.metric("IV − HV", f"{diff_pp:+.1f} pp")
 
                 # Text interpretation
-                msg = compare_iv_hv(iv_dec, hv_dec)
+                msg = compare_iv_hv(iv_dec, hv_dec, label=f"HV{hv_window} {ESTIMATOR_LABELS[hv_estimator]}")
                 # Color hint
                 if "expensive" in msg.lower():
                     st.warning(msg)
@@ -90,15 +159,131 @@ def data_section(settings):
                 st.session_state["iv_user_decimal"] = iv_dec
                 st.session_state["hv_decimal"] = hv_dec
                 st.session_state["hv_window_last"] = int(hv_window)
+                st.session_state["hv_by_window"] = hv_by_window
+                st.session_state["hv_estimator_last"] = hv_estimator
                 st.session_state["vol_symbol_last"] = vol_symbol.strip()
+                st.session_state["underlying_last"] = float(df["Close"].iloc[-1])
 
         except Exception as e:
             st.error(f"Failed to compute volatility context: {e}")
 
+    st.markdown("---")
+    st.markdown("### Option chain & liquidity")
+    k0, k1, k2 = st.columns([1, 1, 1])
+    with k0:
+        chain_symbol = st.text_input("Symbol (chain)", value=sym, key="data_chain_symbol")
+    with k1:
+        max_spread = st.number_input("Max spread %", min_value=1.0, max_value=100.0, value=10.0, step=1.0,
+                                     key="data_chain_max_spread")
+    with k2:
+        fetch_chain_now = st.button("Fetch chain", key="data_chain_fetch")
+    if fetch_chain_now and chain_symbol.strip():
+        try:
+            st.session_state["chain_snapshot"] = fetch_chain(chain_symbol)
+        except Exception as e:
+            st.error(f"Failed to fetch option chain: {e}")
+    snap = st.session_state.get("chain_snapshot")
+    if snap is not None:
+        scored = liquidity_scores(snap.chain, max_spread_pct=max_spread / 100.0)
+        e0, e1, e2 = st.columns([2, 1, 1])
+        with e0:
+            expiration = st.selectbox("Expiration", snap.expirations, key="data_chain_expiration")
+        with e1:
+            side = st.radio("Type", ["call", "put"], horizontal=True, key="data_chain_type")
+        with e2:
+            liquid_only = st.checkbox("Liquid only", value=False, key="data_chain_liquid_only")
+        view = scored[(scored["expiration"] == expiration) & (scored["type"] == side)]
+        if liquid_only:
+            view = view[view["liquid"]]
+        st.caption(
+            f"{snap.symbol}: {len(snap.chain):,} contracts across {len(snap.expirations)} expirations, "
+            f"{int(scored['liquid'].sum()):,} liquid."
+        )
+        st.dataframe(
+            view[["contract", "strike", "bid", "ask", "mid", "spread_pct", "volume", "open_interest", "iv",
+                  "liquidity", "liquid"]],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        with st.expander("Size candidates by risk %"):
+            equity = float(st.session_state.get("risk_equity", 25_000.0))
+            risk_pct = float(st.session_state.get("risk_pct", 1.0)) / 100.0
+            z0, z1 = st.columns(2)
+            with z0:
+                size_action = st.radio("Open action", ["BTO", "STO"], horizontal=True, key="data_size_action")
+            with z1:
+                widths = st.multiselect("Spread widths", [1.0, 2.0, 2.5, 5.0, 10.0], default=[5.0],
+                                        key="data_size_widths")
+            st.caption(f"Risk budget ${equity * risk_pct:,.0f} (sidebar equity × risk per trade).")
+            singles = size_chain(view, equity, risk_pct, entry_action=size_action)
+            st.dataframe(singles[["contract", "strike", "entry_price", "risk_per_contract", "max_contracts"]],
+                         use_container_width=True, hide_index=True)
+            if widths:
+                legs = scored[(scored["expiration"] == expiration) & (scored["type"] == side)]
+                spreads = size_spreads(legs, widths, equity, risk_pct, entry_action=size_action)
+                if not spreads.empty:
+                    st.dataframe(
+                        spreads[["near_strike", "far_strike", "width", "entry_price", "risk_per_contract",
+                                 "max_contracts", "capital_at_risk"]],
+                        use_container_width=True, hide_index=True,
+                    )
+
+    st.markdown("---")
+    st.markdown("### Go/No-Go precheck")
+    watchlist = st.text_area("Watchlist", key="data_precheck_watchlist", placeholder="SPY, QQQ, AAPL",
+                             help="Symbols separated by commas, spaces or new lines.")
+    q0, q1 = st.columns([2, 1])
+    with q0:
+        iv_text = st.text_input("Known IVs (decimal)", key="data_precheck_ivs", placeholder="SPY=0.18, TSLA=0.65")
+    with q1:
+        with_chains = st.checkbox("Check option chains", key="data_precheck_chains",
+                                  help="Nearest expiration per symbol: spreads, open interest, ATM IV. Slower.")
+    if st.button("Run precheck", key="data_precheck_run"):
+        symbols = list(dict.fromkeys(watchlist.replace(",", " ").upper().split()))
+        try:
+            ivs = {k.strip(): float(v) for k, v in (pair.split("=") for pair in iv_text.split(",") if pair.strip())}
+        except ValueError:
+            st.error("Known IVs must look like SPY=0.18, TSLA=0.65")
+            ivs = None
+        if symbols and ivs is not None:
+            progress = st.progress(0.0)
+            live = st.empty()
+            verdicts, shown = [], 0.0
+            try:
+                # verdicts arrive in completion order; redraw the table at most twice a second
+                for v in scan(symbols, iv=ivs, chains=with_chains):
+                    verdicts.append(v)
+                    progress.progress(len(verdicts) / len(symbols), text=f"{len(verdicts)}/{len(symbols)} checked")
+                    if time.monotonic() - shown > 0.5:
+                        live.dataframe(verdict_frame(verdicts), use_container_width=True, hide_index=True)
+                        shown = time.monotonic()
+                live.empty()
+                st.session_state["precheck_verdicts"] = verdicts
+            except Exception as e:
+                st.error(f"Precheck failed: {e}")
+    verdicts = st.session_state.get("precheck_verdicts")
+    if verdicts:
+        table = verdict_frame(verdicts)
+        counts = table["status"].value_counts()
+        cols = st.columns(4)
+        for col, status in zip(cols, ["GO", "CAUTION", "NO-GO", "ERROR"]):
+            col.metric(status, int(counts.get(status, 0)))
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
 
 def journal_section():
+    import numpy as np
+    from src.journal.analytics import JournalFrame
+    from src.journal.importer import export_journal, import_fills_csv
+    from src.journal.marks import mark_to_market
+    from src.journal.storage import (
+        SUMMARY_COLUMNS, Page, create_entry, overall_stats, query_entries, search_entries, write_generation,
+    )
+    from src.risk.sizing import size_entry
+    from src.ui.state import cached_read, current_page, new_submission, next_page, prev_page, submission_token
+
     st.subheader("Journal")
-    init_db()
 
      # ───────────────────────────── Add Entry (only reads vol from session) ─────────────────────────────
     with st.expander("Add entry", expanded=True):
@@ -114,6 +299,7 @@ def journal_section():
                 index=0,  # default BTO
                 help="BTO=Buy to open (debit). STO=Sell to open (credit).",
                 horizontal=True,
+                key="journal_add_action",
             )
         with c3:
             strategy = st.text_input("Strategy", value="", key="journal_strategy")
@@ -121,143 +307,431 @@ def journal_section():
             # Row 2: entry date + price + contracts
         c4, c5, c6 = st.columns([2, 2, 2])
         with c4:
-            entry_date = st.date_input("Entry date", value=date.today())
+            entry_date = st.date_input("Entry date", value=date.today(), key="journal_add_date")
         with c5:
-            entry_price = st.number_input("Entry price (option premium)", min_value=0.0, step=0.01)
+            entry_price = st.number_input("Entry price (option premium)", min_value=0.0, step=0.01,
+                                          key="journal_add_price")
         with c6:
-            size = st.number_input("Contracts", min_value=1, step=1, value=1)
+            size = st.number_input("Contracts", min_value=1, step=1, value=1, key="journal_add_size")
+
+        # Row 3: risk levels + sizing by risk % (sidebar equity / risk per trade)
+        r1, r2, r3 = st.columns([2, 2, 2])
+        with r1:
+            stop_price = st.number_input("Stop (option premium)", value=None, min_value=0.0, step=0.01,
+                                         key="journal_stop")
+        with r2:
+            target_price = st.number_input("Target (option premium)", value=None, min_value=0.0, step=0.01,
+                                           key="journal_target")
+        with r3:
+            width = st.number_input("Spread width (credit spreads)", value=None, min_value=0.0, step=0.5,
+                                    key="journal_width")
+        sizing = size_entry(
+            float(st.session_state.get("risk_equity", 25_000.0)),
+            float(st.session_state.get("risk_pct", 1.0)) / 100.0,
+            entry_price=entry_price,
+            entry_action=entry_action,
+            stop_price=stop_price,
+            width=width,
+        )
+        if sizing.risk_per_contract is None:
+            st.caption(
+                f"Risk budget ${sizing.risk_budget:,.0f}: enter the premium (plus a stop or spread width "
+                "for STO) to size this trade."
+            )
+        else:
+            st.caption(
+                f"Risk budget ${sizing.risk_budget:,.0f} • ${sizing.risk_per_contract:,.2f} per contract "
+                f"→ max {sizing.max_contracts} contract(s)"
+            )
+            if size > sizing.max_contracts:
+                st.warning(f"{size} contracts exceeds the {sizing.max_contracts} allowed by your risk %.")
 
              # Notes
         notes = st.text_area("Notes", placeholder="Why this trade? Plan? Risk?", key="journal_notes")
            # Metadata row: tags + direction (moved down here)
         c7, c8 = st.columns([2, 2])
         with c7:
-            tags_csv = st.text_input("Tags (comma-separated)", placeholder="#theta, #earnings")
+            tags_csv = st.text_input("Tags (comma-separated)", placeholder="#theta, #earnings", key="journal_add_tags")
         with c8:
             direction = st.selectbox(
                 "Direction (metadata)",
                 options=["neutral", "long", "short"],
                 index=0,
                 help="Just metadata for filtering; not used in P&L.",
+                key="journal_add_direction",
             )
 
-        # Build a one-line context if the DATA tab computed it
-        vol_line = None
-        iv_dec = st.session_state.get("iv_user_decimal")
-        hv_dec = st.session_state.get("hv_decimal")
-        hv_win = st.session_state.get("hv_window_last")
-        if iv_dec is not None and hv_dec is not None and hv_win:
+        # Entry-time vol context from the DATA tab, saved as a VolSnapshot row with the entry
+        vol = _vol_snapshot(symbol)
+        vol_symbol = st.session_state.get("vol_symbol_last")
+        if vol is not None:
+            parts = [f"IV {vol.iv:.1%}" if vol.iv else "no IV", f"HV{vol.hv_window} {vol.hv:.1%}"]
+            if vol.iv and vol.hv:
+                parts.append(f"IV/HV {vol.iv / vol.hv:.2f}")
+            st.caption("Vol context saved with this entry: " + " • ".join(parts))
+        elif vol_symbol and symbol.strip():
+            st.caption(f"Vol context is for {vol_symbol.upper()}; compute it for {symbol.strip().upper()} "
+                       "on the Data tab to save it with this entry.")
+
+        token = submission_token(
+            symbol, strategy, entry_action, entry_date, entry_price, size, direction, notes, tags_csv,
+            stop_price, target_price, vol.model_dump(exclude={"captured_at"}) if vol is not None else None,
+        )
+        s1, s2 = st.columns([1, 5])
+        with s1:
+            save = st.button("Save entry", type="primary", key="journal_save")
+        with s2:
+            if st.button("New entry", key="journal_new", help="Save the same details again as another trade."):
+                new_submission()
+        if save:
             try:
-                diff_pp = (iv_dec - hv_dec) * 100.0
-                ratio_pct = ((iv_dec / hv_dec) - 1.0) * 100.0 if hv_dec > 0 else float("inf")
-                vol_line = (
-                    f"[vol] IV(user)={iv_dec:.1%} | HV{hv_win}={hv_dec:.1%} | "
-                    f"Δ={diff_pp:+.1f}pp ({ratio_pct:+.0f}%)"
+                entry = create_entry(
+                    symbol=symbol,
+                    strategy=strategy,
+                    entry_action=entry_action,   # "BTO" or "STO"
+                    entry_date=entry_date,
+                    entry_price=entry_price,
+                    size=size,
+                    direction=direction,
+                    notes=notes,
+                    tags_csv=tags_csv,
+                    stop_price=stop_price,
+                    target_price=target_price,
+                    client_token=token,
+                    vol=vol,
                 )
-            except Exception:
-                vol_line = None
-
-        
-        final_notes = notes
-        tags_norm = ""
-        if st.button("Save entry", type="primary", key="journal_save"):
-            # Normalize tags into a clean CSV string (no spaces, no empties)
-            tags_norm = ",".join([t.strip() for t in (tags_csv or "").split(",") if t.strip()])
-
-            # Auto-embed the context line above the user's notes
-            final_notes = f"{vol_line}\n{notes}" if vol_line else notes
+                st.session_state["journal_saved"] = (token, entry.id)
+            except Exception as e:
+                st.error(f"Failed to save entry: {e}")
+        saved = st.session_state.get("journal_saved")
+        if saved and saved[0] == token:
+            st.success(f"Saved entry #{saved[1]}")
 
-        try:
-            entry = create_entry(
-                symbol=symbol,
-                strategy=strategy,
-                entry_action=entry_action,   # "BTO" or "STO"
-                entry_date=entry_date,
-                entry_price=entry_price,
-                size=size,
-                direction=direction,
-                notes=final_notes,
-                tags_csv=tags_norm,
-            )
-            st.success(f"Saved entry #{entry.id}")
-        except Exception as e:
-            st.error(f"Failed to save entry: {e}")
+    with st.expander("Import / export"):
+        fills = st.file_uploader("Broker fills CSV (BTO/STO/STC/BTC)", type="csv", key="journal_import_file")
+        if fills is not None and st.button("Import fills", key="journal_import"):
+            try:
+                report = import_fills_csv(fills)
+                st.success(
+                    f"Imported {report.closed_trades} closed / {report.open_trades} open trades "
+                    f"({report.duplicates} already in journal, {report.skipped_rows} rows skipped)."
+                )
+                if report.unmatched_close_qty:
+                    st.warning(
+                        f"{report.unmatched_close_qty} closing contracts had no matching open: "
+                        + ", ".join(report.unmatched_symbols[:10])
+                    )
+            except Exception as e:
+                st.error(f"Import failed: {e}")
+        if st.button("Prepare Parquet export", key="journal_export"):
+            buf = io.BytesIO()
+            export_journal(buf)
+            st.download_button("Download journal.parquet", buf.getvalue(), file_name="journal.parquet")
 
     st.markdown("---")
-    tag_filter = st.session_state.get("tag_search") or None
-    entries = list_entries(tag=tag_filter)
-    if not entries:
-        st.info("No entries yet.")
+    tag_filter = (st.session_state.get("tag_search") or "").split(",")
+    date_range = list(st.session_state.get("date_range") or [])
+    v1, v2, v3 = st.columns([2, 2, 2])
+    with v1:
+        view = st.radio("View", ["Pages", "Table"], horizontal=True, key="journal_view",
+                        help="Table shows every matching entry in one scrollable grid.")
+    with v2:
+        status = st.selectbox("Status", ["all", "open", "closed"], key="journal_status")
+    with v3:
+        page_size = st.selectbox("Rows per page", JOURNAL_PAGE_SIZES, index=1, key="journal_page_size")
+    filters = dict(
+        status=None if status == "all" else status,
+        tags=tag_filter,
+        match=st.session_state.get("tag_match", "any"),
+        date_from=date_range[0] if date_range else None,
+        date_to=date_range[-1] if date_range else None,
+    )
+
+    search = (st.session_state.get("journal_search") or "").strip()
+    if search:
+        page = Page(rows=cached_read("journal_search", search_entries, search, columns=SUMMARY_COLUMNS,
+                                     status=filters["status"], limit=page_size))
+        st.caption(f"Top {len(page.rows)} matches for “{search}” (tag and date filters do not apply).")
+        selected = _entries_table(page.rows, key="journal_table_search")
+    elif view == "Table":
+        page = cached_read("journal_all", query_entries, columns=SUMMARY_COLUMNS, limit=None, **filters)
+        selected = _entries_table(page.rows, key="journal_table_all")
     else:
-        for entry in entries:
-            with st.container(border=True):
-                st.markdown(f"**#{entry.id}** {entry.symbol}  *{entry.direction}*  ({entry.strategy})")
-                st.caption(f"Created: {entry.created_at}   •   Updated: {entry.updated_at}")
-                if entry.tags_csv:
-                    st.write("Tags:", entry.tags_csv)
-                if entry.notes:
-                    st.write(entry.notes)
-
-    st.subheader("Open trades")
-
-    open_entries = list_entries_by_status("open")
-    if not open_entries:
-        st.info("No open trades.")
+        cursor, page_no = current_page("journal", {**filters, "size": page_size})
+        page = cached_read("journal_page", query_entries, columns=SUMMARY_COLUMNS, cursor=cursor,
+                           limit=page_size, **filters)
+        selected = _entries_table(page.rows, key=f"journal_table_{page_no}")
+        p1, p2, p3 = st.columns([1, 1, 4])
+        with p1:
+            if st.button("‹ Prev", key="journal_prev", disabled=page_no == 1):
+                prev_page("journal")
+                st.rerun()
+        with p2:
+            if st.button("Next ›", key="journal_next", disabled=page.next_cursor is None):
+                next_page("journal", page.next_cursor)
+                st.rerun()
+        with p3:
+            st.caption(f"Page {page_no}")
+
+    if not page.rows:
+        st.info(f"No entries match “{search}”." if search else "No entries yet.")
     else:
-        for entry in open_entries:
-            header = f"#{entry.id} {entry.symbol} {entry.entry_action} @ {entry.entry_price} (contracts {entry.size})"
-            with st.expander(header):
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    exit_price = st.number_input(
-                        f"Exit price (#{entry.id})",
-                        min_value=0.0,
-                        value=float(entry.entry_price),
-                        step=0.01,
-                    )
-                with col2:
-                    exit_dt = st.date_input(f"Exit date (#{entry.id})", value=date.today())
-                with col3:
-                    if st.button(f"Mark closed (#{entry.id})"):
-                        close_entry(entry.id, exit_price=exit_price, exit_date=exit_dt)
-                        st.success("Closed. Reload the page to refresh lists.")
+        _entry_detail(selected if selected is not None else page.rows[0].id, [r.id for r in page.rows])
 
-                if st.button(f"Delete trade (#{entry.id})", type="secondary"):
-                    delete_entry(entry.id)
-                    st.warning("Deleted. Reload to refresh.")
+    with st.expander("Mark to market (open trades)"):
+        st.caption("Marks are the last price of each journal symbol; journal options under their contract symbol.")
+        if st.button("Refresh marks", key="journal_marks_refresh"):
+            try:
+                st.session_state["journal_marks"] = (write_generation(), mark_to_market())
+            except Exception as e:
+                st.error(f"Failed to mark positions: {e}")
+        marked = st.session_state.get("journal_marks")
+        if marked:
+            generation, report = marked
+            if generation != write_generation():
+                st.info("Trades changed since these marks were taken; refresh to include them.")
+            m1, m2 = st.columns(2)
+            m1.metric("Unrealized P&L", f"{report.total:,.2f}")
+            m2.metric("Open positions", len(report.positions))
+            if report.unpriced:
+                st.warning("No mark for: " + ", ".join(sorted(report.unpriced)))
+            st.dataframe(report.positions, use_container_width=True, hide_index=True)
+            t1, t2 = st.columns(2)
+            t1.dataframe(report.by_symbol, use_container_width=True)
+            t2.dataframe(report.by_strategy, use_container_width=True)
 
     st.subheader("Closed trades & stats")
-    closed_entries = list_entries_by_status("closed")
+    f1, f2 = st.columns(2)
+    with f1:
+        stats_action = st.selectbox("Open action", ["all", "BTO", "STO"], key="journal_stats_action")
+    with f2:
+        iv_hv_min = st.number_input(
+            "Opened with IV/HV above", value=None, min_value=0.0, step=0.1, key="journal_stats_iv_hv",
+            help="Uses the vol snapshot saved with each entry; trades without one are left out.",
+        )
+    regime = dict(entry_action=None if stats_action == "all" else stats_action, iv_hv_min=iv_hv_min)
+    jf = cached_read("analytics", JournalFrame.load, **regime)
+
+    filtered = any(v is not None for v in regime.values())
+    if not len(jf):
+        st.info("No closed trades match these filters." if filtered else "No closed trades yet.")
+    else:
+        closed = jf.df.sort_values(["exit_date", "id"], ascending=False)
+        st.dataframe(
+            closed[["id", "symbol", "entry_action", "direction", "entry_price", "exit_price", "size",
+                    "pl", "r_multiple", "holding_days", "tags_csv"]].rename(columns={
+                "entry_action": "action", "entry_price": "entry", "exit_price": "exit", "size": "contracts",
+                "pl": "P&L", "r_multiple": "R", "holding_days": "days", "tags_csv": "tags",
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        if filtered:
+            # filtered: KPIs of the matching trades only
+            st.metric("Closed trades", len(jf))
+            st.metric("Win rate", f"{round(100 * jf.df['win'].mean(), 1)}%")
+            st.metric("Realized P&L", f"{round(jf.df['pl'].sum(), 2)}")
+            st.metric("Avg holding days", f"{jf.df['holding_days'].mean():.1f}")
+        else:
+            # quick KPIs (maintained by storage on every close/update/delete)
+            kpi = cached_read("kpi", overall_stats)
+            st.metric("Closed trades", kpi.count)
+            st.metric("Win rate", f"{round(100 * (kpi.win_rate or 0.0), 1)}%")
+            st.metric("Realized P&L", f"{round(kpi.pl_sum, 2)}")
+            if kpi.avg_holding_days is not None:
+                st.metric("Avg holding days", f"{kpi.avg_holding_days:.1f}")
+
+        with st.expander("Analytics"):
+            a1, a2, a3 = st.columns(3)
+            a1.metric("Max drawdown", f"{jf.max_drawdown():,.2f}")
+            a2.metric("Expectancy / trade", f"{jf.df['pl'].mean():,.2f}")
+            avg_r = jf.df["r_multiple"].mean()
+            a3.metric("Avg R", "n/a" if np.isnan(avg_r) else f"{avg_r:.2f}")
+            st.line_chart(jf.equity_curve())
+            group_by = st.selectbox(
+                "Break down by",
+                ["strategy", "symbol", "tag", "entry_action", "month", "direction"],
+                key="journal_analytics_by",
+            )
+            st.dataframe(jf.summary(by=group_by), use_container_width=True)
+
+
+def _vol_snapshot(symbol: str) -> Optional[VolSnapshot]:
+    """The Data tab's last IV vs HV computation as a snapshot, if it was for ``symbol``."""
+    import numpy as np
+    from src.journal.models import VolSnapshot
+
+    ss = st.session_state
+    iv_dec, hv_dec, vol_symbol = ss.get("iv_user_decimal"), ss.get("hv_decimal"), ss.get("vol_symbol_last")
+    if iv_dec is None or hv_dec is None or not vol_symbol:
+        return None
+    if vol_symbol.strip().upper() != symbol.strip().upper():
+        return None
+    hv_by_window = ss.get("hv_by_window") or {}
+
+    def num(x):
+        return None if x is None or np.isnan(x) else float(x)
+
+    return VolSnapshot(
+        symbol=vol_symbol.strip().upper(),
+        underlying_price=num(ss.get("underlying_last")),
+        iv=iv_dec if iv_dec > 0 else None,  # 0 = no IV entered
+        hv=num(hv_dec),
+        hv_window=ss.get("hv_window_last"),
+        hv_estimator=ss.get("hv_estimator_last"),
+        **{f"hv{w}": num(hv_by_window.get(w)) for w in HV_WINDOWS},
+    )
+
+
+def _entries_table(rows, key: str):
+    """One compact grid for a list of entry rows; returns the id of the selected row, if any."""
+    records = [
+        {
+            "id": r.id,
+            "created": r.created_at,
+            "symbol": r.symbol,
+            "strategy": r.strategy,
+            "action": r.entry_action,
+            "status": r.status,
+            "entry date": r.entry_date,
+            "entry": r.entry_price,
+            "contracts": r.size,
+            "exit": r.exit_price,
+            "tags": r.tags_csv,
+        }
+        for r in rows
+    ]
+    if not records:
+        return None
+    event = st.dataframe(
+        records,
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=key,
+    )
+    picked = event.selection.rows
+    return records[picked[0]]["id"] if picked else None
 
-    if not closed_entries:
-        st.info("No closed trades yet.")
+
+def _entry_detail(entry_id: int, ids: List[int]):
+    """Single edit / close / delete panel for the selected entry (one widget set, not one per row)."""
+    from src.journal.models import split_tags
+    from src.journal.storage import close_entry, delete_entry, get_entry, get_vol_snapshot, update_entry
+    from src.ui.state import cached_read
+
+    with st.container(border=True):
+        entry_id = st.selectbox(
+            "Entry", ids, index=ids.index(entry_id) if entry_id in ids else 0,
+            format_func=lambda i: f"#{i}", key=f"journal_detail_pick_{entry_id}",
+        )
+        entry = cached_read("entry", get_entry, entry_id)
+        if entry is None:
+            st.info("This entry no longer exists.")
+            return
+        st.markdown(f"**#{entry.id}** {entry.symbol}  *{entry.direction}*  ({entry.strategy}) — {entry.status}")
+        st.caption(f"Created: {entry.created_at}   •   Updated: {entry.updated_at}")
+        vol = cached_read("vol_snapshot", get_vol_snapshot, entry.id)
+        if vol is not None:
+            st.caption(
+                "At entry: " + " • ".join(
+                    part for part in (
+                        f"{vol.symbol} {vol.underlying_price:,.2f}" if vol.underlying_price else None,
+                        f"IV {vol.iv:.1%}" if vol.iv is not None else None,
+                        f"HV{vol.hv_window} {vol.hv:.1%}" if vol.hv is not None else None,
+                        f"IV/HV {vol.iv_hv_ratio:.2f}" if vol.iv_hv_ratio is not None else None,
+                    ) if part
+                )
+            )
+
+        with st.form(key=f"journal_edit_{entry.id}"):
+            e1, e2, e3 = st.columns([2, 1, 1])
+            with e1:
+                tags_csv = st.text_input("Tags", value=entry.tags_csv)
+            with e2:
+                stop_price = st.number_input("Stop", value=entry.stop_price, min_value=0.0, step=0.01)
+            with e3:
+                target_price = st.number_input("Target", value=entry.target_price, min_value=0.0, step=0.01)
+            notes = st.text_area("Notes", value=entry.notes or "")
+            if st.form_submit_button("Save changes"):
+                update_entry(entry.id, tags=split_tags(tags_csv.split(",")), stop_price=stop_price,
+                             target_price=target_price, notes=notes)
+                st.rerun()
+
+        if entry.status == "open":
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                exit_price = st.number_input(
+                    "Exit price", min_value=0.0, value=float(entry.entry_price), step=0.01,
+                    key=f"journal_exit_price_{entry.id}",
+                )
+            with col2:
+                exit_dt = st.date_input("Exit date", value=date.today(), key=f"journal_exit_date_{entry.id}")
+            with col3:
+                if st.button("Mark closed", key=f"journal_close_{entry.id}"):
+                    close_entry(entry.id, exit_price=exit_price, exit_date=exit_dt)
+                    st.rerun()
+        else:
+            st.write(f"Closed {entry.exit_date} @ {entry.exit_price}  •  P&L {entry.realized_pl}  •  R {entry.r_multiple}")
+
+        if st.button("Delete trade", type="secondary", key=f"journal_delete_{entry.id}"):
+            delete_entry(entry.id)
+            st.rerun()
+
+
+def _request_profile():
+    st.session_state["diag_profile_next"] = True
+
+def diagnostics_section(history: List[dict]):
+    """Latest Data/Journal rerun trace (``Trace.to_dict``), recent reruns and the last cProfile capture."""
+    st.subheader("Diagnostics")
+    trace = next((t for t in reversed(history) if t["label"] != "Diagnostics"), history[-1])
+    st.caption(f"Latest rerun of the {trace['label']} tab. Spans nest: a storage call inside a section "
+               "counts in both. Work inside precheck process pools is not traced.")
+    counters = trace["counters"]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Rerun", f"{trace['duration_ms']:,.0f} ms")
+    m2.metric("DB queries", f"{counters.get('db.queries', 0):,.0f}")
+    m3.metric("DB time", f"{1000 * counters.get('db.query_s', 0):,.1f} ms")
+    m4.metric("Fetch retries", f"{counters.get('fetch.retries', 0):,.0f}",
+              help=f"{counters.get('fetch.retry_wait_s', 0):.1f}s backoff, "
+                   f"{counters.get('fetch.rate_limit_wait_s', 0):.1f}s rate-limit wait")
+
+    if trace["summary"]:
+        st.dataframe(trace["summary"], use_container_width=True, hide_index=True)
     else:
-        # table
-        rows = []
-        wins = 0
-        total_pl = 0.0
-        for entry in closed_entries:
-            pl = entry.realized_pl or 0.0
-            total_pl += pl
-            if pl > 0:
-                wins += 1
-            rows.append({
-                "id": entry.id,
-                "symbol": entry.symbol,
-                "action": entry.entry_action,     # BTO/STO
-                "direction": entry.direction,     # metadata
-                "entry": entry.entry_price,
-                "exit": entry.exit_price,
-                "contracts": entry.size,
-                "P&L": pl,
-                "R": entry.r_multiple,
-                "days": entry.holding_days,
-                "tags": entry.tags_csv,
-        })
-        st.dataframe(rows, use_container_width=True)
-
-        # quick KPIs
-        win_rate = round(100 * wins / len(closed_entries), 1)
-        st.metric("Closed trades", len(closed_entries))
-        st.metric("Win rate", f"{win_rate}%")
-        st.metric("Realized P&L", f"{round(total_pl, 2)}")
+        st.info("Nothing instrumented ran in this rerun.")
+    with st.expander(f"Spans ({len(trace['spans'])}) and counters"):
+        st.dataframe(trace["spans"], use_container_width=True, hide_index=True)
+        st.json(counters)
+
+    st.markdown("**Recent reruns**")
+    st.dataframe(
+        [
+            {
+                "at": datetime.fromtimestamp(t["started_at"]).strftime("%H:%M:%S"),
+                "tab": t["label"],
+                "ms": t["duration_ms"],
+                "db queries": t["counters"].get("db.queries", 0),
+                "spans": len(t["spans"]),
+            }
+            for t in reversed(history)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    c1, c2 = st.columns(2)
+    with c1:
+        st.download_button("Download traces (JSON)", json.dumps(history), file_name="traces.json",
+                           mime="application/json")
+    with c2:
+        st.button("Profile next rerun", key="diag_profile_button", on_click=_request_profile,
+                  help="The next Data or Journal rerun runs under cProfile (script thread only).")
+    if st.session_state.get("diag_profile_next"):
+        st.caption("Profiling armed: switch to Data or Journal.")
+    profile = st.session_state.get("diag_profile")
+    if profile:
+        with st.expander("cProfile: last profiled rerun", expanded=True):
+            st.code(profile, language="text")
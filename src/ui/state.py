@@ -0,0 +1,98 @@
+# src/ui/state.py
+"""
+Per-session read cache for the Streamlit views.
+
+Streamlit reruns the whole script on every widget interaction. Journal reads
+go through ``cached_read``, which keeps results in ``st.session_state`` and
+only re-queries when ``storage.write_generation()`` has moved, i.e. when a
+write actually committed. Plain reruns cost no queries.
+"""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from typing import Any, Callable, MutableMapping, Optional, Tuple
+
+from src.journal.storage import Cursor, write_generation
+
+_CACHE_KEY = "_journal_reads"
+_NONCE_KEY = "_journal_form_nonce"
+
+
+def _session_state() -> MutableMapping:
+    import streamlit as st
+
+    return st.session_state
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached_read(
+    name: str,
+    fn: Callable[..., Any],
+    *args,
+    state: Optional[MutableMapping] = None,
+    **kwargs,
+) -> Any:
+    """``fn(*args, **kwargs)``, reused until the journal write generation changes."""
+    state = _session_state() if state is None else state
+    generation = write_generation()
+    cache = state.get(_CACHE_KEY)
+    if cache is None or cache["generation"] != generation:
+        cache = {"generation": generation, "values": {}}
+        state[_CACHE_KEY] = cache
+    key = (name, _freeze(args), _freeze(kwargs))
+    if key not in cache["values"]:
+        cache["values"][key] = fn(*args, **kwargs)
+    return cache["values"][key]
+
+
+def submission_token(*fields: Any, state: Optional[MutableMapping] = None) -> str:
+    """
+    Idempotency key for one form submission: the same form contents map to the
+    same token until ``new_submission`` is called, so a repeated Save click or
+    rerun returns the entry already saved instead of inserting a copy.
+    """
+    state = _session_state() if state is None else state
+    nonce = state.setdefault(_NONCE_KEY, uuid.uuid4().hex)
+    digest = hashlib.sha1(repr(_freeze(fields)).encode()).hexdigest()[:16]
+    return f"{nonce}:{digest}"
+
+
+def new_submission(state: Optional[MutableMapping] = None) -> None:
+    """Start a fresh submission, so identical form contents save as a new entry."""
+    state = _session_state() if state is None else state
+    state[_NONCE_KEY] = uuid.uuid4().hex
+
+
+def current_page(key: str, filters: dict, state: Optional[MutableMapping] = None) -> Tuple[Optional[Cursor], int]:
+    """
+    (cursor, 1-based page number) of a keyset-paginated list. The cursors of the
+    pages already visited are kept as a stack, so Prev needs no OFFSET scan;
+    changing ``filters`` starts over at page 1.
+    """
+    state = _session_state() if state is None else state
+    pager = state.get(f"_pager_{key}")
+    frozen = _freeze(filters)
+    if pager is None or pager["filters"] != frozen:
+        pager = {"filters": frozen, "stack": [None]}
+        state[f"_pager_{key}"] = pager
+    return pager["stack"][-1], len(pager["stack"])
+
+
+def next_page(key: str, cursor: Cursor, state: Optional[MutableMapping] = None) -> None:
+    state = _session_state() if state is None else state
+    state[f"_pager_{key}"]["stack"].append(cursor)
+
+
+def prev_page(key: str, state: Optional[MutableMapping] = None) -> None:
+    state = _session_state() if state is None else state
+    stack = state[f"_pager_{key}"]["stack"]
+    if len(stack) > 1:
+        stack.pop()
@@ -0,0 +1,47 @@
+import pytest
+
+from src.journal import storage
+from src.settings import Settings
+
+
+@pytest.fixture
+def journal_db(tmp_path, monkeypatch):
+    """Point the storage layer at a fresh SQLite file for one test; yields the write engine."""
+    for name, value in (("_engine", None), ("_read_engine", None), ("_engine_url", None), ("_db_initialized", False)):
+        monkeypatch.setattr(storage, name, value)
+    storage.init_db(Settings(db_url=f"sqlite:///{tmp_path / 'journal.sqlite'}"))
+    yield storage._engine
+    storage.dispose_db()
+
+
+def synthetic_bars(n=300, start="2024-01-02", freq="B", price=100.0, seed=0):
+    """Reproducible yfinance-style daily bars (tz-aware ``Date`` index)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    idx = pd.date_range(start, periods=n, freq=freq, tz="America/New_York", name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                         "Volume": 1e6}, index=idx)
+
+
+@pytest.fixture
+def replay_provider(tmp_path):
+    """Offline market data: a replay of SPY/QQQ/IWM daily bars and one SPY chain, set as the provider."""
+    import pandas as pd
+
+    from src.data import providers
+
+    side = pd.DataFrame({"contractSymbol": ["SPY250117C00100000", "SPY250117C00105000"], "strike": [100.0, 105.0],
+                         "bid": [1.0, 0.5], "ask": [1.1, 0.6], "lastPrice": [1.05, 0.55], "volume": [50, 5],
+                         "openInterest": [2000, 300], "impliedVolatility": [0.2, 0.22], "inTheMoney": [True, False]})
+    providers.write_replay(
+        str(tmp_path / "replay"),
+        {(sym, "1d"): synthetic_bars(seed=i) for i, sym in enumerate(["SPY", "QQQ", "IWM"])},
+        {"SPY": {"2025-01-17": (side, side), "2025-02-21": (side, side)}},
+    )
+    provider = providers.ReplayProvider(str(tmp_path / "replay"), seed=0)
+    previous = providers.set_provider(provider)
+    yield provider
+    providers.set_provider(previous)
@@ -0,0 +1,63 @@
+from datetime import date
+
+import numpy as np
+
+from src.journal.analytics import JournalFrame
+from src.journal.storage import (
+    close_entry,
+    create_entry,
+    get_trade_stats,
+    list_entries_by_status,
+    update_entry,
+)
+
+
+def _trade(symbol, action, entry, exit_, day, stop=None, strategy="CSP", tags=""):
+    e = create_entry(symbol=symbol, strategy=strategy, entry_action=action, entry_price=entry,
+                     entry_date=date(2025, 1, 1), tags_csv=tags)
+    if stop is not None:
+        update_entry(e.id, stop_price=stop)
+    return close_entry(e.id, exit_price=exit_, exit_date=date(2025, 1, day))
+
+
+def test_frame_matches_row_properties_and_equity_math(journal_db):
+    _trade("SPY", "STO", 2.0, 1.0, 5, stop=4.0, tags="#theta")           # +100, R 0.5
+    _trade("QQQ", "BTO", 1.0, 0.5, 6, strategy="Long call", tags="#x")   # -50, R -0.5
+    _trade("SPY", "STO", 2.0, 3.0, 7, tags="#theta")                     # -100, R None
+    _trade("IWM", "BTO", 1.0, 3.0, 8, strategy="Long call")              # +200, R 2
+    create_entry(symbol="OPEN", strategy="CSP", entry_action="STO")      # ignored
+
+    jf = JournalFrame.load()
+    rows = sorted(list_entries_by_status("closed"), key=lambda e: (e.exit_date, e.id))
+    assert jf.df["pl"].tolist() == [e.realized_pl for e in rows]
+    np.testing.assert_array_equal(
+        jf.df["r_multiple"].to_numpy(),
+        np.array([np.nan if e.r_multiple is None else e.r_multiple for e in rows]),
+    )
+    assert jf.df["holding_days"].tolist() == [e.holding_days for e in rows]
+
+    assert jf.equity_curve().tolist() == [100.0, 50.0, -50.0, 150.0]
+    assert jf.max_drawdown() == 150.0
+    assert jf.rolling_win_rate(2).tolist()[1:] == [0.5, 0.0, 0.5]
+    assert jf.rolling_expectancy(2).tolist()[1:] == [25.0, -75.0, 50.0]
+
+    by_strategy = jf.summary(by="strategy")
+    assert by_strategy.loc["CSP", "pl"] == 0.0 and by_strategy.loc["Long call", "wins"] == 1
+    assert by_strategy.loc["CSP", "max_drawdown"] == 100.0
+    by_tag = jf.summary(by="tag")
+    assert set(by_tag.index) == {"#theta", "#x"} and by_tag.loc["#theta", "trades"] == 2
+    assert jf.summary().loc["all", "trades"] == 4
+
+    assert len(JournalFrame.load(symbol="SPY")) == 2
+
+
+def test_tag_summary_matches_stored_tag_stats(journal_db):
+    e = _trade("SPY", "STO", 2.0, 1.0, 5, tags="#a")
+    update_entry(e.id, tags_csv="#a, #b,#a,")
+    _trade("QQQ", "BTO", 1.0, 0.5, 6, tags=" #b")
+
+    by_tag = JournalFrame.load().summary(by="tag")
+    stored = {r.key: (r.count, r.pl_sum) for r in get_trade_stats("tag")}
+    assert {k: (row.trades, row.pl) for k, row in by_tag.iterrows()} == stored == {
+        "#a": (1, 100.0), "#b": (2, 50.0),
+    }
@@ -0,0 +1,35 @@
+import json
+
+from benchmarks import run
+from benchmarks.harness import Result, compare
+
+
+def _result(name, median):
+    return Result(name, 1000, 3, 1, median, median, median)
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {r.key: r for r in [_result("a", 1.0), _result("b", 1.0), _result("c", 1.0)]}
+    rows = compare([_result("a", 1.2), _result("b", 1.5), _result("c", 0.5), _result("d", 1.0)], baseline, 0.25)
+    assert [(c.key, c.status) for c in rows] == [
+        ("a@1000", "ok"), ("b@1000", "regression"), ("c@1000", "faster"), ("d@1000", "new"),
+    ]
+    assert rows[1].ratio == 1.5
+
+
+def test_run_writes_json_and_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "BASELINE", str(tmp_path / "baseline.json"))
+    out = tmp_path / "bench.json"
+    args = ["--sizes", "200", "--suites", "storage", "--workdir", str(tmp_path), "--output", str(out)]
+    assert run.main(args) == 0  # no baseline to compare against
+
+    doc = json.loads(out.read_text())
+    keys = {f"{r['name']}@{r['size']}" for r in doc["results"]}
+    assert {"storage.create_entry@200", "storage.list_entries[tag]@200", "storage.close_entry@200",
+            "stats.overall_stats@200"} <= keys
+    assert doc["meta"]["sizes"] == [200]
+
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps({"meta": {}, "results": [dict(r, median=1e-9) for r in doc["results"]]}))
+    assert run.main(args + ["--baseline", str(fast)]) == 1
+    assert run.main(args + ["--baseline", str(out), "--tolerance", "100"]) == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from src.data import chains
+from src.data.chains import ChainCache, fetch_chain, liquidity_scores
+
+
+def _side(strikes, bid, ask, volume, oi):
+    return pd.DataFrame({
+        "contractSymbol": [f"X{k}" for k in strikes], "strike": strikes, "bid": bid, "ask": ask,
+        "lastPrice": bid, "volume": volume, "openInterest": oi, "impliedVolatility": 0.3,
+        "inTheMoney": False, "change": 0.0,
+    })
+
+
+def _fake_downloads(monkeypatch, calls):
+    def expirations(symbol):
+        calls.append(("exp", symbol))
+        return ["2025-01-17", "2025-02-21"]
+
+    def chain(symbol, expiration):
+        calls.append(("chain", expiration))
+        side = _side([100.0, 105.0], [1.0, 0.5], [1.1, 0.9], [50, np.nan], [2000, 5])
+        return side, side.assign(contractSymbol=lambda d: "P" + d["contractSymbol"])
+
+    monkeypatch.setattr(chains, "_download_expirations", expirations)
+    monkeypatch.setattr(chains, "_download_chain", chain)
+
+
+def test_fetch_chain_pulls_every_expiration_and_serves_fresh_snapshot(monkeypatch, tmp_path):
+    calls = []
+    _fake_downloads(monkeypatch, calls)
+    cache = ChainCache(str(tmp_path / "chains.sqlite"), ttl=60, keep=2)
+
+    snap = fetch_chain("spy", cache=cache)
+    assert snap.expirations == ["2025-01-17", "2025-02-21"]
+    assert len(snap.chain) == 8 and set(snap.chain["type"]) == {"call", "put"}
+    assert list(snap.chain.columns) == chains.CHAIN_COLUMNS
+    assert sorted(c for c in calls if c[0] == "chain") == [("chain", "2025-01-17"), ("chain", "2025-02-21")]
+
+    calls.clear()
+    again = fetch_chain("SPY", expirations=["2025-02-21"], cache=cache)
+    assert calls == [] and again.expirations == ["2025-02-21"]
+
+    # stale snapshot triggers a new download; older snapshots are pruned to ``keep``
+    assert cache.latest("SPY", now=snap.fetched_at + 61) is None
+    for _ in range(3):
+        fetch_chain("SPY", cache=cache, refresh=True)
+    assert len(cache.history("SPY")) == 2
+
+
+def test_liquidity_scores_are_vectorized_over_the_chain():
+    chain = pd.DataFrame({
+        "bid": [1.00, 0.50, 0.0, 2.0],
+        "ask": [1.04, 0.90, 0.1, 2.1],
+        "volume": [500, 5, 0, np.nan],
+        "open_interest": [5000, 50, 0, 1000],
+    })
+    out = liquidity_scores(chain)
+
+    np.testing.assert_allclose(out["spread_pct"].iloc[:2], [0.04 / 1.02, 0.40 / 0.70])
+    assert np.isnan(out["mid"].iloc[2])                     # one-sided quote
+    assert out["spread_score"].iloc[1] == 0.0 and out["spread_score"].iloc[2] == 0.0
+    assert out["oi_score"].iloc[0] == 1.0 and out["volume_score"].iloc[3] == 0.0
+    assert out["liquid"].tolist() == [True, False, False, False]
+    assert out["liquidity"].iloc[0] > out["liquidity"].iloc[3] > out["liquidity"].iloc[1] > 0
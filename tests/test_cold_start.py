@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# importing app.py (on top of streamlit itself) must stay well under this; eager imports took ~1s
+IMPORT_BUDGET_S = 0.5
+# loaded on first use of the tab that needs them, never by the import
+LAZY_MODULES = ("yfinance", "tenacity", "sqlmodel", "sqlalchemy", "pandas", "numpy",
+                "src.journal.storage", "src.data.fetchers")
+
+_PROBE = """
+import json, sys, time
+import streamlit
+before = set(sys.modules)
+t0 = time.perf_counter()
+import app
+elapsed = time.perf_counter() - t0
+print(json.dumps({"elapsed": elapsed, "loaded": sorted(set(sys.modules) - before)}))
+"""
+
+
+def _import_app():
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, env=env, capture_output=True, text=True,
+                         check=True, timeout=120)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_is_light_and_within_budget():
+    probe = _import_app()
+    assert not [m for m in LAZY_MODULES if m in probe["loaded"]]
+    # best of two: the first run may also pay for cold .pyc / disk caches
+    elapsed = min(probe["elapsed"], _import_app()["elapsed"])
+    assert elapsed < IMPORT_BUDGET_S, f"import app took {elapsed:.2f}s (budget {IMPORT_BUDGET_S}s)"
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from src.data import fetchers
+from src.data.cache import PriceCache
+from src.data.fetchers import fetch_many, PriceRequest
+from src.data.ratelimit import TokenBucket
+
+
+def _bars(periods=5):
+    idx = pd.date_range(pd.Timestamp.now().normalize() - pd.Timedelta(days=periods - 1),
+                        periods=periods, freq="D", tz="America/New_York", name="Date")
+    return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0}, index=idx)
+
+
+def test_fetch_many_batches_cold_symbols_and_reports_errors(monkeypatch):
+    batch_calls, single_calls = [], []
+
+    def fake_many(symbols, interval, period):
+        batch_calls.append(list(symbols))
+        return {s: _bars() for s in symbols if s != "BAD"}
+
+    def fake_one(symbol, interval, period=None, start=None):
+        single_calls.append(symbol)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(fetchers, "_download_many", fake_many)
+    monkeypatch.setattr(fetchers, "_download", fake_one)
+    cache = PriceCache(":memory:", ttl=60)
+
+    res = fetch_many([PriceRequest("spy"), PriceRequest("QQQ"), PriceRequest("BAD")], cache=cache)
+
+    assert batch_calls == [["SPY", "QQQ", "BAD"]]
+    assert single_calls == ["BAD"]  # only the symbol the batch could not serve
+    assert set(res.frames) == {"SPY", "QQQ"}
+    assert set(res.errors) == {"BAD"}
+    assert len(res.frames["SPY"]) == 5
+
+    # second pass is fully local
+    res2 = fetch_many([PriceRequest("SPY"), PriceRequest("QQQ")], cache=cache)
+    assert len(batch_calls) == 1 and set(res2.frames) == {"SPY", "QQQ"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.now += s
+
+
+def test_token_bucket_rate_and_shared_backoff():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.5  # burst spent, refill at 2/s
+
+    bucket.backoff(4.0)
+    waited = bucket.acquire()
+    assert waited >= 4.0
+    assert clock.now >= 4.5
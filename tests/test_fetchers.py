@@ -1,7 +1,9 @@
 import pytest
+from src.data.cache import PriceCache
 from src.data.fetchers import fetch_history, PriceRequest
 
-def test_fetch_raises_for_bad_symbol(monkeypatch):
+def test_fetch_raises_for_bad_symbol(replay_provider):
     # Use an unlikely symbol to trigger empty result
     with pytest.raises(Exception):
-        fetch_history(PriceRequest(symbol="ZZZ_NOT_A_TICKER", period="5d", interval="1d"))
+        fetch_history(PriceRequest(symbol="ZZZ_NOT_A_TICKER", period="5d", interval="1d"),
+                      cache=PriceCache(":memory:", ttl=60))
@@ -0,0 +1,99 @@
+import io
+
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+import pandas as pd
+
+from src.journal.importer import _Pairer, export_journal, import_fills_csv
+from src.journal.storage import (
+    close_entry,
+    create_entry,
+    list_entries,
+    list_entries_by_status,
+    overall_stats,
+    update_entry,
+)
+
+FILLS = """Trade Date,Symbol,Action,Qty,Price
+2025-01-02,SPY 250117P580,STO,2,3.00
+2025-01-02,AAPL 250117C200,BTO,3,1.50
+2025-01-03,AAPL 250117C200,STC,1,2.00
+2025-01-06,SPY 250117P580,BTC,2,1.00
+2025-01-07,QQQ 250117C500,STC,1,4.00
+not a date,QQQ 250117C500,BTO,1,1.00
+"""
+
+
+def test_import_pairs_fifo_and_dedupes_on_reimport(journal_db):
+    report = import_fills_csv(io.StringIO(FILLS), chunksize=2)
+
+    assert report.rows_read == 6 and report.skipped_rows == 1
+    assert (report.closed_trades, report.open_trades) == (2, 1)
+    assert report.unmatched_close_qty == 1 and report.unmatched_symbols == ["QQQ 250117C500"]
+
+    closed = {e.symbol: e for e in list_entries_by_status("closed")}
+    assert closed["SPY 250117P580"].realized_pl == 400.0        # STO 3.00 -> BTC 1.00, 2 contracts
+    assert closed["AAPL 250117C200"].realized_pl == 50.0         # 1 of 3 contracts closed
+    (still_open,) = list_entries_by_status("open")
+    assert (still_open.symbol, still_open.size) == ("AAPL 250117C200", 2)
+    assert [e.id for e in list_entries(tag="#import")] and overall_stats().pl_sum == 450.0
+
+    again = import_fills_csv(io.StringIO(FILLS))
+    assert again.duplicates == 3 and again.closed_trades == again.open_trades == 0
+    assert len(list_entries()) == 3
+
+
+def test_later_import_closes_previously_open_lot(journal_db):
+    import_fills_csv(io.StringIO(FILLS))
+    extended = FILLS + "2025-01-10,AAPL 250117C200,STC,2,0.50\n"
+    report = import_fills_csv(io.StringIO(extended))
+
+    assert report.reopened_closed == 1
+    assert list_entries_by_status("open") == []
+    assert len(list_entries()) == 3
+    assert overall_stats().pl_sum == 450.0 - 200.0
+
+
+def test_export_parquet_and_arrow(journal_db, tmp_path):
+    for i in range(7):
+        create_entry(symbol=f"S{i}", strategy="CSP", entry_action="STO", notes="why")
+
+    assert export_journal(tmp_path / "j.parquet", batch_size=3) == 7
+    table = pq.read_table(tmp_path / "j.parquet")
+    assert table.num_rows == 7 and "notes" in table.column_names
+
+    assert export_journal(str(tmp_path / "j.arrow"), format="arrow", include_notes=False) == 7
+    with ipc.open_file(str(tmp_path / "j.arrow")) as f:
+        t = f.read_all()
+    assert t.num_rows == 7 and "notes" not in t.column_names
+
+
+def test_export_keeps_types_when_a_batch_column_is_all_null(journal_db, tmp_path):
+    older = create_entry(symbol="OLD", strategy="CSP", entry_action="STO", entry_price=2.0)
+    update_entry(older.id, stop_price=4.0, external_id="x1")
+    closed = close_entry(older.id, exit_price=1.0)
+    create_entry(symbol="NEW", strategy="CSP", entry_action="STO")  # newest: open, no stop/exit
+
+    export_journal(tmp_path / "j.parquet", batch_size=1)
+    table = pq.read_table(tmp_path / "j.parquet")
+    assert table.column("exit_date").to_pylist() == [None, closed.exit_date]
+    assert table.column("stop_price").to_pylist() == [None, 4.0]
+
+    export_journal(str(tmp_path / "j.arrow"), format="arrow", batch_size=1)
+    with ipc.open_file(str(tmp_path / "j.arrow")) as f:
+        t = f.read_all()
+    assert t.column("external_id").to_pylist() == [None, "x1"]
+
+
+def test_pairer_forgets_duplicate_counts_from_earlier_days():
+    pairer = _Pairer("imported", "")
+    for day in pd.date_range("2025-01-01", periods=30).date:
+        chunk = pd.DataFrame(
+            [(day, "SPY", "STO", 1, 1.0, ""), (day, "SPY", "STO", 1, 1.0, "")],
+            columns=["date", "symbol", "action", "quantity", "price", "fill_id"],
+        )
+        pairer.feed(chunk)
+        assert len(pairer.seen) == 1
+    keys = [lot.key for lot in pairer.lots["SPY"]]
+    assert len(keys) == 60 and len(set(keys)) == 60
@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+
+from src import instrumentation
+from src.data.cache import PriceCache
+from src.data.fetchers import PriceRequest, fetch_history, fetch_many
+from src.data.ratelimit import TokenBucket, retrying
+from src.data.vol import realized_vol
+from src.instrumentation import profiled, span, timed, tracing
+from src.journal import storage
+
+
+def _names(trace):
+    return [s.name for s in trace.spans]
+
+
+def test_nothing_recorded_without_a_trace():
+    calls = []
+
+    @timed("probe", rows=True)
+    def probe(n):
+        calls.append(n)
+        return list(range(n))
+
+    assert probe(3) == [0, 1, 2]
+    with span("outside") as attrs:
+        attrs["rows"] = 1
+    instrumentation.count("outside")
+    assert instrumentation.current() is None and calls == [3]
+
+
+def test_storage_spans_count_queries_and_rows(journal_db):
+    with tracing("rerun") as trace:
+        for sym in ("SPY", "QQQ", "IWM"):
+            storage.create_entry(symbol=sym, strategy="CSP", entry_action="STO")
+        page = storage.query_entries(limit=2)
+
+    assert len(page.rows) == 2
+    summary = {a["name"]: a for a in trace.summary()}
+    assert summary["storage.create_entry"]["calls"] == 3
+    assert summary["storage.query_entries"]["rows"] == 2
+    assert summary["storage.query_entries"]["queries"] >= 1
+    assert trace.counters["db.queries"] >= 4 and trace.counters["db.query_s"] > 0
+    record = json.loads(json.dumps(trace.to_dict()))
+    assert record["label"] == "rerun" and record["duration_ms"] > 0
+
+
+def test_fetch_spans_follow_worker_threads(replay_provider):
+    cache = PriceCache(":memory:", ttl=60)
+    with tracing("rerun") as trace:
+        fetch_history(PriceRequest("SPY", period="1mo"), cache=cache)
+        res = fetch_many([PriceRequest(s, period="1mo") for s in ("QQQ", "IWM")], cache=cache)
+
+    assert sorted(res.frames) == ["IWM", "QQQ"]
+    names = _names(trace)
+    assert names.count("fetch.fetch_history") == 3  # one direct, two from the pool's threads
+    assert "fetch.download" in names and "fetch.download_many" in names
+    assert trace.counters["fetch.cache_miss"] == 1
+    assert {s.thread for s in trace.spans if s.name == "fetch.fetch_history"} - {"MainThread"}
+
+
+def test_retries_and_backoff_are_counted():
+    slept = []
+    limiter = TokenBucket(rate=1000, capacity=10, sleep=slept.append)
+    attempts = []
+
+    @retrying(limiter, attempts=3, min_wait=0, max_wait=0)
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429")
+        return "ok"
+
+    with tracing("rerun") as trace:
+        assert flaky() == "ok"
+    assert trace.counters["fetch.retries"] == 2
+    assert trace.counters["fetch.retry_wait_s"] == 0
+
+
+def test_realized_vol_span_and_profile():
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 300)))
+    with profiled() as prof, tracing("rerun") as trace:
+        realized_vol(prices, 20)
+    assert _names(trace) == ["vol.realized_vol"]
+    assert "realized_vol" in prof["stats"]
+    with profiled(False) as prof:
+        pass
+    assert prof == {}
+
+
+def test_chain_downloads_join_the_trace(replay_provider):
+    from src.data.chains import ChainCache, fetch_chain
+
+    with tracing("rerun") as trace:
+        fetch_chain("SPY", cache=ChainCache(":memory:"))
+    names = _names(trace)
+    assert names.count("fetch.expirations") == 1 and names.count("fetch.chain") == 2
+    assert "fetch.rate_limit_wait_s" in trace.counters
@@ -1,10 +1,12 @@
 from src.journal.storage import create_entry, list_entries, update_entry
 
-def test_create_and_list():
-    e = create_entry(symbol="SPY", direction="long", strategy="CSP", notes="Test", tags=["#test"])  # type: ignore
+def test_create_and_list(journal_db):
+    e = create_entry(symbol="SPY", direction="long", strategy="CSP", entry_action="STO", notes="Test", tags_csv="#test")
     assert e.id == 1
+    assert e.tags == ["#test"]
     assert len(list_entries()) == 1
 
-def test_update():
-    e = update_entry(1, notes="Updated")
+def test_update(journal_db):
+    e = create_entry(symbol="SPY", direction="long", strategy="CSP", entry_action="STO", notes="Test")
+    e = update_entry(e.id, notes="Updated")
     assert e.notes == "Updated"
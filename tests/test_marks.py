@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.data import fetchers
+from src.data.cache import PriceCache
+from src.data.fetchers import latest_quotes
+from src.journal.marks import mark_to_market
+from src.journal.storage import close_entry, create_entry
+
+
+def test_unrealized_pl_matches_realized_pl_rules(journal_db):
+    a = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=2.0, size=2)
+    b = create_entry(symbol="SPY", strategy="Long put", entry_action="BTO", entry_price=1.0)
+    c = create_entry(symbol="QQQ", strategy="CSP", entry_action="STO", entry_price=3.0)
+    create_entry(symbol="IWM", strategy="CSP", entry_action="STO", entry_price=1.0)
+    closed = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=5.0)
+    close_entry(closed.id, exit_price=1.0)
+
+    report = mark_to_market(quotes={"spy": 1.5, "QQQ": 3.5})
+    pos = report.positions.set_index("id")
+
+    # each open mark equals what closing at that price would realize
+    for e, mark in ((a, 1.5), (b, 1.5), (c, 3.5)):
+        closed_at_mark = close_entry(e.id, exit_price=mark)
+        assert pos.loc[e.id, "unrealized_pl"] == closed_at_mark.realized_pl
+    assert np.isnan(pos.loc[pos["symbol"] == "IWM", "unrealized_pl"]).all()
+    assert report.unpriced == {"IWM": "no quote"}
+    assert closed.id not in pos.index
+
+    assert report.by_symbol.loc["SPY", "unrealized_pl"] == 100.0 + 50.0
+    assert report.by_strategy.loc["CSP", "positions"] == 3
+    assert report.by_strategy.loc["CSP", "unrealized_pl"] == 100.0 - 50.0
+    assert report.total == 100.0
+
+
+def test_latest_quotes_prices_all_symbols_in_one_batch(monkeypatch):
+    batch_calls = []
+    idx = pd.date_range(pd.Timestamp.now().normalize() - pd.Timedelta(days=2), periods=3,
+                        freq="D", tz="America/New_York", name="Date")
+
+    def fake_many(symbols, interval, period):
+        batch_calls.append(list(symbols))
+        return {s: pd.DataFrame({"Close": [1.0, 2.0, float(len(s))]}, index=idx) for s in symbols if s != "BAD"}
+
+    def fake_one(symbol, interval, period=None, start=None):
+        return pd.DataFrame()
+
+    monkeypatch.setattr(fetchers, "_download_many", fake_many)
+    monkeypatch.setattr(fetchers, "_download", fake_one)
+    quotes, errors = latest_quotes(["spy", "QQQQ", "SPY", "BAD"], cache=PriceCache(":memory:"))
+
+    assert batch_calls == [["SPY", "QQQQ", "BAD"]]
+    assert quotes == {"SPY": 3.0, "QQQQ": 4.0} and set(errors) == {"BAD"}
@@ -0,0 +1,81 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data import fetchers
+from src.data.cache import PriceCache
+from src.risk import precheck
+from src.risk.precheck import CAUTION, ERROR, GO, NO_GO, PrecheckRules, evaluate, scan, verdict_frame
+
+
+def _frame(n=120, vol=0.01, volume=1e6, price=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    idx = pd.date_range(pd.Timestamp.now().normalize() - pd.Timedelta(days=n - 1),
+                        periods=n, freq="D", tz="America/New_York", name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                         "Volume": volume}, index=idx)
+
+
+def test_evaluate_rules():
+    liquid = precheck._bars(_frame())
+    assert evaluate("OK", liquid).status == GO
+
+    thin = evaluate("THIN", precheck._bars(_frame(volume=1_000)))
+    assert thin.status == NO_GO and "low liquidity" in thin.reasons[0]
+
+    rich = evaluate("RICH", liquid, iv=0.9)  # ~16% HV
+    assert rich.status == CAUTION and rich.reasons[0].startswith("IV rich")
+    assert evaluate("HOT", liquid, iv=1.5).status == NO_GO
+
+    short = evaluate("NEW", precheck._bars(_frame(n=10)))
+    assert short.status == NO_GO and "daily bars" in short.reasons[0]
+
+    wide = evaluate("WIDE", liquid, chain={"spread_pct": 0.4, "open_interest": 5_000, "atm_iv": 0.16})
+    assert wide.status == CAUTION and "unusual spreads" in wide.reasons[0]
+    assert wide.metrics["iv"] == 0.16  # chain IV used when none was given
+
+
+def _stub_downloads(monkeypatch, calls):
+    def fake_many(symbols, interval, period):
+        calls.append(len(symbols))
+        return {s: _frame(seed=i, volume=1_000 if s.startswith("T") else 1e6)
+                for i, s in enumerate(symbols) if s != "BAD"}
+
+    def fake_one(symbol, interval, period=None, start=None):
+        return pd.DataFrame()
+
+    monkeypatch.setattr(fetchers, "_download_many", fake_many)
+    monkeypatch.setattr(fetchers, "_download", fake_one)
+
+
+def test_scan_streams_every_symbol_in_batches(monkeypatch):
+    calls = []
+    _stub_downloads(monkeypatch, calls)
+    symbols = [f"S{i}" for i in range(498)] + ["thin", "BAD", "s1"]
+
+    t0 = time.perf_counter()
+    verdicts = list(scan(symbols, cache=PriceCache(":memory:", ttl=60), processes=False))
+    assert time.perf_counter() - t0 < 30
+
+    assert sorted(calls) == [50] * 10  # batched loads, duplicates dropped
+    by_symbol = {v.symbol: v for v in verdicts}
+    assert len(verdicts) == len(by_symbol) == 500
+    assert by_symbol["BAD"].status == ERROR
+    assert by_symbol["THIN"].status == NO_GO
+
+    table = verdict_frame(verdicts)
+    assert table["status"].iloc[0] == NO_GO and len(table) == 500
+
+
+def test_scan_on_process_pool_matches_inline(monkeypatch):
+    _stub_downloads(monkeypatch, [])
+    symbols = [f"S{i}" for i in range(60)] + ["TINY"]
+    cache = PriceCache(":memory:", ttl=60)
+    rules = PrecheckRules(min_dollar_volume=1e7)
+
+    inline = verdict_frame(scan(symbols, rules=rules, cache=cache, processes=False))
+    pooled = verdict_frame(scan(symbols, rules=rules, cache=cache, processes=True))
+    assert len(pooled) == 61 and pooled["status"].iloc[0] == NO_GO
+    pd.testing.assert_frame_equal(pooled, inline)
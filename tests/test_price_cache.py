@@ -0,0 +1,85 @@
+import pandas as pd
+
+from src.data import fetchers
+from src.data.cache import PriceCache
+from src.data.fetchers import fetch_history, PriceRequest
+
+
+def _bars(start, periods, close0=100.0):
+    idx = pd.date_range(start, periods=periods, freq="D", tz="America/New_York", name="Date")
+    close = [close0 + i for i in range(periods)]
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1_000.0,
+         "Dividends": 0.0, "Stock Splits": 0.0},
+        index=idx,
+    )
+
+
+def test_repeat_fetch_within_ttl_is_served_locally(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_download(symbol, interval, period=None, start=None):
+        calls.append((period, start))
+        return _bars(pd.Timestamp.now().normalize() - pd.Timedelta(days=9), 10)
+
+    monkeypatch.setattr(fetchers, "_download", fake_download)
+    cache = PriceCache(str(tmp_path / "prices.sqlite"), ttl=60)
+
+    first = fetch_history(PriceRequest(symbol="spy", period="1mo"), cache=cache)
+    second = fetch_history(PriceRequest(symbol="SPY", period="1mo"), cache=cache)
+
+    assert len(calls) == 1 and calls[0][0] == "1mo"
+    assert list(first.columns[:6]) == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_stale_cache_downloads_only_the_delta(monkeypatch, tmp_path):
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=9)
+    full = _bars(start, 10)
+    calls = []
+
+    def fake_download(symbol, interval, period=None, start=None):
+        calls.append((period, start))
+        if start is None:
+            return full
+        # last cached bar gets revised, one new bar appears
+        return _bars(start.tz_localize(None), 2, close0=500.0)
+
+    monkeypatch.setattr(fetchers, "_download", fake_download)
+    path = str(tmp_path / "prices.sqlite")
+    fetch_history(PriceRequest(symbol="SPY", period="1mo"), cache=PriceCache(path, ttl=0))
+
+    # a fresh instance reads the persisted bars back from disk
+    df = fetch_history(PriceRequest(symbol="SPY", period="1mo"), cache=PriceCache(path, ttl=0))
+
+    assert calls[1][0] is None and calls[1][1] == full.index[-1]
+    assert len(df) == 11
+    assert df["Close"].iloc[-2:].tolist() == [500.0, 501.0]
+    assert df["Close"].iloc[0] == 100.0
+
+
+def test_longer_period_than_cached_triggers_full_download(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_download(symbol, interval, period=None, start=None):
+        calls.append(period)
+        return _bars(pd.Timestamp.now().normalize() - pd.Timedelta(days=9), 10)
+
+    monkeypatch.setattr(fetchers, "_download", fake_download)
+    cache = PriceCache(":memory:", ttl=60)
+    fetch_history(PriceRequest(symbol="SPY", period="1mo"), cache=cache)
+    fetch_history(PriceRequest(symbol="SPY", period="6mo"), cache=cache)
+    fetch_history(PriceRequest(symbol="SPY", period="3mo"), cache=cache)
+
+    assert calls == ["1mo", "6mo"]
+
+
+def test_in_memory_frames_are_bounded_lru(tmp_path):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"), ttl=60, max_frames=2)
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=4)
+    for sym in ("AAA", "BBB", "CCC"):
+        cache.store(sym, "1d", _bars(start, 5), full=True)
+
+    assert list(cache._frames) == [("BBB", "1d"), ("CCC", "1d")]
+    assert len(cache.frame("AAA", "1d")) == 5  # evicted series reload from disk
+    assert list(cache._frames) == [("CCC", "1d"), ("AAA", "1d")]
@@ -0,0 +1,65 @@
+from datetime import date
+
+from sqlalchemy import inspect
+
+from src.journal.storage import (
+    SUMMARY_COLUMNS,
+    close_entry,
+    create_entry,
+    list_entries_by_status,
+    query_entries,
+)
+
+
+def _seed(n=25):
+    ids = []
+    for i in range(n):
+        e = create_entry(
+            symbol="SPY" if i % 2 else "QQQ",
+            strategy="CSP" if i % 3 else "Debit spread",
+            entry_action="STO",
+            entry_date=date(2025, 1, 1 + i),
+            notes=f"long rationale {i}",
+            tags_csv="#even" if i % 2 == 0 else "",
+        )
+        ids.append(e.id)
+    return ids
+
+
+def test_keyset_pages_cover_every_row_once_newest_first(journal_db):
+    ids = _seed()
+    seen, cursor = [], None
+    while True:
+        page = query_entries(limit=10, cursor=cursor)
+        seen += [r.id for r in page.rows]
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_filters_and_projection(journal_db):
+    _seed()
+    page = query_entries(
+        symbol="spy", strategy="CSP", date_from=date(2025, 1, 5), date_to=date(2025, 1, 20),
+        limit=None, columns=SUMMARY_COLUMNS,
+    )
+    assert page.rows and all(r.symbol == "SPY" and r.strategy == "CSP" for r in page.rows)
+    assert all(date(2025, 1, 5) <= r.entry_date <= date(2025, 1, 20) for r in page.rows)
+    assert not hasattr(page.rows[0], "notes")
+
+    assert len(query_entries(tags=["#even"], limit=None).rows) == 13
+
+
+def test_status_filter_and_ordering(journal_db):
+    ids = _seed(5)
+    close_entry(ids[1], exit_price=1.0)
+    close_entry(ids[3], exit_price=1.0)
+    assert [r.id for r in query_entries(status="closed").rows] == [ids[3], ids[1]]
+    assert [e.id for e in list_entries_by_status("open")] == [ids[4], ids[2], ids[0]]
+
+
+def test_indexes_exist(journal_db):
+    names = {ix["name"] for ix in inspect(journal_db).get_indexes("journal_entries")}
+    assert {"ix_journal_entries_created_id", "ix_journal_entries_status_created_id",
+            "ix_journal_entries_symbol_created_id", "ix_journal_entries_entry_date"} <= names
@@ -0,0 +1,77 @@
+from src.journal import storage
+from src.journal.storage import close_entry, create_entry, list_entries, update_entry, write_generation
+from src.ui.state import cached_read, new_submission, submission_token
+
+
+def test_reads_are_reused_until_a_write_commits(journal_db):
+    state, calls = {}, []
+
+    def counted():
+        calls.append(1)
+        return list_entries()
+
+    e = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.0)
+    for _ in range(3):  # reruns
+        assert len(cached_read("entries", counted, state=state)) == 1
+    assert len(calls) == 1
+
+    gen = write_generation()
+    close_entry(e.id, exit_price=0.5)
+    assert write_generation() > gen
+    cached_read("entries", counted, state=state)
+    assert len(calls) == 2
+
+    # failed writes do not invalidate
+    gen = write_generation()
+    try:
+        update_entry(10_000, notes="x")
+    except ValueError:
+        pass
+    assert write_generation() == gen
+
+
+def test_cache_keys_include_arguments(journal_db):
+    state = {}
+    create_entry(symbol="SPY", strategy="CSP", entry_action="STO", tags_csv="#a")
+    a = cached_read("q", storage.list_entries, tags=["#a"], state=state)
+    b = cached_read("q", storage.list_entries, tags=["#b"], state=state)
+    assert (len(a), len(b)) == (1, 0)
+
+
+def test_same_submission_token_saves_once(journal_db):
+    state = {}
+    fields = ("SPY", "CSP", "STO", 1.25)
+    token = submission_token(*fields, state=state)
+    first = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.25, client_token=token)
+    gen = write_generation()
+    again = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.25,
+                         client_token=submission_token(*fields, state=state))
+    assert again.id == first.id and write_generation() == gen
+    assert len(list_entries()) == 1
+
+    new_submission(state=state)
+    other = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.25,
+                         client_token=submission_token(*fields, state=state))
+    assert other.id != first.id and len(list_entries()) == 2
+
+
+def test_pager_walks_keyset_pages_and_resets_on_filter_change(journal_db):
+    from src.journal.storage import query_entries
+    from src.ui.state import current_page, next_page, prev_page
+
+    for i in range(5):
+        create_entry(symbol=f"S{i}", strategy="CSP", entry_action="STO")
+    state, seen = {}, []
+    filters = {"status": None}
+    while True:
+        cursor, page_no = current_page("j", filters, state=state)
+        page = query_entries(cursor=cursor, limit=2, **filters)
+        seen.append((page_no, [e.symbol for e in page.rows]))
+        if page.next_cursor is None:
+            break
+        next_page("j", page.next_cursor, state=state)
+    assert seen == [(1, ["S4", "S3"]), (2, ["S2", "S1"]), (3, ["S0"])]
+
+    prev_page("j", state=state)
+    assert current_page("j", filters, state=state)[1] == 2
+    assert current_page("j", {"status": "open"}, state=state) == (None, 1)
@@ -0,0 +1,68 @@
+from sqlalchemy import text
+
+from src.journal import storage
+from src.journal.storage import (
+    SUMMARY_COLUMNS,
+    close_entry,
+    create_entry,
+    delete_entry,
+    insert_entries,
+    search_entries,
+    update_entry,
+    write_batch,
+)
+
+
+def _seed():
+    a = create_entry(symbol="AAPL", strategy="Earnings strangle", entry_action="BTO",
+                     notes="Earnings run-up; earnings IV crush expected after the print")
+    b = create_entry(symbol="MSFT", strategy="CSP", entry_action="STO", notes="Selling puts before earnings")
+    c = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", notes="Theta decay, no events")
+    return a.id, b.id, c.id
+
+
+def test_fts_ranks_and_matches_prefixes(journal_db):
+    a, b, c = _seed()
+    assert storage._fts_enabled
+    assert [e.id for e in search_entries("earnings")] == [a, b]  # more hits + strategy match rank first
+    assert {e.id for e in search_entries("earn")} == {a, b}
+    assert [e.id for e in search_entries("csp theta")] == [c]
+    assert [e.id for e in search_entries("msft")] == [b]
+    assert search_entries('"unbalanced AND (') == []  # operators are neutralized, no syntax error
+    assert search_entries("   ") == []
+
+    rows = search_entries("earnings", columns=SUMMARY_COLUMNS, status="open", limit=1)
+    assert len(rows) == 1 and not hasattr(rows[0], "notes")
+
+
+def test_index_follows_every_write_path(journal_db):
+    a, b, c = _seed()
+    update_entry(c, notes="Rolled ahead of earnings")
+    assert {e.id for e in search_entries("earnings")} == {a, b, c}
+    assert search_entries("theta") == []
+
+    close_entry(b, exit_price=0.1)
+    assert [e.id for e in search_entries("earnings", status="closed")] == [b]
+
+    delete_entry(a)
+    assert {e.id for e in search_entries("earnings")} == {b, c}
+
+    with write_batch() as s:
+        (new,) = insert_entries(s, [{"symbol": "QQQ", "strategy": "Iron condor", "entry_action": "STO", "direction": "neutral",
+                                     "notes": "imported fill", "tags_csv": "", "status": "open"}])
+    assert [e.id for e in search_entries("condor")] == [new]
+
+
+def test_existing_rows_indexed_and_like_fallback(journal_db, monkeypatch):
+    a, b, c = _seed()
+    with journal_db.begin() as conn:
+        for name in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER journal_entries_fts_{name}"))
+        conn.execute(text("DROP TABLE journal_entries_fts"))
+    storage._db_initialized = False
+    storage.init_db()  # recreates the index from the rows already there
+    assert {e.id for e in search_entries("earnings")} == {a, b}
+
+    monkeypatch.setattr(storage, "_fts_enabled", False)
+    assert [e.id for e in search_entries("EARNINGS")] == [b, a]  # newest first
+    assert [e.id for e in search_entries("csp decay")] == [c]
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from src.journal.models import JournalEntry
+from src.risk.sizing import max_contracts, risk_per_contract, screen, size_chain, size_entry, size_spreads
+
+
+def test_risk_per_contract_matches_initial_risk():
+    cases = [
+        dict(entry_action="BTO", entry_price=2.0),                 # premium paid
+        dict(entry_action="BTO", entry_price=2.0, stop_price=1.0),
+        dict(entry_action="STO", entry_price=1.5, stop_price=3.0),
+    ]
+    rpc = risk_per_contract(
+        [c["entry_price"] for c in cases],
+        [c["entry_action"] for c in cases],
+        stop_price=[c.get("stop_price", np.nan) for c in cases],
+    )
+    expected = [JournalEntry(symbol="X", direction="neutral", strategy="s", **c).initial_risk for c in cases]
+    np.testing.assert_allclose(rpc, expected)
+
+
+def test_screen_sizes_singles_and_spreads_in_one_pass():
+    candidates = pd.DataFrame({
+        "entry_action": ["BTO", "STO", "STO", "STO", "BTO"],
+        "entry_price": [2.50, 1.00, 1.20, 0.80, 0.0],
+        "stop_price": [np.nan, np.nan, 2.40, np.nan, np.nan],
+        "width": [np.nan, 5.0, np.nan, np.nan, np.nan],
+        "strike": [np.nan, np.nan, np.nan, np.nan, np.nan],
+    })
+    out = screen(candidates, equity=50_000, risk_pct=0.02)  # $1,000 budget
+
+    assert out["risk_per_contract"].tolist()[:3] == [250.0, 400.0, 120.0]
+    assert out["max_contracts"].tolist() == [4, 2, 8, 0, 0]   # naked STO / zero risk size 0
+    assert out["capital_at_risk"].tolist()[:3] == [1000.0, 800.0, 960.0]
+
+
+def test_size_entry_and_bounds():
+    r = size_entry(25_000, 0.01, entry_price=1.0, entry_action="STO", strike=50.0)  # cash-secured
+    assert (r.risk_per_contract, r.max_contracts, r.risk_budget) == (4900.0, 0, 250.0)
+    assert size_entry(25_000, 0.01, entry_price=0.5, entry_action="BTO").max_contracts == 5
+    assert size_entry(25_000, 0.01, entry_price=1.0, entry_action="STO").risk_per_contract is None
+    assert max_contracts(1000, 0.5, [np.nan, 100.0]).tolist() == [0, 5]
+
+
+def _chain(underlying=100.0):
+    strikes = np.arange(90.0, 111.0, 1.0)
+    mids = {
+        "put": np.maximum(strikes - underlying, 0) + 0.5 + (strikes - 90) * 0.02,   # dearer as strike rises
+        "call": np.maximum(underlying - strikes, 0) + 0.5 + (110 - strikes) * 0.02,  # dearer as strike falls
+    }
+    return pd.concat(
+        [pd.DataFrame({"expiration": "2025-01-17", "type": kind, "strike": strikes,
+                       "bid": mid - 0.05, "ask": mid + 0.05}) for kind, mid in mids.items()],
+        ignore_index=True,
+    )
+
+
+def test_size_chain_and_vertical_spreads():
+    chain = _chain()
+    singles = size_chain(chain, equity=100_000, risk_pct=0.01, entry_action="BTO")
+    assert len(singles) == len(chain)
+    np.testing.assert_allclose(singles["max_contracts"], np.floor(1000 / (singles["entry_price"] * 100)))
+
+    spreads = size_spreads(chain, widths=[1, 5], equity=100_000, risk_pct=0.01, entry_action="STO")
+    puts = spreads[spreads["type"] == "put"]
+    assert (puts["far_strike"] == puts["near_strike"] - puts["width"]).all()
+    calls = spreads[spreads["type"] == "call"]
+    assert (calls["far_strike"] == calls["near_strike"] + calls["width"]).all()
+    row = puts[(puts["near_strike"] == 100.0) & (puts["width"] == 5)].iloc[0]
+    credit = row["mid"] - row["far_mid"]
+    assert np.isclose(row["risk_per_contract"], (5 - credit) * 100)
+    assert row["max_contracts"] == np.floor(1000 / row["risk_per_contract"])
+    assert len(spreads) == 2 * (21 - 1) + 2 * (21 - 5)
+
+    debit = size_spreads(chain, widths=[5], equity=100_000, risk_pct=0.01, entry_action="BTO")
+    np.testing.assert_allclose(debit["risk_per_contract"], np.round(debit["entry_price"] * 100, 2))
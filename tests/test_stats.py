@@ -0,0 +1,83 @@
+from datetime import date
+
+from src.journal.storage import (
+    close_entry,
+    create_entry,
+    delete_entry,
+    get_trade_stats,
+    overall_stats,
+    rebuild_trade_stats,
+    update_entry,
+)
+
+
+def _snapshot():
+    return {
+        (d, r.key): (r.count, r.wins, r.pl_sum, r.holding_days_sum)
+        for d in ("all", "strategy", "symbol", "tag", "entry_action", "month")
+        for r in get_trade_stats(d)
+    }
+
+
+def test_stats_follow_close_update_delete_and_match_rebuild(journal_db):
+    a = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=2.0,
+                     entry_date=date(2025, 1, 1), tags_csv="#theta")
+    b = create_entry(symbol="QQQ", strategy="Long call", entry_action="BTO", entry_price=3.0,
+                     size=2, entry_date=date(2025, 1, 1), tags_csv="#theta,#earnings")
+    c = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.0)
+    assert overall_stats().count == 0
+
+    close_entry(a.id, exit_price=0.5, exit_date=date(2025, 1, 11))   # +150, 10 days
+    close_entry(b.id, exit_price=2.0, exit_date=date(2025, 2, 1))    # -200, 31 days
+    kpi = overall_stats()
+    assert (kpi.count, kpi.wins, kpi.pl_sum) == (2, 1, -50.0)
+    assert kpi.win_rate == 0.5 and kpi.avg_holding_days == 20.5
+    by_tag = {r.key: r for r in get_trade_stats("tag")}
+    assert by_tag["#theta"].count == 2 and by_tag["#earnings"].pl_sum == -200.0
+    assert {r.key for r in get_trade_stats("month")} == {"2025-01", "2025-02"}
+
+    update_entry(b.id, exit_price=4.0, tags_csv="#momentum")          # now +200
+    assert overall_stats().pl_sum == 350.0
+    assert "#earnings" not in {r.key for r in get_trade_stats("tag")}
+
+    delete_entry(a.id)
+    delete_entry(c.id)
+    incremental = _snapshot()
+    assert overall_stats().count == 1
+
+    rebuild_trade_stats()
+    assert _snapshot() == incremental
+
+
+def test_init_builds_missing_stats(journal_db, monkeypatch):
+    from sqlmodel import Session, text
+    from src.journal import storage
+
+    e = create_entry(symbol="SPY", strategy="CSP", entry_action="BTO", entry_price=1.0)
+    close_entry(e.id, exit_price=1.5)
+    with Session(journal_db) as s:
+        s.exec(text("DELETE FROM journal_trade_stats"))
+        s.commit()
+    assert overall_stats().count == 0
+
+    monkeypatch.setattr(storage, "_db_initialized", False)
+    storage.init_db()
+    assert (overall_stats().count, overall_stats().pl_sum) == (1, 50.0)
+
+
+def test_generic_update_insert_path_matches_rebuild(journal_db, monkeypatch):
+    from src.journal import stats
+
+    monkeypatch.setattr(stats, "_upsert", lambda dialect: None)  # backends without ON CONFLICT
+    a = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=2.0,
+                     entry_date=date(2025, 1, 1), tags_csv="#theta")
+    b = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", entry_price=1.0,
+                     entry_date=date(2025, 1, 2), tags_csv="#theta")
+    close_entry(a.id, exit_price=0.5, exit_date=date(2025, 1, 11))
+    close_entry(b.id, exit_price=1.5, exit_date=date(2025, 1, 12))
+    delete_entry(a.id)
+    incremental = _snapshot()
+    assert overall_stats().count == 1 and overall_stats().pl_sum == -50.0
+
+    rebuild_trade_stats()
+    assert _snapshot() == incremental
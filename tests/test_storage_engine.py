@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.journal import storage
+from src.journal.storage import create_entry, get_entry, list_entries
+
+
+def test_sqlite_engine_uses_settings_wal_and_read_only_pool(journal_db, tmp_path):
+    assert str(tmp_path) in str(journal_db.url)
+    with storage._read_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == storage.SQLITE_BUSY_TIMEOUT_MS
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM journal_entries"))
+
+
+def test_readers_do_not_wait_on_an_open_write(journal_db):
+    e = create_entry(symbol="SPY", strategy="CSP", entry_action="STO", notes="before")
+    with journal_db.connect() as writer:
+        tx = writer.begin()
+        writer.execute(text("UPDATE journal_entries SET notes = 'during' WHERE id = :id"), {"id": e.id})
+        # uncommitted write holds the lock; reads still answer from the last commit
+        assert [x.notes for x in list_entries()] == ["before"]
+        assert get_entry(e.id).notes == "before"
+        tx.commit()
+    assert get_entry(e.id).notes == "during"
+
+
+def test_in_memory_url_shares_one_connection(monkeypatch):
+    from src.settings import Settings
+    for name, value in (("_engine", None), ("_read_engine", None), ("_engine_url", None), ("_db_initialized", False)):
+        monkeypatch.setattr(storage, name, value)
+    storage.init_db(Settings(db_url="sqlite://"))
+    try:
+        create_entry(symbol="SPY", strategy="CSP", entry_action="STO")
+        assert len(list_entries()) == 1 and storage._read_engine is storage._engine
+    finally:
+        storage.dispose_db()
+
+
+def test_concurrent_first_use_sets_up_schema_once(tmp_path, monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    for name, value in (("_engine", None), ("_read_engine", None), ("_engine_url", None), ("_db_initialized", False)):
+        monkeypatch.setattr(storage, name, value)
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'journal.sqlite'}")
+    calls = []
+    migrate = storage._migrate_columns
+
+    def slow_migrate():
+        calls.append(1)
+        time.sleep(0.05)  # widen the window in which other sessions arrive
+        migrate()
+
+    monkeypatch.setattr(storage, "_migrate_columns", slow_migrate)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(lambda _: len(list_entries()), range(8))) == [0] * 8
+        storage.init_db()
+        assert calls == [1]
+    finally:
+        storage.dispose_db()
@@ -0,0 +1,52 @@
+from sqlmodel import Session, select, text
+
+from src.journal import storage
+from src.journal.models import JournalTag
+from src.journal.storage import create_entry, delete_entry, list_entries, update_entry
+
+
+def _entry(symbol, tags):
+    return create_entry(symbol=symbol, strategy="CSP", entry_action="STO", tags_csv=tags)
+
+
+def test_tag_filters_run_in_sql(journal_db):
+    a = _entry("SPY", "#theta, #earnings")
+    b = _entry("QQQ", "#theta")
+    c = _entry("IWM", "#momentum")
+
+    assert {e.id for e in list_entries(tag="#theta")} == {a.id, b.id}
+    assert {e.id for e in list_entries(tags=["#earnings", "#momentum"])} == {a.id, c.id}
+    assert {e.id for e in list_entries(tags=["#theta", "#earnings"], match="all")} == {a.id}
+    assert len(list_entries()) == 3
+    assert list_entries(tag="#nope") == []
+
+
+def test_update_and_delete_keep_tag_rows_in_sync(journal_db):
+    e = _entry("SPY", "#a,#b")
+    update_entry(e.id, tags=["#c"])
+    assert [x.id for x in list_entries(tag="#c")] == [e.id]
+    assert list_entries(tag="#a") == []
+    assert update_entry(e.id, notes="x").tags == ["#c"]
+
+    delete_entry(e.id)
+    with Session(journal_db) as s:
+        assert list(s.exec(select(JournalTag))) == []
+
+
+def test_update_normalizes_raw_tag_csv(journal_db):
+    e = _entry("SPY", "#a")
+    assert update_entry(e.id, tags_csv=" #Foo , bar,,#Foo").tags_csv == "#Foo,bar"
+    assert [x.id for x in list_entries(tag="#Foo")] == [e.id]
+
+
+def test_init_backfills_tags_from_csv(journal_db, monkeypatch):
+    e = _entry("SPY", "#legacy, #x")
+    with Session(journal_db) as s:
+        s.exec(text("DELETE FROM journal_entry_tags"))
+        s.commit()
+    assert list_entries(tag="#legacy") == []
+
+    monkeypatch.setattr(storage, "_db_initialized", False)
+    storage.init_db()
+    assert [x.id for x in list_entries(tag="#legacy")] == [e.id]
+    assert list_entries(tag="#legacy")[0].tags == ["#legacy", "#x"]
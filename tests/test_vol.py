@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.data.vol import (
+    ESTIMATORS,
+    PERIODS_PER_YEAR,
+    RollingVolEstimator,
+    compare_iv_hv,
+    ohlc_vol,
+    realized_vol,
+    realized_vol_panel,
+)
+
+
+def _prices(n=300, symbols=("AAA", "BBB", "CCC"), seed=7):
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0, 0.02, size=(n, len(symbols)))
+    idx = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=idx, columns=list(symbols))
+
+
+def test_realized_vol_matches_rolling_std():
+    px = _prices()["AAA"]
+    expected = np.log(px / px.shift(1)).dropna().rolling(20).std().iloc[-1] * np.sqrt(252)
+    assert np.isclose(realized_vol(px, window=20), expected)
+    assert np.isnan(realized_vol(px.iloc[:10], window=20))
+
+
+def test_panel_matches_pandas_for_every_window_and_symbol():
+    px = _prices()
+    px.iloc[100, 1] = np.nan  # a gap only invalidates windows that contain it
+    panel = realized_vol_panel(px, windows=[10, 20, 30])
+
+    log_ret = np.log(px / px.shift(1))
+    for w in (10, 20, 30):
+        expected = log_ret.rolling(w).std() * np.sqrt(252)
+        np.testing.assert_allclose(panel.history[w].to_numpy(), expected.to_numpy(), rtol=1e-8, equal_nan=True)
+        for sym in px.columns:
+            assert np.isclose(panel.latest.loc[sym, w], realized_vol(px[sym], window=w))
+
+
+def test_panel_short_history_is_nan():
+    panel = realized_vol_panel(_prices(n=15), windows=[10, 20])
+    assert panel.latest[20].isna().all()
+    assert panel.latest[10].notna().all()
+
+
+def _ohlc(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    open_ = close * np.exp(rng.normal(0, 0.005, n))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.01, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.01, n)))
+    idx = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close}, index=idx)
+
+
+def test_ohlc_estimators_match_reference_formulas():
+    df = _ohlc()
+    w = 20
+    panel = ohlc_vol(df, windows=[w])
+    tail = df.iloc[-w:]
+    o, h, lo, c = (np.log(tail[k]) for k in ("Open", "High", "Low", "Close"))
+    prev_c = np.log(df["Close"]).shift(1).iloc[-w:]
+
+    park = np.sqrt(((h - lo) ** 2).mean() / (4 * np.log(2)) * 252)
+    gk = np.sqrt((0.5 * (h - lo) ** 2 - (2 * np.log(2) - 1) * (c - o) ** 2).mean() * 252)
+    rs_var = ((h - o) * (h - c) + (lo - o) * (lo - c)).mean()
+    k = 0.34 / (1.34 + (w + 1) / (w - 1))
+    yz = np.sqrt(((o - prev_c).var() + k * (c - o).var() + (1 - k) * rs_var) * 252)
+
+    latest = panel.latest[w]
+    assert np.isclose(latest["close"], realized_vol(df["Close"], window=w))
+    assert np.isclose(latest["parkinson"], park)
+    assert np.isclose(latest["garman_klass"], gk)
+    assert np.isclose(latest["rogers_satchell"], np.sqrt(rs_var * 252))
+    assert np.isclose(latest["yang_zhang"], yz)
+    assert list(panel.history.columns.get_level_values("estimator")[:5]) == list(ESTIMATORS)
+
+
+def test_compare_iv_hv_uses_estimator_label():
+    msg = compare_iv_hv(0.40, 0.20, label="Yang-Zhang HV")
+    assert "Yang-Zhang HV (20.00%)" in msg and "expensive" in msg
+
+
+def test_rolling_estimator_tracks_batch_hv_and_resumes():
+    px = _prices(n=400)["AAA"]
+    est = RollingVolEstimator(window=20)
+    for p in px.iloc[:10]:
+        est.update(p)
+    assert np.isnan(est.value)
+
+    for p in px.iloc[10:250]:
+        est.update(p)
+    assert np.isclose(est.value, realized_vol(px.iloc[:250], window=20))
+
+    resumed = RollingVolEstimator.from_dict(json.loads(json.dumps(est.to_dict())))
+    for p in px.iloc[250:]:
+        est.update(p)
+        resumed.update(p)
+    assert np.isclose(resumed.value, realized_vol(px, window=20))
+    assert np.isclose(est.value, resumed.value)
+
+
+def test_rolling_estimator_feed_skips_seen_and_forming_bars():
+    idx = pd.date_range("2024-01-02 09:30", periods=60, freq="15min", tz="America/New_York", name="Datetime")
+    df = pd.DataFrame({"Close": _prices(n=60)["AAA"].to_numpy()}, index=idx).reset_index()
+    est = RollingVolEstimator(window=20, periods_per_year=PERIODS_PER_YEAR["15m"])
+
+    est.feed(df.iloc[:40])
+    assert est.last_ts == str(idx[38])
+    est.feed(df)  # only bars 39..58 are new and complete
+    assert est.last_ts == str(idx[58])
+    expected = realized_vol(df["Close"].iloc[:59], window=20) / np.sqrt(252) * np.sqrt(PERIODS_PER_YEAR["15m"])
+    assert np.isclose(est.value, expected)
@@ -0,0 +1,58 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from src.journal import storage
+from src.journal.analytics import JournalFrame
+from src.journal.models import VolSnapshot
+from src.journal.storage import close_entry, create_entry, delete_entry, get_vol_snapshot, query_entries
+
+
+def _entry(action, iv=None, hv=None, exit_price=None):
+    vol = None if iv is None else VolSnapshot(symbol="SPY", iv=iv, hv=hv, hv_window=20, hv20=hv, underlying_price=500.0)
+    e = create_entry(symbol="spy", strategy="CSP", entry_action=action, entry_date=date(2025, 1, 2),
+                     entry_price=2.0, vol=vol)
+    if exit_price is not None:
+        close_entry(e.id, exit_price=exit_price, exit_date=date(2025, 1, 9))
+    return e.id
+
+
+def test_snapshot_saved_with_entry_and_filters_by_ratio(journal_db):
+    rich_sto = _entry("STO", iv=0.30, hv=0.20, exit_price=1.0)   # ratio 1.5
+    fair_sto = _entry("STO", iv=0.21, hv=0.20, exit_price=3.0)   # ratio 1.05
+    rich_bto = _entry("BTO", iv=0.50, hv=0.20, exit_price=1.0)
+    _entry("STO", exit_price=1.0)                                # no snapshot
+    open_rich = _entry("STO", iv=0.40, hv=0.20)
+
+    snap = get_vol_snapshot(rich_sto)
+    assert snap.iv_hv_ratio == 1.5 and snap.underlying_price == 500.0 and snap.hv20 == 0.20
+
+    page = query_entries(status="closed", entry_action="STO", iv_hv_min=1.2, limit=None)
+    assert [r.id for r in page.rows] == [rich_sto]
+    assert {r.id for r in query_entries(iv_hv_min=1.2, limit=None).rows} == {rich_sto, rich_bto, open_rich}
+    assert [r.id for r in query_entries(iv_hv_max=1.2, limit=None).rows] == [fair_sto]
+
+    jf = JournalFrame.load(entry_action="STO", iv_hv_min=1.2)
+    assert list(jf.df["id"]) == [rich_sto] and jf.df["pl"].iloc[0] == 100.0
+
+    delete_entry(rich_sto)
+    assert get_vol_snapshot(rich_sto) is None
+
+
+def test_vol_note_lines_are_backfilled(journal_db):
+    old = create_entry(symbol="QQQ", strategy="CSP", entry_action="STO",
+                       notes="[vol] IV(user)=55.0% | HV20=25.0% | Δ=+30.0pp (+120%)\nearnings run-up")
+    plain = create_entry(symbol="QQQ", strategy="CSP", entry_action="STO", notes="no context")
+
+    storage._db_initialized = False
+    storage.init_db()
+
+    snap = get_vol_snapshot(old.id)
+    assert (snap.iv, snap.hv, snap.hv_window, snap.hv20, snap.iv_hv_ratio) == (0.55, 0.25, 20, 0.25, 2.2)
+    assert get_vol_snapshot(plain.id) is None
+    assert [r.id for r in query_entries(iv_hv_min=2.0, limit=None).rows] == [old.id]
+
+    storage._db_initialized = False
+    storage.init_db()  # idempotent
+    with journal_db.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM journal_vol_snapshots")).scalar() == 1